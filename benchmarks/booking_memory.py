@@ -0,0 +1,75 @@
+"""Memory per booking for the different in-memory representations.
+
+Run from the repository root::
+
+    python -m benchmarks.booking_memory [count]
+"""
+
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks.columnar_booking_store import ColumnarBookingStore
+from src.models.booking import Booking
+from src.models.room import Room
+from src.models.user import User
+
+
+class DictBooking:
+    """The model as it was before ``__slots__``, for comparison."""
+
+    def __init__(self, booking_id, room, user, start_time, end_time):
+        self.booking_id = booking_id
+        self.room = room
+        self.user = user
+        self.start_time = start_time
+        self.end_time = end_time
+
+
+def _rows(count, rooms, users):
+    start = datetime(2025, 1, 1, 9)
+    for i in range(count):
+        begin = start + timedelta(hours=i)
+        yield i + 1, rooms[i % len(rooms)], users[i % len(users)], begin, begin + (
+            timedelta(minutes=45)
+        )
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def main(count: int):
+    rooms = [Room(i, f"Room {i}", 10, "Floor 1") for i in range(200)]
+    users = [User(i, f"User {i}", f"user{i}@example.com") for i in range(500)]
+    by_room = {room.room_id: room for room in rooms}
+    by_user = {user.user_id: user for user in users}
+
+    def build_store():
+        store = ColumnarBookingStore(by_room.get, by_user.get)
+        for row in _rows(count, rooms, users):
+            store.add(Booking(*row))
+        return store
+
+    results = {
+        "dict objects": measure(
+            lambda: [DictBooking(*r) for r in _rows(count, rooms, users)]
+        ),
+        "__slots__ objects": measure(
+            lambda: [Booking(*r) for r in _rows(count, rooms, users)]
+        ),
+        "columnar arrays": measure(build_store),
+    }
+    print(f"{count} bookings")
+    for name, total in results.items():
+        print(f"{name:>18}: {total / count:7.1f} bytes/booking")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
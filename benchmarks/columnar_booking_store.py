@@ -0,0 +1,122 @@
+"""Column-oriented booking store, measured by ``benchmarks.booking_memory``.
+
+Not used by the application: the repositories keep ``Booking`` objects.
+"""
+
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from src.models.booking import Booking
+from src.repositories.binary_snapshot import to_epoch_us
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def from_epoch_us(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class ColumnarBookingStore:
+    """Bookings kept as parallel ``array('q')`` columns.
+
+    Each booking costs five 8-byte integers (id, room_id, user_id and the
+    start/end times as epoch microseconds) instead of a ``Booking`` object
+    plus two ``datetime`` objects. Rows are kept sorted by booking_id, so
+    lookups are a bisect over the id column. Rooms and users are resolved
+    through ``room_lookup``/``user_lookup`` (e.g. ``RoomRepository.get_by_id``)
+    when rows are materialised back into ``Booking`` objects.
+    """
+
+    __slots__ = (
+        "booking_ids",
+        "room_ids",
+        "user_ids",
+        "start_times",
+        "end_times",
+        "room_lookup",
+        "user_lookup",
+    )
+
+    def __init__(self, room_lookup, user_lookup):
+        self.booking_ids = array("q")
+        self.room_ids = array("q")
+        self.user_ids = array("q")
+        self.start_times = array("q")
+        self.end_times = array("q")
+        self.room_lookup = room_lookup
+        self.user_lookup = user_lookup
+
+    def __len__(self) -> int:
+        return len(self.booking_ids)
+
+    def _position(self, booking_id: int) -> int:
+        i = bisect_left(self.booking_ids, booking_id)
+        if i < len(self.booking_ids) and self.booking_ids[i] == booking_id:
+            return i
+        return -1
+
+    def add(self, booking: Booking):
+        i = bisect_left(self.booking_ids, booking.booking_id)
+        if i < len(self.booking_ids) and self.booking_ids[i] == booking.booking_id:
+            raise ValueError(f"Booking {booking.booking_id} already exists")
+        row = (
+            booking.booking_id,
+            booking.room.room_id,
+            booking.user.user_id,
+            to_epoch_us(booking.start_time),
+            to_epoch_us(booking.end_time),
+        )
+        if i == len(self.booking_ids):
+            for column, value in zip(self._columns(), row):
+                column.append(value)
+        else:
+            for column, value in zip(self._columns(), row):
+                column.insert(i, value)
+
+    def get(self, booking_id: int) -> Booking:
+        i = self._position(booking_id)
+        return self._materialise(i) if i >= 0 else None
+
+    def delete(self, booking_id: int) -> bool:
+        i = self._position(booking_id)
+        if i < 0:
+            return False
+        for column in self._columns():
+            del column[i]
+        return True
+
+    def get_by_room(self, room_id: int) -> list:
+        return [
+            self._materialise(i)
+            for i, value in enumerate(self.room_ids)
+            if value == room_id
+        ]
+
+    def __iter__(self):
+        for i in range(len(self.booking_ids)):
+            yield self._materialise(i)
+
+    def nbytes(self) -> int:
+        """Bytes held by the column buffers."""
+        return sum(
+            column.buffer_info()[1] * column.itemsize for column in self._columns()
+        )
+
+    def _columns(self):
+        return (
+            self.booking_ids,
+            self.room_ids,
+            self.user_ids,
+            self.start_times,
+            self.end_times,
+        )
+
+    def _materialise(self, i: int) -> Booking:
+        return Booking(
+            self.booking_ids[i],
+            self.room_lookup(self.room_ids[i]),
+            self.user_lookup(self.user_ids[i]),
+            from_epoch_us(self.start_times[i]),
+            from_epoch_us(self.end_times[i]),
+        )
@@ -0,0 +1,109 @@
+"""Memory of the Redis request log: records duplicated vs stored once by id.
+
+Run from the repository root::
+
+    python -m benchmarks.request_log_memory [requests]
+
+Always prints an estimate of the bytes of stored values for both layouts
+(payload lengths only, no Redis encoding or per-key overhead). With a Redis
+server reachable (``REDIS_HOST``/``REDIS_PORT``) it also writes both layouts
+to database ``REDIS_BENCH_DB`` (default 15, which must be empty; it is
+flushed afterwards) and reports ``MEMORY USAGE`` of the log keys.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import redis
+
+from src.database.redis_client import RECORD_KEY, RedisClient
+
+
+def _requests(count: int) -> list:
+    start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    records = []
+    for i in range(count):
+        endpoint = "/health" if i % 3 else "/ping"
+        record = RedisClient.build_request(
+            endpoint,
+            f"10.0.{i % 50}.{i % 200}",
+            "Mozilla/5.0 (X11; Linux x86_64) Gecko/20100101 Firefox/128.0",
+            {"response_status": "ok", "status_code": 200},
+        )
+        record["timestamp"] = (start + timedelta(milliseconds=i * 250)).isoformat()
+        records.append(record)
+    return records
+
+
+def _value_bytes(records: list):
+    duplicated = sum(2 * len(json.dumps(record)) for record in records)
+    # One compact copy plus the 12-character id in the list and the sorted set
+    by_id = sum(
+        len(json.dumps(record, separators=(",", ":"))) + 2 * 12 for record in records
+    )
+    return duplicated, by_id
+
+
+def _write_duplicated(client, records: list):
+    """The previous layout: the full JSON in the sorted set and in the list."""
+    pipe = client.pipeline(transaction=False)
+    for record in records:
+        payload = json.dumps(record)
+        score = datetime.fromisoformat(record["timestamp"]).timestamp()
+        pipe.zadd(f"requests:{record['endpoint']}", {payload: score})
+        pipe.lpush("all_requests", payload)
+    pipe.execute()
+
+
+def _log_memory(client) -> int:
+    keys = ["all_requests", "requests:/health", "requests:/ping"]
+    keys += list(client.scan_iter(match=f"{RECORD_KEY}:*", count=1000))
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.memory_usage(key, samples=0)
+    return sum(size or 0 for size in pipe.execute())
+
+
+def _measure(records: list):
+    os.environ["REDIS_DB"] = os.getenv("REDIS_BENCH_DB", "15")
+    os.environ["REDIS_LOG_MAX_ENTRIES"] = "0"
+    os.environ["REDIS_LOG_MAX_AGE"] = "0"
+    log = RedisClient()
+    client = log.client
+    try:
+        if client.dbsize():
+            print(f"Database {os.environ['REDIS_DB']} is not empty; skipping")
+            return None
+    except redis.ConnectionError:
+        print("No Redis server reachable; skipping MEMORY USAGE")
+        return None
+    try:
+        _write_duplicated(client, records)
+        duplicated = _log_memory(client)
+        client.flushdb()
+        for i in range(0, len(records), 1000):
+            log.save_requests(records[i : i + 1000])
+        by_id = _log_memory(client)
+    finally:
+        client.flushdb()
+    return duplicated, by_id
+
+
+def main(count: int):
+    records = _requests(count)
+    measured = _measure(records)
+    print(f"{count} requests")
+    print(f"{'':>20} {'duplicated':>12} {'by id':>12} {'saving':>7}")
+    duplicated, by_id = _value_bytes(records)
+    # Only the measured row gets a saving; the estimate ignores Redis overhead
+    print(f"{'value bytes (est.)':>20} {duplicated:>12,} {by_id:>12,}")
+    if measured:
+        duplicated, by_id = measured
+        saving = 1 - by_id / duplicated
+        print(f"{'MEMORY USAGE':>20} {duplicated:>12,} {by_id:>12,} {saving:>7.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
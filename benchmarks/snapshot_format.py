@@ -0,0 +1,90 @@
+"""Load/save time and file size of JSON vs binary snapshots.
+
+Run from the repository root::
+
+    python -m benchmarks.snapshot_format [bookings]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from src.repositories.booking_repository import BookingRepository
+from src.repositories.room_repository import RoomRepository
+from src.repositories.user_repository import UserRepository
+
+
+def _timed(action) -> float:
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def _populate(directory: str, count: int):
+    users = UserRepository(os.path.join(directory, "users.json"))
+    rooms = RoomRepository(os.path.join(directory, "rooms.json"))
+    bookings = BookingRepository(
+        os.path.join(directory, "bookings.json"),
+        room_repository=rooms,
+        user_repository=users,
+    )
+    user_list = [users.add(f"User {i}", f"user{i}@example.com") for i in range(500)]
+    room_list = [rooms.add(f"Room {i}", 10, f"Floor {i % 5}") for i in range(200)]
+    # Every room booked for eight one-hour slots a day
+    rows = []
+    for i in range(count):
+        slot = i // len(room_list)
+        begin = datetime(2025, 1, 1, 9) + timedelta(days=slot // 8, hours=slot % 8)
+        rows.append(
+            (
+                room_list[i % len(room_list)],
+                user_list[i % len(user_list)],
+                begin,
+                begin + timedelta(minutes=45),
+            )
+        )
+    bookings.add_many(rows)
+    return users, rooms, bookings
+
+
+def main(count: int):
+    with tempfile.TemporaryDirectory() as directory:
+        users, rooms, bookings = _populate(directory, count)
+        print(f"{count} bookings, 500 users, 200 rooms")
+        # read: decoding the snapshot alone; load: building the repository
+        print(
+            f"{'file':>14} {'format':>7} {'size':>10} "
+            f"{'save':>8} {'read':>8} {'load':>8}"
+        )
+        for name, repository, load in (
+            ("users.json", users, lambda b: UserRepository(users.filepath, binary=b)),
+            ("rooms.json", rooms, lambda b: RoomRepository(rooms.filepath, binary=b)),
+            (
+                "bookings.json",
+                bookings,
+                lambda b: BookingRepository(
+                    bookings.filepath,
+                    room_repository=rooms,
+                    user_repository=users,
+                    binary=b,
+                ),
+            ),
+        ):
+            for binary in (False, True):
+                repository.storage.binary = binary
+                save = _timed(repository.save_to_file)
+                size = os.path.getsize(repository.filepath)
+                read = _timed(lambda: deque(repository.storage.read_snapshot(), 0))
+                load_time = _timed(lambda: load(binary))
+                label = "binary" if binary else "json"
+                print(
+                    f"{name:>14} {label:>7} {size:>10,} {save * 1000:>6.0f}ms "
+                    f"{read * 1000:>6.0f}ms {load_time * 1000:>6.0f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
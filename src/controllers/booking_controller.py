@@ -0,0 +1,212 @@
+import hashlib
+import heapq
+import os
+from datetime import datetime
+from operator import attrgetter
+
+from flask import Response, jsonify, request
+
+from src.middleware.auth_middleware import validate_token
+from src.utils.pagination import decode_cursor, encode_cursor
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# Change counters are per process, so ETags from another worker never match
+_INSTANCE = os.urandom(4).hex()
+
+_USER_FIELDS = {
+    "user_id": attrgetter("user_id"),
+    "name": attrgetter("name"),
+    "email": attrgetter("email"),
+}
+_ROOM_FIELDS = {
+    "room_id": attrgetter("room_id"),
+    "name": attrgetter("name"),
+    "capacity": attrgetter("capacity"),
+    "location": attrgetter("location"),
+}
+_BOOKING_FIELDS = {
+    "booking_id": attrgetter("booking_id"),
+    "room_id": attrgetter("room.room_id"),
+    "user_id": attrgetter("user.user_id"),
+    "start_time": lambda booking: booking.start_time.isoformat(),
+    "end_time": lambda booking: booking.end_time.isoformat(),
+}
+
+
+def register_booking_routes(app, user_repository, room_repository, booking_repository):
+    """Add the read-only ``/users``, ``/rooms`` and ``/bookings`` endpoints.
+
+    Every list is paginated with an opaque ``cursor`` (returned as
+    ``next_cursor``) and ``limit`` (default 50, at most 500), accepts
+    ``fields=a,b`` to return only some fields and answers ``If-None-Match``
+    with 304 while the repository's change counter stays the same.
+    """
+
+    @app.route("/users", methods=["GET"])
+    @validate_token
+    def list_users():
+        """List users ordered by user_id."""
+        return _conditional_get(
+            [user_repository],
+            lambda: _page_by_id(user_repository.get_all(), "user_id", _USER_FIELDS),
+        )
+
+    @app.route("/rooms", methods=["GET"])
+    @validate_token
+    def list_rooms():
+        """List rooms ordered by room_id.
+
+        Optional filters: ``min_capacity`` and ``location``, answered from
+        the capacity index.
+        """
+
+        def build():
+            min_capacity = _int_arg("min_capacity")
+            location = request.args.get("location")
+            if min_capacity is None and location is None:
+                rooms = room_repository.get_all()
+            else:
+                rooms = room_repository.get_by_min_capacity(min_capacity or 0, location)
+            return _page_by_id(rooms, "room_id", _ROOM_FIELDS)
+
+        return _conditional_get([room_repository], build)
+
+    @app.route("/bookings", methods=["GET"])
+    @validate_token
+    def list_bookings():
+        """List bookings ordered by start time.
+
+        Optional filters: ``room_id``, ``user_id`` and an ISO 8601
+        ``start``/``end`` window (bookings overlapping it), all pushed down
+        to ``find`` so only the matching page is read.
+        """
+
+        def build():
+            project = _projection(_BOOKING_FIELDS)
+            limit = _limit()
+            after = None
+            if "cursor" in request.args:
+                try:
+                    start_time, booking_id = decode_cursor(request.args["cursor"])
+                    after = (
+                        _naive(datetime.fromisoformat(start_time)),
+                        int(booking_id),
+                    )
+                except (TypeError, ValueError):
+                    raise ValueError("Invalid cursor.") from None
+            bookings = booking_repository.find(
+                room_id=_int_arg("room_id"),
+                user_id=_int_arg("user_id"),
+                start_time=_datetime_arg("start"),
+                end_time=_datetime_arg("end"),
+                after=after,
+                limit=limit + 1,
+            )
+            next_cursor = None
+            if len(bookings) > limit:
+                bookings = bookings[:limit]
+                last = bookings[-1]
+                next_cursor = encode_cursor(
+                    [last.start_time.isoformat(), last.booking_id]
+                )
+            return {
+                "items": [project(booking) for booking in bookings],
+                "next_cursor": next_cursor,
+            }
+
+        return _conditional_get([booking_repository], build)
+
+
+def _conditional_get(repositories, build):
+    """Answer with 304 when the client's ETag is current, else ``build()``.
+
+    The ETag covers the repositories' change counters and the full query,
+    read before building: a change racing with the build can only cost the
+    client one extra full response, never a stale 304.
+    """
+    versions = ",".join(str(repository.version) for repository in repositories)
+    etag = hashlib.sha1(
+        f"{_INSTANCE}|{versions}|{request.full_path}".encode()
+    ).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        try:
+            payload = build()
+        except ValueError as e:
+            return jsonify({"error": "Invalid query", "message": str(e)}), 400
+        response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _page_by_id(items, id_field: str, fields: dict) -> dict:
+    project = _projection(fields)
+    limit = _limit()
+    after = None
+    if "cursor" in request.args:
+        after = decode_cursor(request.args["cursor"])
+        if not isinstance(after, int):
+            raise ValueError("Invalid cursor.")
+    key = attrgetter(id_field)
+    page = heapq.nsmallest(
+        limit + 1, (i for i in items if after is None or key(i) > after), key=key
+    )
+    next_cursor = encode_cursor(key(page[limit - 1])) if len(page) > limit else None
+    return {"items": [project(i) for i in page[:limit]], "next_cursor": next_cursor}
+
+
+def _projection(fields: dict):
+    """Return a function building the dict of the ``fields=`` selection."""
+    selected = fields
+    if request.args.get("fields"):
+        names = request.args["fields"].split(",")
+        unknown = [name for name in names if name not in fields]
+        if unknown:
+            raise ValueError(
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Available: {', '.join(fields)}"
+            )
+        selected = {name: fields[name] for name in names}
+    getters = list(selected.items())
+    return lambda item: {name: get(item) for name, get in getters}
+
+
+def _limit() -> int:
+    limit = _int_arg("limit")
+    if limit is None:
+        return DEFAULT_LIMIT
+    if limit < 1:
+        raise ValueError("limit must be a positive integer.")
+    return min(limit, MAX_LIMIT)
+
+
+def _int_arg(name: str):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer.") from None
+
+
+def _datetime_arg(name: str):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return _naive(datetime.fromisoformat(value))
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 date/time.") from None
+
+
+def _naive(value: datetime) -> datetime:
+    """Bookings are stored as naive local times (compared with
+    ``datetime.now()``), so an offset is converted to local time and dropped."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
@@ -2,12 +2,22 @@ from datetime import datetime, timezone
 
 from flask import Flask, jsonify, request
 
+from src.controllers.booking_controller import register_booking_routes
 from src.database.redis_client import redis_client
+from src.database.request_logger import request_logger
 from src.middleware.auth_middleware import validate_token
+from src.repositories.factory import create_repositories
+from src.utils.pagination import decode_cursor, encode_cursor
 
 
-def create_app():
+def create_app(repositories=None):
+    """Build the Flask app.
+
+    ``repositories`` is the ``(users, rooms, bookings)`` tuple served by the
+    booking endpoints; by default the configured storage backend is used.
+    """
     app = Flask(__name__)
+    register_booking_routes(app, *(repositories or create_repositories()))
 
     @app.route("/clear-responses", methods=["DELETE"])
     @validate_token
@@ -34,12 +44,12 @@ def create_app():
         ip_address = request.remote_addr
         user_agent = request.headers.get("User-Agent")
 
-        # Save to Redis
-        redis_client.save_request(
+        # Queue for Redis (written in batches off the request path)
+        request_logger.log(
             endpoint="/health",
             ip_address=ip_address,
             user_agent=user_agent,
-            additional_data={"response_status": "ok"},
+            additional_data={"response_status": "ok", "status_code": 200},
         )
 
         return (
@@ -60,12 +70,12 @@ def create_app():
         ip_address = request.remote_addr
         user_agent = request.headers.get("User-Agent")
 
-        # Save to Redis
-        redis_client.save_request(
+        # Queue for Redis (written in batches off the request path)
+        request_logger.log(
             endpoint="/ping",
             ip_address=ip_address,
             user_agent=user_agent,
-            additional_data={"response": "pong"},
+            additional_data={"response": "pong", "status_code": 200},
         )
 
         return (
@@ -82,18 +92,30 @@ def create_app():
     @app.route("/get-responses", methods=["GET"])
     @validate_token
     def get_responses():
-        """Get all persisted requests from Redis.
+        """Get persisted requests from Redis, newest first.
 
-        Returns all stored health check and ping requests with metadata.
+        Query parameters (all optional): ``endpoint``, ``since``/``until``
+        (ISO 8601, UTC when naive), ``limit`` (default 100, at most 500)
+        and ``cursor``, the ``next_cursor`` of the previous page.
         """
-        # Get query parameters
-        endpoint = request.args.get("endpoint")  # Optional filter
-        limit = int(request.args.get("limit", 100))  # Default 100
-
-        if endpoint:
-            requests_data = redis_client.get_requests_by_endpoint(endpoint, limit)
-        else:
-            requests_data = redis_client.get_all_requests(limit)
+        try:
+            limit = _limit_arg()
+            after = None
+            if "cursor" in request.args:
+                try:
+                    score, seen = decode_cursor(request.args["cursor"])
+                    after = (float(score), int(seen))
+                except (TypeError, ValueError):
+                    raise ValueError("Invalid cursor.") from None
+            requests_data, position = redis_client.get_requests_page(
+                endpoint=request.args.get("endpoint"),
+                since=_time_arg("since"),
+                until=_time_arg("until"),
+                after=after,
+                limit=limit,
+            )
+        except ValueError as e:
+            return jsonify({"error": "Invalid query", "message": str(e)}), 400
 
         stats = redis_client.get_stats()
 
@@ -103,12 +125,49 @@ def create_app():
                     "total_returned": len(requests_data),
                     "redis_connected": redis_client.is_connected(),
                     "stats": stats,
+                    "request_log": request_logger.metrics(),
                     "requests": requests_data,
+                    "next_cursor": encode_cursor(list(position)) if position else None,
                 }
             ),
             200,
         )
 
+    @app.route("/get-responses/summary", methods=["GET"])
+    @validate_token
+    def get_responses_summary():
+        """Request counts per time bucket, per endpoint and per client IP.
+
+        Query parameters: ``from`` and ``to`` (ISO 8601, UTC when naive;
+        default the last 60 buckets) and ``bucket`` (``minute`` or
+        ``hour``, default minute). Read from the rollups, not the raw log.
+        """
+        try:
+            summary = redis_client.get_request_summary(
+                _time_arg("from"), _time_arg("to"), request.args.get("bucket", "minute")
+            )
+        except ValueError as e:
+            return jsonify({"error": "Invalid query", "message": str(e)}), 400
+        return jsonify(summary), 200
+
+    @app.route("/stats", methods=["GET"])
+    @validate_token
+    def stats():
+        """Request counters per endpoint and status, unique clients and a
+        per-minute series for the last ``minutes`` minutes (default 60, at
+        most 1440), answered in one round trip to Redis.
+        """
+        try:
+            minutes = int(request.args.get("minutes", 60))
+        except ValueError:
+            return (
+                jsonify(
+                    {"error": "Invalid query", "message": "minutes must be an integer."}
+                ),
+                400,
+            )
+        return jsonify(redis_client.get_request_stats(minutes)), 200
+
     @app.route("/register-token", methods=["POST"])
     def register_token():
         """Registra un token JWT en Redis para testing.
@@ -161,3 +220,23 @@ def create_app():
             )
 
     return app
+
+
+def _time_arg(name: str):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 date/time.") from None
+
+
+def _limit_arg() -> int:
+    try:
+        limit = int(request.args.get("limit", 100))
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        raise ValueError("limit must be a positive integer.")
+    return limit
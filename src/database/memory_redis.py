@@ -0,0 +1,575 @@
+import heapq
+import queue
+import random
+import threading
+import time
+from fnmatch import fnmatchcase
+
+import redis
+
+_MAX_LEVEL = 32
+
+
+class _Node:
+    __slots__ = ("entry", "next", "width")
+
+    def __init__(self, entry, height: int):
+        self.entry = entry
+        self.next = [None] * height
+        # Level-0 steps spanned by each forward link
+        self.width = [1] * height
+
+
+class _SkipList:
+    """Indexable skiplist of unique, comparable entries.
+
+    Insert, remove, rank and index lookups are O(log n) expected and a
+    slice of k entries costs O(log n + k), like Redis' own sorted sets.
+    Each link records how many entries it skips, which is what makes
+    ranks and slices logarithmic. Supports ``len()`` and slicing, so it
+    reads like the sorted list it replaces.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.tail = _Node(None, 0)
+        self.head = _Node(None, _MAX_LEVEL)
+        self.head.next = [self.tail] * _MAX_LEVEL
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: slice) -> list:
+        start, stop, _ = index.indices(self.size)
+        entries = []
+        if start < stop:
+            node = self._path(index=start)[0][0].next[0]
+            for _ in range(stop - start):
+                entries.append(node.entry)
+                node = node.next[0]
+        return entries
+
+    def _path(self, before=None, index=None):
+        """Per level, the last node before the position and its index.
+
+        The position is the first entry for which ``before(entry)`` is
+        false, or the entry at ``index``.
+        """
+        chain = [None] * _MAX_LEVEL
+        positions = [0] * _MAX_LEVEL
+        node, position = self.head, -1
+        for level in range(_MAX_LEVEL - 1, -1, -1):
+            while True:
+                following = node.next[level]
+                if following is self.tail:
+                    break
+                if before is not None and not before(following.entry):
+                    break
+                if index is not None and position + node.width[level] >= index:
+                    break
+                position += node.width[level]
+                node = following
+            chain[level], positions[level] = node, position
+        return chain, positions
+
+    def rank(self, before) -> int:
+        """Number of leading entries for which ``before(entry)`` holds."""
+        return self._path(before)[1][0] + 1
+
+    def insert(self, entry):
+        chain, positions = self._path(entry.__gt__)
+        height = 1
+        while height < _MAX_LEVEL and random.random() < 0.5:
+            height += 1
+        node = _Node(entry, height)
+        position = positions[0] + 1
+        for level in range(height):
+            previous = chain[level]
+            span = position - positions[level]
+            node.next[level] = previous.next[level]
+            node.width[level] = previous.width[level] - span + 1
+            previous.next[level] = node
+            previous.width[level] = span
+        for level in range(height, _MAX_LEVEL):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, entry):
+        chain, _ = self._path(entry.__gt__)
+        node = chain[0].next[0]
+        for level in range(_MAX_LEVEL):
+            previous = chain[level]
+            if previous.next[level] is node:
+                previous.width[level] += node.width[level] - 1
+                previous.next[level] = node.next[level]
+            else:
+                previous.width[level] -= 1
+        self.size -= 1
+
+    def remove_range(self, start: int, stop: int):
+        """Unlink the entries at indexes ``start..stop-1`` in one pass."""
+        count = stop - start
+        if count <= 0:
+            return
+        chain, positions = self._path(index=start)
+        for level in range(_MAX_LEVEL):
+            previous = chain[level]
+            following = previous.next[level]
+            position = positions[level] + previous.width[level]
+            while following is not self.tail and position < stop:
+                position += following.width[level]
+                following = following.next[level]
+            previous.next[level] = following
+            previous.width[level] = position - positions[level] - count
+        self.size -= count
+
+
+class _SortedSet:
+    """Members ordered by (score, member), as Redis orders them.
+
+    ``scores`` answers member lookups in O(1) and ``entries`` is an
+    indexable skiplist, so adds, removals and rank/score range lookups are
+    O(log n) and reading or removing k entries adds O(k).
+    """
+
+    def __init__(self):
+        self.scores = {}
+        self.entries = _SkipList()
+
+    def add(self, member: str, score: float) -> bool:
+        old = self.scores.get(member)
+        if old == score:
+            return False
+        if old is not None:
+            self.entries.remove((old, member))
+        self.scores[member] = score
+        self.entries.insert((score, member))
+        return old is None
+
+    def remove_slice(self, start: int, stop: int) -> list:
+        removed = self.entries[start:stop]
+        self.entries.remove_range(start, stop)
+        for _, member in removed:
+            del self.scores[member]
+        return removed
+
+    def score_range(self, low, high):
+        """Index range of the entries with ``low <= score <= high``.
+
+        Bounds may be floats, "-inf"/"+inf" or "(x" for an exclusive bound.
+        """
+        low_value, low_open = _bound(low)
+        high_value, high_open = _bound(high)
+        if low_open:
+            start = self.entries.rank(lambda entry: entry[0] <= low_value)
+        else:
+            start = self.entries.rank(lambda entry: entry[0] < low_value)
+        if high_open:
+            stop = self.entries.rank(lambda entry: entry[0] < high_value)
+        else:
+            stop = self.entries.rank(lambda entry: entry[0] <= high_value)
+        return start, max(start, stop)
+
+
+def _bound(value):
+    if isinstance(value, str):
+        if value.startswith("("):
+            return float(value[1:]), True
+        return float(value), False
+    return float(value), False
+
+
+def _index_range(length: int, start: int, end: int):
+    """Python slice bounds of the inclusive Redis index range ``start..end``."""
+    if start < 0:
+        start = max(length + start, 0)
+    if end < 0:
+        end += length
+    return start, max(start, min(end, length - 1) + 1)
+
+
+class MemoryRedis:
+    """In-process stand-in for the subset of Redis that ``RedisClient`` uses.
+
+    Strings, lists (newest first, stored reversed so LPUSH appends), hashes,
+    sets, sorted sets, HyperLogLogs (exact: a set), pub/sub within the process and
+    key expiry. Expired keys are removed lazily by a heap of deadlines
+    checked before every command, so EXPIREAT is exact without a sweeper
+    thread. Values come back as ``str``, like ``decode_responses=True``.
+
+    Lua scripts cannot run here: ``scripts`` maps a script's source to a
+    Python function ``(db, keys, args)`` that does the same through this
+    object's commands.
+    """
+
+    def __init__(self, scripts: dict = None, clock=None):
+        self.scripts = dict(scripts or {})
+        self.clock = clock or time.time
+        self._data = {}
+        self._expires = {}
+        self._deadlines = []
+        self._channels = {}
+        self._lock = threading.RLock()
+
+    # Keyspace
+
+    def _purge(self):
+        now = self.clock()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, key = heapq.heappop(self._deadlines)
+            # Stale heap entries (expiry changed or removed) are skipped
+            if self._expires.get(key) == deadline:
+                self._remove(key)
+
+    def _remove(self, key: str) -> bool:
+        self._expires.pop(key, None)
+        return self._data.pop(key, None) is not None
+
+    def _get(self, key: str, kind, create: bool = False):
+        value = self._data.get(key)
+        if value is None:
+            if not create:
+                return None
+            value = self._data[key] = kind()
+        elif not isinstance(value, kind):
+            raise redis.ResponseError(
+                "WRONGTYPE Operation against a key holding the wrong kind of value"
+            )
+        return value
+
+    def _drop_if_empty(self, key: str, value):
+        if not value or (isinstance(value, _SortedSet) and not value.entries):
+            self._remove(key)
+
+    def _set_deadline(self, key: str, deadline: float):
+        if self._expires.get(key) == deadline:
+            return
+        self._expires[key] = deadline
+        heapq.heappush(self._deadlines, (deadline, key))
+        # Rewritten deadlines leave stale entries behind; rebuild the heap
+        # once they outnumber the live ones so it stays O(keys with a TTL)
+        if len(self._deadlines) > 2 * len(self._expires) + 16:
+            self._deadlines = [(d, k) for k, d in self._expires.items()]
+            heapq.heapify(self._deadlines)
+
+    def _command(method):
+        def run(self, *args, **kwargs):
+            with self._lock:
+                self._purge()
+                return method(self, *args, **kwargs)
+
+        run.__name__ = method.__name__
+        run.__doc__ = method.__doc__
+        return run
+
+    @_command
+    def ping(self):
+        return True
+
+    @_command
+    def dbsize(self):
+        return len(self._data)
+
+    @_command
+    def flushdb(self):
+        self._data.clear()
+        self._expires.clear()
+        self._deadlines.clear()
+        return True
+
+    @_command
+    def exists(self, *keys):
+        return sum(1 for key in keys if key in self._data)
+
+    @_command
+    def delete(self, *keys):
+        return sum(1 for key in keys if self._remove(key))
+
+    unlink = delete
+
+    @_command
+    def expireat(self, key, when):
+        if key not in self._data:
+            return False
+        self._set_deadline(key, float(when))
+        return True
+
+    @_command
+    def expire(self, key, seconds):
+        if key not in self._data:
+            return False
+        self._set_deadline(key, self.clock() + seconds)
+        return True
+
+    @_command
+    def pttl(self, key):
+        if key not in self._data:
+            return -2
+        if key not in self._expires:
+            return -1
+        return max(0, int((self._expires[key] - self.clock()) * 1000))
+
+    @_command
+    def scan_iter(self, match=None, count=None):
+        # Snapshot, so callers may delete while iterating
+        keys = [key for key in self._data if match is None or fnmatchcase(key, match)]
+        return iter(keys)
+
+    # Strings
+
+    @_command
+    def set(self, key, value, ex=None, px=None, exat=None):
+        self._remove(key)
+        self._data[key] = str(value)
+        if ex is not None:
+            self._set_deadline(key, self.clock() + ex)
+        elif px is not None:
+            self._set_deadline(key, self.clock() + px / 1000)
+        elif exat is not None:
+            self._set_deadline(key, float(exat))
+        return True
+
+    def setex(self, key, seconds, value):
+        return self.set(key, value, ex=seconds)
+
+    @_command
+    def get(self, key):
+        return self._get(key, str)
+
+    @_command
+    def mget(self, keys):
+        return [
+            value if isinstance(value, str) else None
+            for value in map(self._data.get, keys)
+        ]
+
+    # Lists: stored oldest first, so index i from the head is items[-1 - i]
+
+    @_command
+    def lpush(self, key, *values):
+        items = self._get(key, list, create=True)
+        items.extend(map(str, values))
+        return len(items)
+
+    @_command
+    def lrange(self, key, start, end):
+        items = self._get(key, list) or []
+        first, stop = _index_range(len(items), start, end)
+        return items[len(items) - stop : len(items) - first][::-1]
+
+    @_command
+    def ltrim(self, key, start, end):
+        items = self._get(key, list)
+        if items is not None:
+            first, stop = _index_range(len(items), start, end)
+            items[:] = items[len(items) - stop : len(items) - first]
+            self._drop_if_empty(key, items)
+        return True
+
+    @_command
+    def llen(self, key):
+        return len(self._get(key, list) or [])
+
+    # Hashes
+
+    @_command
+    def hincrby(self, key, field, amount=1):
+        values = self._get(key, dict, create=True)
+        values[field] = str(int(values.get(field, 0)) + amount)
+        return int(values[field])
+
+    @_command
+    def hgetall(self, key):
+        return dict(self._get(key, dict) or {})
+
+    @_command
+    def hkeys(self, key):
+        return list(self._get(key, dict) or {})
+
+    # Sorted sets
+
+    @_command
+    def zadd(self, key, mapping):
+        members = self._get(key, _SortedSet, create=True)
+        return sum(members.add(str(m), float(s)) for m, s in mapping.items())
+
+    @_command
+    def zcard(self, key):
+        members = self._get(key, _SortedSet)
+        return len(members.entries) if members else 0
+
+    @_command
+    def zrange(self, key, start, end, withscores=False):
+        members = self._get(key, _SortedSet)
+        if not members:
+            return []
+        first, stop = _index_range(len(members.entries), start, end)
+        return _members(members.entries[first:stop], withscores)
+
+    @_command
+    def zrevrange(self, key, start, end, withscores=False):
+        members = self._get(key, _SortedSet)
+        if not members:
+            return []
+        length = len(members.entries)
+        first, stop = _index_range(length, start, end)
+        entries = members.entries[length - stop : length - first][::-1]
+        return _members(entries, withscores)
+
+    @_command
+    def zrangebyscore(self, key, low, high, start=None, num=None, withscores=False):
+        members = self._get(key, _SortedSet)
+        if not members:
+            return []
+        first, stop = members.score_range(low, high)
+        if start is not None:
+            first = min(first + start, stop)
+            if num is not None and num >= 0:
+                stop = min(first + num, stop)
+        return _members(members.entries[first:stop], withscores)
+
+    @_command
+    def zrevrangebyscore(self, key, high, low, start=None, num=None, withscores=False):
+        members = self._get(key, _SortedSet)
+        if not members:
+            return []
+        first, stop = members.score_range(low, high)
+        if start is not None:
+            stop = max(stop - start, first)
+            if num is not None and num >= 0:
+                first = max(stop - num, first)
+        return _members(members.entries[first:stop][::-1], withscores)
+
+    @_command
+    def zremrangebyrank(self, key, start, end):
+        members = self._get(key, _SortedSet)
+        if not members:
+            return 0
+        first, stop = _index_range(len(members.entries), start, end)
+        removed = members.remove_slice(first, stop)
+        self._drop_if_empty(key, members)
+        return len(removed)
+
+    @_command
+    def zremrangebyscore(self, key, low, high):
+        members = self._get(key, _SortedSet)
+        if not members:
+            return 0
+        removed = members.remove_slice(*members.score_range(low, high))
+        self._drop_if_empty(key, members)
+        return len(removed)
+
+    # Sets
+
+    @_command
+    def sadd(self, key, *values):
+        members = self._get(key, set, create=True)
+        before = len(members)
+        members.update(map(str, values))
+        return len(members) - before
+
+    @_command
+    def smembers(self, key):
+        return set(self._get(key, set) or ())
+
+    # HyperLogLog (exact)
+
+    @_command
+    def pfadd(self, key, *values):
+        seen = self._get(key, set, create=True)
+        before = len(seen)
+        seen.update(map(str, values))
+        return int(len(seen) != before)
+
+    @_command
+    def pfcount(self, key):
+        return len(self._get(key, set) or ())
+
+    # Scripts
+
+    @_command
+    def eval(self, script, numkeys, *keys_and_args):
+        handler = self.scripts.get(script)
+        if handler is None:
+            raise redis.ResponseError("NOSCRIPT No Python handler for this script")
+        return handler(self, keys_and_args[:numkeys], keys_and_args[numkeys:])
+
+    # Pub/sub
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber.put({"type": "message", "channel": channel, "data": message})
+        return len(subscribers)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return _PubSub(self)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    del _command
+
+
+def _members(entries, withscores: bool):
+    if withscores:
+        return [(member, score) for score, member in entries]
+    return [member for _, member in entries]
+
+
+class _Pipeline:
+    """Queues commands and runs them back to back under the store's lock."""
+
+    def __init__(self, db: MemoryRedis):
+        self._db = db
+        self._commands = []
+
+    def __getattr__(self, name):
+        command = getattr(self._db, name)
+
+        def queue_command(*args, **kwargs):
+            self._commands.append((command, args, kwargs))
+            return self
+
+        return queue_command
+
+    def execute(self, raise_on_error=True):
+        commands, self._commands = self._commands, []
+        results = []
+        with self._db._lock:
+            for command, args, kwargs in commands:
+                try:
+                    results.append(command(*args, **kwargs))
+                except redis.ResponseError as e:
+                    if raise_on_error:
+                        raise
+                    results.append(e)
+        return results
+
+
+class _PubSub:
+    def __init__(self, db: MemoryRedis):
+        self._db = db
+        self._messages = queue.Queue()
+        self._channels = []
+
+    def subscribe(self, *channels):
+        with self._db._lock:
+            for channel in channels:
+                self._db._channels.setdefault(channel, []).append(self._messages)
+                self._channels.append(channel)
+
+    def get_message(self, timeout=0.0):
+        try:
+            if timeout:
+                return self._messages.get(timeout=timeout)
+            return self._messages.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self):
+        with self._db._lock:
+            for channel in self._channels:
+                self._db._channels[channel].remove(self._messages)
+            self._channels = []
@@ -1,59 +1,247 @@
 import json
 import os
-from datetime import datetime, timezone
-from typing import Dict, List, Optional
+import re
+import secrets
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 
 import redis
 
+from src.database.circuit_breaker import OPEN, CircuitBreaker
+from src.database.memory_redis import MemoryRedis
+
+# Keys per SCAN page / UNLINK call when clearing the log
+CLEAR_BATCH = 500
+# Each logged request is stored once, as compact JSON under request:<id>; the
+# all_requests list and requests:<endpoint> sorted sets only hold the ids
+RECORD_KEY = "request"
+# Trim an endpoint's sorted set by age (ARGV[2], a score; "" to skip) and
+# count (ARGV[1]; 0 to skip) and unlink the records of the ids removed.
+# KEYS[1] is the sorted set, ARGV[3] the record key prefix.
+TRIM_SCRIPT = """
+local budget = tonumber(ARGV[4])
+local stale = {}
+if ARGV[2] ~= "" then
+    stale = redis.call("ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[2], "LIMIT", 0, budget)
+    if #stale > 0 then
+        redis.call("ZREMRANGEBYRANK", KEYS[1], 0, #stale - 1)
+    end
+end
+local max_entries = tonumber(ARGV[1])
+local excess = 0
+if max_entries > 0 then
+    excess = math.min(redis.call("ZCARD", KEYS[1]) - max_entries, budget - #stale)
+end
+if excess > 0 then
+    local extra = redis.call("ZRANGE", KEYS[1], 0, excess - 1)
+    redis.call("ZREMRANGEBYRANK", KEYS[1], 0, excess - 1)
+    for _, id in ipairs(extra) do
+        stale[#stale + 1] = id
+    end
+end
+for i = 1, #stale, 500 do
+    local batch = {}
+    for j = i, math.min(i + 499, #stale) do
+        batch[#batch + 1] = ARGV[3] .. stale[j]
+    end
+    redis.call("UNLINK", unpack(batch))
+end
+return #stale
+"""
+# Counters kept at write time: total, endpoint:<endpoint>, status:<status>
+STATS_KEY = "request_stats"
+# Set of logged endpoints, so readers need no SCAN. Its empty member marks
+# that endpoints logged before the set existed have been backfilled.
+ENDPOINTS_KEY = "request_endpoints"
+_DAY_SUFFIX = re.compile(r":\d{4}-\d{2}-\d{2}$")
+# HyperLogLog of client IP addresses
+CLIENTS_KEY = "request_clients"
+# Rollups: bucket -> (bucket size, strftime of the hash holding it, strftime
+# of its slot). Minute buckets share one hash per hour and hour buckets one
+# hash per day, with fields "<slot>|total", "<slot>|endpoint:<endpoint>" and
+# "<slot>|ip:<ip_address>".
+ROLLUP_KEY = "request_rollup"
+ROLLUP_BUCKETS = {
+    "minute": (timedelta(minutes=1), "%Y-%m-%dT%H", "%M"),
+    "hour": (timedelta(hours=1), "%Y-%m-%d", "%H"),
+}
+DEFAULT_SUMMARY_BUCKETS = 60
+# Largest page get_requests_page returns, whatever the caller asks for
+MAX_PAGE_SIZE = 500
+# Pub/sub channel carrying tokens whose cached validation must be dropped
+TOKEN_CHANNEL = "token_invalidations"
+MAX_SUMMARY_BUCKETS = 1440
+
 
 class RedisClient:
     def clear_all_requests(self) -> bool:
         """Elimina todas las respuestas persistidas en Redis."""
-        if not self.is_connected():
-            return False
-        try:
-            # Eliminar lista general
-            self.client.delete("all_requests")
-            # Eliminar sets de endpoints conocidos
-            self.client.delete("requests:/health")
-            self.client.delete("requests:/ping")
-            # Si hay más endpoints, podrías usar scan y delete por patrón
+
+        def clear(client):
+            # SCAN incremental de la lista general, los sets de todos los
+            # endpoints (también las claves diarias) y los contadores; UNLINK
+            # por lotes libera la memoria fuera del event loop de Redis
+            for pattern in (
+                "all_requests*",
+                "requests:*",
+                f"{RECORD_KEY}:*",
+                STATS_KEY,
+                ENDPOINTS_KEY,
+                CLIENTS_KEY,
+                f"{ROLLUP_KEY}:*",
+            ):
+                batch = []
+                for key in client.scan_iter(match=pattern, count=CLEAR_BATCH):
+                    batch.append(key)
+                    if len(batch) == CLEAR_BATCH:
+                        client.unlink(*batch)
+                        batch = []
+                if batch:
+                    client.unlink(*batch)
             return True
-        except Exception as e:
-            print(f"Error clearing requests in Redis: {e}")
-            return False
+
+        return self._call(clear, False, "Error clearing requests in Redis")
 
     """Redis client for storing health check and ping requests."""
 
-    def __init__(self):
-        """Initialize Redis connection."""
+    def __init__(self, pool: redis.ConnectionPool = None, breaker=None, backend=None):
+        """Initialize the connection pool; connections are opened on demand.
+
+        ``backend`` replaces the redis-py client with any object offering
+        the same commands. With ``REDIS_BACKEND=memory`` (and no backend
+        given) an in-process ``MemoryRedis`` is used and no server is
+        needed; data then lives and dies with the process.
+
+        The pool and circuit breaker are configured from the environment
+        unless given: ``REDIS_MAX_CONNECTIONS``, ``REDIS_CONNECT_TIMEOUT``,
+        ``REDIS_SOCKET_TIMEOUT``, ``REDIS_BREAKER_THRESHOLD`` (failures
+        before failing fast) and ``REDIS_BREAKER_COOLDOWN`` (seconds before
+        a probe).
+
+        Rollups are kept ``REDIS_ROLLUP_MINUTE_TTL`` (per-minute buckets,
+        default 2 days) and ``REDIS_ROLLUP_HOUR_TTL`` (per-hour buckets,
+        default 30 days) seconds after their hash stops receiving writes.
+
+        Retention of the request log is enforced on every write:
+        ``REDIS_LOG_MAX_ENTRIES`` caps each list/sorted set (0 = unlimited),
+        ``REDIS_LOG_MAX_AGE`` drops entries older than that many seconds
+        (0 = keep forever) and ``REDIS_LOG_DAILY_KEYS=1`` partitions the log
+        into one key per UTC day that expires ``REDIS_LOG_MAX_AGE`` seconds
+        after the day ends. ``REDIS_LOG_TRIM_BATCH`` bounds how many ids one
+        write trims from a sorted set, so a large backlog is drained a batch
+        per write instead of in one blocking script call.
+        """
         self.host = os.getenv("REDIS_HOST", "localhost")
         self.port = int(os.getenv("REDIS_PORT", 6379))
         self.db = int(os.getenv("REDIS_DB", 0))
 
-        try:
-            self.client = redis.Redis(
+        if backend is None and os.getenv("REDIS_BACKEND", "redis") == "memory":
+            backend = MemoryRedis()
+        if backend is not None:
+            self.pool = None
+            self.client = backend
+        else:
+            self.pool = pool or redis.ConnectionPool(
                 host=self.host,
                 port=self.port,
                 db=self.db,
                 decode_responses=True,
-                socket_connect_timeout=5,
+                max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", 50)),
+                socket_connect_timeout=float(os.getenv("REDIS_CONNECT_TIMEOUT", 5)),
+                socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", 5)),
             )
-            # Test connection
-            self.client.ping()
-        except (redis.ConnectionError, redis.TimeoutError) as e:
-            print(f"Warning: Redis not available: {e}")
-            self.client = None
+            self.client = redis.Redis(connection_pool=self.pool)
+        if isinstance(self.client, MemoryRedis):
+            self.client.scripts.setdefault(TRIM_SCRIPT, _trim_sorted_set)
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=int(os.getenv("REDIS_BREAKER_THRESHOLD", 5)),
+            reset_timeout=float(os.getenv("REDIS_BREAKER_COOLDOWN", 30)),
+        )
+        self.max_entries = int(os.getenv("REDIS_LOG_MAX_ENTRIES", 10000))
+        self.max_age = int(os.getenv("REDIS_LOG_MAX_AGE", 7 * 24 * 3600))
+        self.daily_keys = os.getenv("REDIS_LOG_DAILY_KEYS") == "1"
+        self.trim_batch = int(os.getenv("REDIS_LOG_TRIM_BATCH", 1000))
+        if self.daily_keys and self.max_age <= 0:
+            raise ValueError("REDIS_LOG_DAILY_KEYS needs a positive REDIS_LOG_MAX_AGE")
+        self.rollup_ttls = {
+            "minute": int(os.getenv("REDIS_ROLLUP_MINUTE_TTL", 2 * 24 * 3600)),
+            "hour": int(os.getenv("REDIS_ROLLUP_HOUR_TTL", 30 * 24 * 3600)),
+        }
+        # Outcome of the last command; None until Redis has been used
+        self._healthy = None
 
     def is_connected(self) -> bool:
-        """Check if Redis is connected."""
-        if self.client is None:
-            return False
+        """Check if Redis is connected.
+
+        Answered from the outcome of the last command and the circuit
+        breaker; only the very first call issues a PING.
+        """
+        if self._healthy is None:
+            self._call(lambda client: client.ping(), False, "Redis not available")
+        return bool(self._healthy) and self.breaker.state != OPEN
+
+    def _call(self, operation, default, error_message: str):
+        """Run ``operation(client)`` through the circuit breaker.
+
+        Returns ``default`` without touching the network while the breaker
+        is open, and when the command fails. Only connection errors and
+        timeouts count as failures; other errors mean Redis answered.
+        """
+        if not self.breaker.allow_request():
+            return default
         try:
-            self.client.ping()
-            return True
-        except (redis.ConnectionError, redis.TimeoutError):
-            return False
+            result = operation(self.client)
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            self._healthy = False
+            self.breaker.record_failure()
+            print(f"{error_message}: {e}")
+            return default
+        except Exception as e:
+            self._healthy = True
+            self.breaker.record_success()
+            print(f"{error_message}: {e}")
+            return default
+        self._healthy = True
+        self.breaker.record_success()
+        return result
+
+    def _key(self, base: str, day: date) -> str:
+        return f"{base}:{day.isoformat()}" if self.daily_keys else base
+
+    def _keys(self, base: str) -> List[str]:
+        """Keys holding ``base``, newest first.
+
+        With daily keys that is one key per day still within retention, so
+        reads touch a bounded number of keys.
+        """
+        if not self.daily_keys:
+            return [base]
+        today = datetime.now(timezone.utc).date()
+        days = self.max_age // 86400 + 2
+        return [self._key(base, today - timedelta(days=i)) for i in range(days)]
+
+    @staticmethod
+    def _day_end(day: date) -> int:
+        """Epoch seconds at which the UTC ``day`` ends."""
+        end = datetime.combine(day + timedelta(days=1), datetime.min.time())
+        return int(end.replace(tzinfo=timezone.utc).timestamp())
+
+    @staticmethod
+    def build_request(
+        endpoint: str,
+        ip_address: str,
+        user_agent: Optional[str] = None,
+        additional_data: Optional[Dict] = None,
+    ) -> Dict:
+        """Build the record stored for one request, stamped with the current time."""
+        return {
+            "endpoint": endpoint,
+            "ip_address": ip_address,
+            "user_agent": user_agent or "unknown",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "additional_data": additional_data or {},
+        }
 
     def save_request(
         self,
@@ -73,34 +261,278 @@ class RedisClient:
         Returns:
             The key used to store the data
         """
-        if not self.is_connected():
+        data = self.build_request(endpoint, ip_address, user_agent, additional_data)
+        if not self.save_requests([data]):
             return None
+        return f"{endpoint}:{data['timestamp']}"
+
+    def save_requests(self, requests: List[Dict]) -> int:
+        """Store records built by ``build_request`` in one pipelined round trip.
+
+        Each record is stored once, as compact JSON under a random id, and
+        only the id goes into the ``all_requests`` list and the endpoint's
+        sorted set. Retention is applied in the same pipeline, only to the
+        keys written: since every write trims, each trim removes about as
+        many entries as were just added. The sorted sets own the records,
+        so trimming one also unlinks the records it drops; records also
+        expire with ``REDIS_LOG_MAX_AGE``. Returns how many were stored
+        (all or nothing).
+        """
+        if not requests:
+            return 0
+
+        def save(client):
+            pipe = client.pipeline(transaction=False)
+            by_endpoint = {}
+            by_list = {}
+            expiry = {}
+            for data in requests:
+                request_id = secrets.token_urlsafe(9)
+                moment = datetime.fromisoformat(data["timestamp"])
+                day = moment.astimezone(timezone.utc).date()
+                if self.daily_keys:
+                    expires = {"exat": self._day_end(day) + self.max_age}
+                else:
+                    expires = {"ex": self.max_age} if self.max_age > 0 else {}
+                pipe.set(
+                    f"{RECORD_KEY}:{request_id}",
+                    json.dumps(data, separators=(",", ":")),
+                    **expires,
+                )
+                endpoint_key = self._key(f"requests:{data['endpoint']}", day)
+                list_key = self._key("all_requests", day)
+                by_endpoint.setdefault(endpoint_key, {})[
+                    request_id
+                ] = moment.timestamp()
+                by_list.setdefault(list_key, []).append(request_id)
+                expiry[endpoint_key] = expiry[list_key] = day
+            # Index ids in a sorted set per endpoint with timestamp as score
+            min_score = ""
+            if self.max_age > 0 and not self.daily_keys:
+                min_score = time.time() - self.max_age
+            for key, members in by_endpoint.items():
+                pipe.zadd(key, members)
+                if self.max_entries > 0 or min_score != "":
+                    # EVAL rather than EVALSHA: no NOSCRIPT handling mid-pipeline,
+                    # and the script text is small next to a batch of records
+                    pipe.eval(
+                        TRIM_SCRIPT,
+                        1,
+                        key,
+                        self.max_entries,
+                        min_score,
+                        f"{RECORD_KEY}:",
+                        self.trim_batch,
+                    )
+            # Also in a list for easy retrieval (newest first); ids left
+            # behind by a trimmed sorted set are skipped when read
+            for key, ids in by_list.items():
+                pipe.lpush(key, *ids)
+                if self.max_entries > 0:
+                    pipe.ltrim(key, 0, self.max_entries - 1)
+            if self.daily_keys:
+                # Whole days expire at once, without scanning their entries
+                for key, day in expiry.items():
+                    pipe.expireat(key, self._day_end(day) + self.max_age)
+            pipe.sadd(ENDPOINTS_KEY, *{data["endpoint"] for data in requests})
+            self._count_requests(pipe, requests)
+            pipe.execute()
+            return len(requests)
+
+        return self._call(save, 0, "Error saving to Redis")
+
+    def _count_requests(self, pipe, requests: List[Dict]):
+        """Queue the counter and rollup updates for ``requests`` on ``pipe``.
+
+        Increments are summed locally first, so a batch costs one HINCRBY
+        per distinct field.
+        """
+        totals = {"total": len(requests)}
+        rollups = {}
+        for data in requests:
+            status = (data.get("additional_data") or {}).get("status_code", "unknown")
+            moment = datetime.fromisoformat(data["timestamp"]).astimezone(timezone.utc)
+            for field in (f"endpoint:{data['endpoint']}", f"status:{status}"):
+                totals[field] = totals.get(field, 0) + 1
+            names = (
+                "total",
+                f"endpoint:{data['endpoint']}",
+                f"ip:{data['ip_address']}",
+            )
+            for bucket in ROLLUP_BUCKETS:
+                key, slot, expires = self._rollup_slot(bucket, moment)
+                fields = rollups.setdefault(key, (expires, {}))[1]
+                for name in names:
+                    field = f"{slot}|{name}"
+                    fields[field] = fields.get(field, 0) + 1
+        for field, amount in totals.items():
+            pipe.hincrby(STATS_KEY, field, amount)
+        for key, (expires, fields) in rollups.items():
+            for field, amount in fields.items():
+                pipe.hincrby(key, field, amount)
+            pipe.expireat(key, expires)
+        pipe.pfadd(CLIENTS_KEY, *{data["ip_address"] for data in requests})
+
+    def _rollup_slot(self, bucket: str, moment: datetime):
+        """Return the hash key, slot and expiry time of ``moment``'s bucket."""
+        _, key_format, slot_format = ROLLUP_BUCKETS[bucket]
+        if bucket == "minute":
+            period_end = moment.replace(minute=0, second=0, microsecond=0)
+            period_end += timedelta(hours=1)
+        else:
+            period_end = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+            period_end += timedelta(days=1)
+        return (
+            f"{ROLLUP_KEY}:{bucket}:{moment.strftime(key_format)}",
+            moment.strftime(slot_format),
+            int(period_end.timestamp()) + self.rollup_ttls[bucket],
+        )
+
+    def _queue_rollups(self, pipe, bucket: str, starts: List[datetime]):
+        """Queue an HGETALL per rollup hash covering ``starts`` on ``pipe``.
+
+        Returns a function turning the replies into one dict per bucket.
+        """
+        slots = [self._rollup_slot(bucket, start)[:2] for start in starts]
+        keys = list(dict.fromkeys(key for key, _ in slots))
+        for key in keys:
+            pipe.hgetall(key)
+
+        def summarize(replies: List[Dict]) -> List[Dict]:
+            grouped = {}
+            for key, fields in zip(keys, replies):
+                for field, value in fields.items():
+                    slot, _, name = field.partition("|")
+                    grouped.setdefault((key, slot), {})[name] = int(value)
+            buckets = []
+            for start, (key, slot) in zip(starts, slots):
+                counts = grouped.get((key, slot), {})
+                endpoints = {}
+                clients = {}
+                for name, value in sorted(counts.items()):
+                    kind, _, label = name.partition(":")
+                    if kind == "endpoint":
+                        endpoints[label] = value
+                    elif kind == "ip":
+                        clients[label] = value
+                buckets.append(
+                    {
+                        "start": start.isoformat(),
+                        "requests": counts.get("total", 0),
+                        "endpoints": endpoints,
+                        "clients": clients,
+                    }
+                )
+            return buckets
+
+        return summarize
+
+    @staticmethod
+    def _bucket_starts(bucket: str, start: datetime, end: datetime) -> List[datetime]:
+        """Start of every ``bucket`` from the one holding ``start`` to ``end``."""
+        size = ROLLUP_BUCKETS[bucket][0]
+        # Naive times are taken as UTC, like the stored timestamps
+        start, end = (
+            (
+                moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+            ).astimezone(timezone.utc)
+            for moment in (start, end)
+        )
+        if end < start:
+            raise ValueError("from must not be after to.")
+        seconds = start.timestamp()
+        first = datetime.fromtimestamp(
+            seconds - seconds % size.total_seconds(), timezone.utc
+        )
+        count = int((end - first) / size) + 1
+        if count > MAX_SUMMARY_BUCKETS:
+            raise ValueError(
+                f"At most {MAX_SUMMARY_BUCKETS} buckets per query; "
+                "narrow the range or use a larger bucket."
+            )
+        return [first + size * i for i in range(count)]
 
-        timestamp = datetime.now(timezone.utc).isoformat()
-        request_id = f"{endpoint}:{timestamp}"
+    def get_request_summary(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        bucket: str = "minute",
+    ) -> Dict:
+        """Request counts per ``bucket`` ("minute" or "hour") between two times.
+
+        ``end`` defaults to now and ``start`` to 60 buckets back. Answered
+        from the rollups written at ingest time: one pipelined HGETALL per
+        rollup hash in the range (one per hour for minute buckets, one per
+        day for hour buckets), never the raw log.
+
+        Raises:
+            ValueError: For an unknown bucket, an inverted range or more
+                than ``MAX_SUMMARY_BUCKETS`` buckets
+        """
+        if bucket not in ROLLUP_BUCKETS:
+            raise ValueError(f"bucket must be one of: {', '.join(ROLLUP_BUCKETS)}")
+        end = end or datetime.now(timezone.utc)
+        start = start or end - ROLLUP_BUCKETS[bucket][0] * (DEFAULT_SUMMARY_BUCKETS - 1)
+        starts = self._bucket_starts(bucket, start, end)
+
+        def summary(client):
+            pipe = client.pipeline(transaction=False)
+            summarize = self._queue_rollups(pipe, bucket, starts)
+            return {
+                "connected": True,
+                "bucket": bucket,
+                "from": starts[0].isoformat(),
+                "to": starts[-1].isoformat(),
+                "buckets": summarize(pipe.execute()),
+            }
 
-        data = {
-            "endpoint": endpoint,
-            "ip_address": ip_address,
-            "user_agent": user_agent or "unknown",
-            "timestamp": timestamp,
-            "additional_data": additional_data or {},
-        }
+        return self._call(summary, {"connected": False}, "Error reading rollups")
 
-        try:
-            # Store in a sorted set with timestamp as score
-            key = f"requests:{endpoint}"
-            self.client.zadd(
-                key, {json.dumps(data): datetime.now(timezone.utc).timestamp()}
-            )
+    def get_request_stats(self, minutes: int = 60) -> Dict:
+        """Counters for the whole log plus a per-minute series.
 
-            # Also store in a list for easy retrieval
-            self.client.lpush("all_requests", json.dumps(data))
+        One pipelined round trip (HGETALL, PFCOUNT and the minute rollups of
+        the hours covered), whatever the size of the log. ``minutes`` is the
+        length of the series ending at the current minute, at most a day.
 
-            return request_id
-        except Exception as e:
-            print(f"Error saving to Redis: {e}")
-            return None
+        Returns:
+            Dictionary with totals per endpoint and status, the estimated
+            number of unique clients and ``per_minute`` counts
+        """
+        minutes = max(1, min(minutes, MAX_SUMMARY_BUCKETS))
+        now = datetime.now(timezone.utc)
+        starts = self._bucket_starts(
+            "minute", now - timedelta(minutes=minutes - 1), now
+        )
+
+        def stats(client):
+            pipe = client.pipeline(transaction=False)
+            pipe.hgetall(STATS_KEY)
+            pipe.pfcount(CLIENTS_KEY)
+            summarize = self._queue_rollups(pipe, "minute", starts)
+            counters, unique_clients, *rollups = pipe.execute()
+
+            endpoints = {}
+            statuses = {}
+            for field, value in counters.items():
+                kind, _, name = field.partition(":")
+                if kind == "endpoint":
+                    endpoints[name] = int(value)
+                elif kind == "status":
+                    statuses[name] = int(value)
+            return {
+                "connected": True,
+                "total_requests": int(counters.get("total", 0)),
+                "unique_clients": unique_clients,
+                "endpoints": dict(sorted(endpoints.items())),
+                "statuses": dict(sorted(statuses.items())),
+                "per_minute": [
+                    {"minute": bucket["start"], "requests": bucket["requests"]}
+                    for bucket in summarize(rollups)
+                ],
+            }
+
+        return self._call(stats, {"connected": False}, "Error getting stats")
 
     def get_all_requests(self, limit: int = 100) -> List[Dict]:
         """Get all stored requests.
@@ -111,17 +543,15 @@ class RedisClient:
         Returns:
             List of request dictionaries
         """
-        if not self.is_connected():
-            return []
-
-        try:
-            # Get from list
-            raw_requests = self.client.lrange("all_requests", 0, limit - 1)
-            requests = [json.loads(req) for req in raw_requests]
-            return requests
-        except Exception as e:
-            print(f"Error retrieving from Redis: {e}")
-            return []
+        # Get ids from list (one per day with daily keys, newest day first)
+        return self._call(
+            lambda client: self._fetch_records(
+                client,
+                self._read_keys(client, self._keys("all_requests"), "lrange", limit),
+            ),
+            [],
+            "Error retrieving from Redis",
+        )
 
     def get_requests_by_endpoint(self, endpoint: str, limit: int = 100) -> List[Dict]:
         """Get requests for a specific endpoint.
@@ -133,42 +563,148 @@ class RedisClient:
         Returns:
             List of request dictionaries
         """
-        if not self.is_connected():
-            return []
+        keys = self._keys(f"requests:{endpoint}")
+        # Get ids from sorted set (most recent first)
+        return self._call(
+            lambda client: self._fetch_records(
+                client, self._read_keys(client, keys, "zrevrange", limit)
+            ),
+            [],
+            "Error retrieving from Redis",
+        )
+
+    @staticmethod
+    def _fetch_records(client, members: List[str]) -> List[Dict]:
+        """Load the records of index ``members`` with a single MGET.
+
+        Ids whose record is gone (trimmed or expired) are skipped. Members
+        written before records were stored by id hold the JSON itself.
+        """
+        ids = [member for member in members if not member.startswith("{")]
+        blobs = {}
+        if ids:
+            blobs = dict(zip(ids, client.mget([f"{RECORD_KEY}:{i}" for i in ids])))
+        records = []
+        for member in members:
+            raw = member if member.startswith("{") else blobs[member]
+            if raw is not None:
+                records.append(json.loads(raw))
+        return records
+
+    def get_requests_page(
+        self,
+        endpoint: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after: Optional[Tuple[float, int]] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Dict], Optional[Tuple[float, int]]]:
+        """One page of requests, newest first, from the per-endpoint sorted sets.
+
+        ``since``/``until`` bound the timestamps (inclusive; naive times are
+        UTC). Each sorted set is read with ``ZREVRANGEBYSCORE ... LIMIT`` so
+        a page costs O(log N + limit) per key whatever the log size, and
+        only the returned entries are decoded. Without ``endpoint`` every
+        logged endpoint is merged. ``limit`` is capped at ``MAX_PAGE_SIZE``.
+
+        ``after`` is the position returned with the previous page: the
+        score of its last entry and how many entries with exactly that
+        score it already held, so paging is stable under new writes.
 
-        try:
-            key = f"requests:{endpoint}"
-            # Get from sorted set (most recent first)
-            raw_requests = self.client.zrevrange(key, 0, limit - 1)
-            requests = [json.loads(req) for req in raw_requests]
-            return requests
-        except Exception as e:
-            print(f"Error retrieving from Redis: {e}")
-            return []
+        Returns:
+            The page and the position to pass as ``after`` for the next
+            one (None on the last page)
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        low = _score(since) if since else "-inf"
+        high = _score(until) if until else "+inf"
+        skip = 0
+        if after is not None:
+            after_score, seen = after
+            if until is None or after_score <= high:
+                high, skip = after_score, seen
+
+        def page(client):
+            endpoints = [endpoint] if endpoint else self._endpoints(client)
+            pipe = client.pipeline(transaction=False)
+            for name in endpoints:
+                for key in self._keys(f"requests:{name}"):
+                    pipe.zrevrangebyscore(
+                        key, high, low, start=0, num=skip + limit + 1, withscores=True
+                    )
+            # Same order as ZREVRANGEBYSCORE: score, then member, descending
+            entries = sorted(
+                (entry for rows in pipe.execute() for entry in rows),
+                key=lambda entry: (entry[1], entry[0]),
+                reverse=True,
+            )[skip:]
+            position = None
+            if len(entries) > limit:
+                entries = entries[:limit]
+                last_score = entries[-1][1]
+                seen = sum(1 for _, score in entries if score == last_score)
+                if last_score == high:
+                    seen += skip
+                position = (last_score, seen)
+            return self._fetch_records(client, [m for m, _ in entries]), position
+
+        return self._call(page, ([], None), "Error retrieving from Redis")
+
+    def _endpoints(self, client) -> List[str]:
+        """Every logged endpoint, from ``ENDPOINTS_KEY``.
+
+        Logs written before that set existed (or before the counters) are
+        only known through their ``requests:*`` keys: the first read SCANs
+        them once and records the result, marker included.
+        """
+        names = client.smembers(ENDPOINTS_KEY)
+        if "" not in names:
+            names = set(names) | {""}
+            for key in client.scan_iter(match="requests:*", count=CLEAR_BATCH):
+                name = key[len("requests:") :]
+                names.add(_DAY_SUFFIX.sub("", name) if self.daily_keys else name)
+            client.sadd(ENDPOINTS_KEY, *names)
+        return sorted(name for name in names if name)
+
+    @staticmethod
+    def _read_keys(client, keys: List[str], command: str, limit: int) -> List:
+        """Read the newest ``limit`` entries across ``keys`` (newest first)."""
+        if len(keys) == 1:
+            return getattr(client, command)(keys[0], 0, limit - 1)
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            getattr(pipe, command)(key, 0, limit - 1)
+        return [entry for entries in pipe.execute() for entry in entries][:limit]
 
     def get_stats(self) -> Dict:
         """Get statistics about stored requests.
 
+        Read from the counters maintained at write time (one HGETALL), so
+        the cost does not grow with the log. Counts cover every request
+        logged since the last clear, including those already trimmed by
+        retention.
+
         Returns:
             Dictionary with stats
         """
-        if not self.is_connected():
-            return {"connected": False}
 
-        try:
-            total_requests = self.client.llen("all_requests")
-            health_requests = self.client.zcard("requests:/health")
-            ping_requests = self.client.zcard("requests:/ping")
+        def stats(client):
+            counters = client.hgetall(STATS_KEY)
+            endpoints = {
+                field.partition(":")[2]: int(value)
+                for field, value in sorted(counters.items())
+                if field.startswith("endpoint:")
+            }
 
             return {
                 "connected": True,
-                "total_requests": total_requests,
-                "health_requests": health_requests,
-                "ping_requests": ping_requests,
+                "total_requests": int(counters.get("total", 0)),
+                "health_requests": endpoints.get("/health", 0),
+                "ping_requests": endpoints.get("/ping", 0),
+                "endpoints": endpoints,
             }
-        except Exception as e:
-            print(f"Error getting stats: {e}")
-            return {"connected": False, "error": str(e)}
+
+        return self._call(stats, {"connected": False}, "Error getting stats")
 
     def save_token(self, token: str, expiration_seconds: int = 3600) -> bool:
         """Guarda un token en Redis con expiración opcional.
@@ -180,17 +716,17 @@ class RedisClient:
         Returns:
             True si se guardó exitosamente, False en caso contrario
         """
-        if not self.is_connected():
-            return False
+        key = f"token:{token}"
 
-        try:
-            key = f"token:{token}"
+        def save(client):
+            pipe = client.pipeline(transaction=False)
             # Guardamos el token con un valor simple y TTL
-            self.client.setex(key, expiration_seconds, "valid")
-            return True
-        except Exception as e:
-            print(f"Error saving token to Redis: {e}")
-            return False
+            pipe.setex(key, expiration_seconds, "valid")
+            # Avisamos a los nodos que lo tengan cacheado como inválido
+            pipe.publish(TOKEN_CHANNEL, token)
+            return bool(pipe.execute()[0])
+
+        return self._call(save, False, "Error saving token to Redis")
 
     def validate_token(self, token: str) -> bool:
         """Verifica si un token existe y es válido en Redis.
@@ -201,35 +737,82 @@ class RedisClient:
         Returns:
             True si el token existe y es válido, False en caso contrario
         """
-        if not self.is_connected():
-            return False
+        key = f"token:{token}"
+        return self._call(
+            lambda client: client.exists(key) > 0, False, "Error validating token"
+        )
 
-        try:
-            key = f"token:{token}"
-            return self.client.exists(key) > 0
-        except Exception as e:
-            print(f"Error validating token: {e}")
-            return False
+    def token_ttl(self, token: str) -> Optional[int]:
+        """Milisegundos de vida que le quedan a un token (``PTTL``).
+
+        Returns:
+            Los milisegundos restantes, -1 si el token no expira, -2 si no
+            existe y None si Redis no respondió
+        """
+        key = f"token:{token}"
+        return self._call(
+            lambda client: client.pttl(key), None, "Error validating token"
+        )
+
+    def subscribe_token_invalidations(self):
+        """Abre una suscripción a ``TOKEN_CHANNEL``.
+
+        Returns:
+            Un ``PubSub`` ya suscripto; lanza ``redis.RedisError`` si Redis
+            no está disponible
+        """
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(TOKEN_CHANNEL)
+        return pubsub
 
     def delete_token(self, token: str) -> bool:
         """Elimina un token de Redis (para logout/invalidación).
 
+        Publica el token en ``TOKEN_CHANNEL`` en el mismo round trip para
+        que todos los nodos lo saquen de su caché local al instante.
+
         Args:
             token: El token a eliminar
 
         Returns:
             True si se eliminó exitosamente, False en caso contrario
         """
-        if not self.is_connected():
-            return False
-
-        try:
-            key = f"token:{token}"
-            self.client.delete(key)
-            return True
-        except Exception as e:
-            print(f"Error deleting token: {e}")
-            return False
+        key = f"token:{token}"
+
+        def delete(client):
+            pipe = client.pipeline(transaction=False)
+            pipe.delete(key)
+            pipe.publish(TOKEN_CHANNEL, token)
+            return pipe.execute()[0] >= 0
+
+        return self._call(delete, False, "Error deleting token")
+
+
+def _trim_sorted_set(db, keys, args) -> int:
+    """``TRIM_SCRIPT`` for ``MemoryRedis``, which cannot run Lua."""
+    (key,) = keys
+    max_entries, min_score, prefix, budget = args
+    stale = []
+    if min_score != "":
+        stale = db.zrangebyscore(key, "-inf", min_score, start=0, num=int(budget))
+        if stale:
+            db.zremrangebyrank(key, 0, len(stale) - 1)
+    excess = 0
+    if int(max_entries) > 0:
+        excess = min(db.zcard(key) - int(max_entries), int(budget) - len(stale))
+    if excess > 0:
+        stale += db.zrange(key, 0, excess - 1)
+        db.zremrangebyrank(key, 0, excess - 1)
+    if stale:
+        db.unlink(*(prefix + request_id for request_id in stale))
+    return len(stale)
+
+
+def _score(moment: datetime) -> float:
+    """Sorted-set score of ``moment`` (naive times are UTC)."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
 
 
 # Global Redis client instance
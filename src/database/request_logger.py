@@ -0,0 +1,193 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Dict, Optional
+
+from src.database.redis_client import redis_client
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+
+class RequestLogger:
+    """Logs requests to Redis off the request path.
+
+    In async mode ``log`` only builds the record and puts it on a bounded
+    in-process queue; a background thread (started on first use) writes
+    batches of up to ``batch_size`` records with ``RedisClient.save_requests``,
+    i.e. one pipelined round trip per batch. When the queue is full the
+    ``policy`` decides: ``drop_newest`` discards the new record,
+    ``drop_oldest`` makes room by discarding the oldest queued one and
+    ``block`` waits up to ``block_timeout`` seconds before dropping. Queued
+    records are flushed at interpreter exit.
+
+    With ``async_mode=False`` every record is written synchronously.
+    """
+
+    def __init__(
+        self,
+        client,
+        async_mode: bool = True,
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        policy: str = DROP_NEWEST,
+        block_timeout: float = 0.05,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown request log policy: {policy}")
+        self.client = client
+        self.async_mode = async_mode
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(max_queue)
+        self._worker = None
+        self._stopping = threading.Event()
+        # Records queued or being written; flush() waits for it to reach 0
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @classmethod
+    def from_env(cls, client):
+        return cls(
+            client,
+            async_mode=os.getenv("REQUEST_LOG_MODE", "async") == "async",
+            max_queue=int(os.getenv("REQUEST_LOG_QUEUE_SIZE", 10000)),
+            batch_size=int(os.getenv("REQUEST_LOG_BATCH_SIZE", 100)),
+            flush_interval=float(os.getenv("REQUEST_LOG_FLUSH_INTERVAL", 0.5)),
+            policy=os.getenv("REQUEST_LOG_POLICY", DROP_NEWEST),
+            block_timeout=float(os.getenv("REQUEST_LOG_BLOCK_TIMEOUT", 0.05)),
+        )
+
+    def log(
+        self,
+        endpoint: str,
+        ip_address: str,
+        user_agent: Optional[str] = None,
+        additional_data: Optional[Dict] = None,
+    ) -> bool:
+        """Record a request; returns False if it was dropped or not stored."""
+        data = self.client.build_request(
+            endpoint, ip_address, user_agent, additional_data
+        )
+        if not self.async_mode or self._stopping.is_set():
+            stored = self.client.save_requests([data]) == 1
+            self._count(written=int(stored), failed=int(not stored))
+            return stored
+
+        self._ensure_worker()
+        with self._idle:
+            self._pending += 1
+        if self._enqueue(data):
+            self._count(enqueued=1)
+            return True
+        self._done(1)
+        self._count(dropped=1)
+        return False
+
+    def _enqueue(self, data: Dict) -> bool:
+        if self.policy == BLOCK:
+            try:
+                self._queue.put(data, timeout=self.block_timeout)
+                return True
+            except queue.Full:
+                return False
+        while True:
+            try:
+                self._queue.put_nowait(data)
+                return True
+            except queue.Full:
+                if self.policy == DROP_NEWEST:
+                    return False
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                continue
+            self._done(1)
+            self._count(dropped=1)
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="request-logger", daemon=True
+                )
+                self._worker.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stored = self.client.save_requests(batch)
+            self._count(written=stored, failed=len(batch) - stored)
+            self._done(len(batch))
+
+    def _count(self, enqueued=0, written=0, dropped=0, failed=0):
+        with self._lock:
+            self.enqueued += enqueued
+            self.written += written
+            self.dropped += dropped
+            self.failed += failed
+
+    def _done(self, count: int):
+        with self._idle:
+            self._pending -= count
+            if not self._pending:
+                self._idle.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued record has been written (or failed)."""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Flush and stop the background worker."""
+        self.flush(timeout)
+        self._stopping.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                "mode": "async" if self.async_mode else "sync",
+                "policy": self.policy,
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self.max_queue,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
+
+
+# Global request logger instance
+request_logger = RequestLogger.from_env(redis_client)
@@ -1,7 +1,6 @@
-from src.patterns.no_overlap_strategy import NoOverlapStrategy
-from src.repositories.booking_repository import BookingRepository
-from src.repositories.room_repository import RoomRepository
-from src.repositories.user_repository import UserRepository
+from src.models.recurrence import RecurrenceRule
+from src.patterns.interval_overlap_strategy import IntervalOverlapStrategy
+from src.repositories.factory import create_repositories, create_series_repository
 from src.services.booking_service import BookingService
 from src.services.room_service import RoomService
 from src.services.user_service import UserService
@@ -21,7 +20,9 @@ def print_menu():
     print("5. Make booking")
     print("6. List bookings")
     print("7. Cancel booking")
-    print("8. Exit")
+    print("8. Make recurring booking")
+    print("9. Find available rooms")
+    print("10. Exit")
 
 
 def create_user(user_service):
@@ -121,6 +122,72 @@ def make_booking(booking_service, user_service, room_service):
         print(f"Error: {e}")
 
 
+def make_recurring_booking(booking_service, user_service, room_service):
+    print("\n--- Make Recurring Booking ---")
+
+    try:
+        user_id = int(input("Enter user ID: "))
+        room_id = int(input("Enter room ID: "))
+        start_time = parse_datetime(
+            input("Enter first start time (YYYY-MM-DD HH:MM): ")
+        )
+        end_time = parse_datetime(input("Enter first end time (YYYY-MM-DD HH:MM): "))
+        frequency = input("Repeat (daily/weekly/monthly): ").strip().lower()
+        interval = int(input("Every how many periods? [1]: ") or 1)
+        until_str = input("Repeat until (YYYY-MM-DD HH:MM, empty for never): ")
+
+        if not validate_not_in_past(start_time):
+            raise ValueError("Start time must be in the future.")
+        if not validate_datetime_range(start_time, end_time):
+            raise ValueError("End time must be after start time.")
+        user = user_service.repository.get_by_id(user_id)
+        room = room_service.repository.get_by_id(room_id)
+        if user is None or room is None:
+            raise ValueError("Invalid user or room ID.")
+
+        rule = RecurrenceRule(
+            frequency,
+            interval=interval,
+            until=parse_datetime(until_str) if until_str.strip() else None,
+        )
+        series = booking_service.create_series(room, user, start_time, end_time, rule)
+        print(f"Recurring booking created successfully: {series}")
+
+    except ValueError as e:
+        print(f"Error: {e}")
+
+
+def find_available_rooms(booking_service, room_service):
+    print("\n--- Find Available Rooms ---")
+
+    try:
+        min_capacity = int(input("Minimum capacity: "))
+        location = input("Location (empty for any): ").strip() or None
+        start_time = parse_datetime(input("Enter start time (YYYY-MM-DD HH:MM): "))
+        end_time = parse_datetime(input("Enter end time (YYYY-MM-DD HH:MM): "))
+        if not validate_datetime_range(start_time, end_time):
+            raise ValueError("End time must be after start time.")
+
+        rooms = room_service.find_available_rooms(
+            min_capacity, start_time, end_time, booking_service, location
+        )
+        if rooms:
+            for room in rooms:
+                print(f"ID: {room.room_id}, {room}")
+            return
+
+        print("No rooms available for that window. Next free slots:")
+        duration = end_time - start_time
+        for room in room_service.repository.get_by_min_capacity(min_capacity, location):
+            ((slot_start, slot_end),) = booking_service.find_free_slots(
+                room.room_id, start_time, duration
+            )
+            print(f"ID: {room.room_id}, Name: {room.name}: {slot_start} → {slot_end}")
+
+    except ValueError as e:
+        print(f"Error: {e}")
+
+
 def list_bookings(booking_service):
     print("\n--- Bookings List ---")
     bookings = booking_service.get_all_bookings()
@@ -165,18 +232,21 @@ def cancel_booking(booking_service):
 
 def main():
     # Initialize repositories
-    user_repository = UserRepository()
-    room_repository = RoomRepository()
-    booking_repository = BookingRepository()
+    user_repository, room_repository, booking_repository = create_repositories()
+    series_repository = create_series_repository(room_repository, user_repository)
 
     # Initialize services
     user_service = UserService(user_repository)
     room_service = RoomService(room_repository)
-    booking_service = BookingService(booking_repository, NoOverlapStrategy())
+    booking_service = BookingService(
+        booking_repository,
+        IntervalOverlapStrategy(),
+        series_repository=series_repository,
+    )
 
     while True:
         print_menu()
-        choice = input("\nEnter your choice (1-8): ")
+        choice = input("\nEnter your choice (1-10): ")
 
         if choice == "1":
             create_user(user_service)
@@ -193,6 +263,10 @@ def main():
         elif choice == "7":
             cancel_booking(booking_service)
         elif choice == "8":
+            make_recurring_booking(booking_service, user_service, room_service)
+        elif choice == "9":
+            find_available_rooms(booking_service, room_service)
+        elif choice == "10":
             print("Goodbye!")
             break
         else:
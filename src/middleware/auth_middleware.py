@@ -5,6 +5,10 @@ from functools import wraps
 from flask import jsonify, request
 
 from src.database.redis_client import redis_client
+from src.middleware.token_cache import TokenCache
+
+# Validaciones cacheadas en el proceso (ver TokenCache)
+token_cache = TokenCache.from_env(redis_client)
 
 
 def validate_token(f):
@@ -13,7 +17,8 @@ def validate_token(f):
     Verifica que:
     1. El header Authorization esté presente
     2. Tenga el formato: Bearer <token>
-    3. El token exista en Redis (token:<valor>)
+    3. El token exista en Redis (token:<valor>), consultando primero la
+       caché local ``token_cache``
 
     Si falla alguna validación, retorna 401 Unauthorized.
     """
@@ -51,8 +56,8 @@ def validate_token(f):
 
         token = parts[1]
 
-        # Validar token en Redis
-        if not redis_client.validate_token(token):
+        # Validar token (caché local, o Redis si no está cacheado)
+        if not token_cache.validate(token):
             return (
                 jsonify(
                     {
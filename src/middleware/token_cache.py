@@ -0,0 +1,132 @@
+"""Caché local de validación de tokens."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+
+
+class TokenCache:
+    """Bounded LRU of token validation results, kept in process.
+
+    A valid token is cached for at most ``ttl`` seconds and never past its
+    remaining lifetime in Redis (``PTTL``); an unknown token is cached for
+    ``negative_ttl`` seconds. Entries are dropped as soon as a token is
+    saved or deleted on any node, via the invalidation channel that a
+    background thread listens to. Cached results are only used while that
+    subscription is live: otherwise every lookup goes to Redis, so a
+    revocation can never be missed.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_size: int = 10000,
+        ttl: float = 30.0,
+        negative_ttl: float = 5.0,
+        retry_interval: float = 5.0,
+        clock=None,
+    ):
+        self.client = client
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.retry_interval = retry_interval
+        self.clock = clock or time.monotonic
+        # token -> (valid, expires_at), least recently used first
+        self._entries = OrderedDict()
+        # Bumped by every invalidation, so a lookup racing with one is not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._listener = None
+        self._subscribed = threading.Event()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls, client):
+        return cls(
+            client,
+            max_size=int(os.getenv("TOKEN_CACHE_SIZE", 10000)),
+            ttl=float(os.getenv("TOKEN_CACHE_TTL", 30)),
+            negative_ttl=float(os.getenv("TOKEN_CACHE_NEGATIVE_TTL", 5)),
+        )
+
+    def validate(self, token: str) -> bool:
+        """True if ``token`` exists in Redis, answered locally when cached."""
+        self._ensure_listener()
+        now = self.clock()
+        if self._subscribed.is_set():
+            with self._lock:
+                entry = self._entries.get(token)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(token)
+                    self.hits += 1
+                    return entry[0]
+        self.misses += 1
+        generation = self._generation
+
+        remaining_ms = self.client.token_ttl(token)
+        if remaining_ms is None:
+            # Redis did not answer: reject, but remember nothing
+            return False
+        valid = remaining_ms != -2
+        if valid:
+            lifetime = (
+                self.ttl if remaining_ms == -1 else min(self.ttl, remaining_ms / 1000)
+            )
+        else:
+            lifetime = self.negative_ttl
+        if self._subscribed.is_set() and lifetime > 0:
+            with self._lock:
+                if generation != self._generation:
+                    return valid
+                self._entries[token] = (valid, now + lifetime)
+                self._entries.move_to_end(token)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return valid
+
+    def invalidate(self, token: str = None):
+        """Drop ``token`` (or every entry) from the cache."""
+        with self._lock:
+            self._generation += 1
+            if token is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(token, None)
+
+    def _ensure_listener(self):
+        if self._listener is not None:
+            return
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="token-invalidations", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.client.subscribe_token_invalidations()
+                # Anything cached before (re)subscribing may have missed a message
+                self.invalidate()
+                self._subscribed.set()
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        self.invalidate(message["data"])
+            except redis.RedisError:
+                pass
+            finally:
+                self._subscribed.clear()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except redis.RedisError:
+                        pass
+            time.sleep(self.retry_interval)
@@ -5,6 +5,8 @@ from src.models.user import User
 
 
 class Booking:
+    __slots__ = ("booking_id", "room", "user", "start_time", "end_time")
+
     def __init__(
         self,
         booking_id: int,
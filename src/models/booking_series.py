@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from src.models.recurrence import RecurrenceRule
+from src.models.room import Room
+from src.models.user import User
+
+
+class BookingSeries:
+    """A recurring booking stored as a single record.
+
+    ``start_time``/``end_time`` describe the first occurrence; the rule says
+    how it repeats. Occurrences are never stored, only expanded on demand.
+    """
+
+    __slots__ = ("series_id", "room", "user", "start_time", "end_time", "rule")
+
+    def __init__(
+        self,
+        series_id: int,
+        room: Room,
+        user: User,
+        start_time: datetime,
+        end_time: datetime,
+        rule: RecurrenceRule,
+    ):
+        self.series_id = series_id
+        self.room = room
+        self.user = user
+        self.start_time = start_time
+        self.end_time = end_time
+        self.rule = rule
+
+    @property
+    def duration(self):
+        return self.end_time - self.start_time
+
+    def occurrences(self, window_start: datetime = None, window_end: datetime = None):
+        """Lazily yield ``(start, end)`` of the occurrences overlapping a window.
+
+        Without ``window_end`` the generator is infinite for unbounded rules.
+        """
+        duration = self.duration
+        after = window_start - duration if window_start is not None else None
+        for start in self.rule.starts(self.start_time, after):
+            if window_end is not None and start >= window_end:
+                return
+            end = start + duration
+            if window_start is not None and end <= window_start:
+                continue
+            yield start, end
+
+    def __str__(self):
+        return (
+            f"Series #{self.series_id} - Room: {self.room.name}, "
+            f"User: {self.user.name}, {self.start_time} → {self.end_time} "
+            f"({self.rule.frequency} every {self.rule.interval})"
+        )
@@ -0,0 +1,115 @@
+from datetime import date, datetime, timedelta
+
+
+class RecurrenceRule:
+    """Daily, weekly or monthly repetition of a booking.
+
+    ``interval`` is the number of periods between occurrences. The series
+    ends after ``count`` occurrences or at ``until`` (inclusive), or never
+    when both are None. ``exceptions`` holds the dates whose occurrence is
+    cancelled; like iCalendar EXDATE they still count towards ``count``.
+    Monthly occurrences falling on a day the month does not have (e.g. the
+    31st) are skipped and, as in iCalendar, do not count towards ``count``.
+    """
+
+    __slots__ = ("frequency", "interval", "count", "until", "exceptions")
+
+    FREQUENCIES = ("daily", "weekly", "monthly")
+
+    def __init__(
+        self,
+        frequency: str,
+        interval: int = 1,
+        count: int = None,
+        until: datetime = None,
+        exceptions=(),
+    ):
+        if frequency not in self.FREQUENCIES:
+            raise ValueError(f"Unsupported recurrence frequency: {frequency}")
+        if interval < 1:
+            raise ValueError("Recurrence interval must be at least 1.")
+        if count is not None and count < 1:
+            raise ValueError("Recurrence count must be at least 1.")
+        self.frequency = frequency
+        self.interval = interval
+        self.count = count
+        self.until = until
+        self.exceptions = frozenset(exceptions)
+
+    @property
+    def is_bounded(self) -> bool:
+        return self.count is not None or self.until is not None
+
+    def _nth_start(self, first_start: datetime, n: int):
+        """Start of the n-th occurrence, or None if that date does not exist."""
+        if self.frequency == "monthly":
+            months = first_start.month - 1 + n * self.interval
+            try:
+                return first_start.replace(
+                    year=first_start.year + months // 12, month=months % 12 + 1
+                )
+            except ValueError:
+                return None
+        days = 7 if self.frequency == "weekly" else 1
+        return first_start + timedelta(days=days * self.interval * n)
+
+    def _may_skip(self, first_start: datetime) -> bool:
+        return self.frequency == "monthly" and first_start.day > 28
+
+    def _first_index(self, first_start: datetime, moment: datetime) -> int:
+        """An occurrence index at or before the first one starting after moment."""
+        if moment <= first_start:
+            return 0
+        if self.frequency == "monthly":
+            months = (moment.year - first_start.year) * 12 + (
+                moment.month - first_start.month
+            )
+            return max(0, months // self.interval - 1)
+        days = 7 if self.frequency == "weekly" else 1
+        return (moment - first_start) // timedelta(days=days * self.interval)
+
+    def starts(self, first_start: datetime, after: datetime = None):
+        """Lazily yield occurrence start times, optionally from ``after`` on.
+
+        Occurrences before ``after`` are skipped arithmetically, not iterated,
+        except for monthly rules with a ``count`` starting after the 28th:
+        missing dates do not count, so those walk from the first occurrence.
+        """
+        n = self._first_index(first_start, after) if after is not None else 0
+        if self.count is not None and self._may_skip(first_start):
+            n = 0
+        # Occurrences generated so far (exceptions included): equal to n
+        # unless dates were skipped
+        generated = n
+        while self.count is None or generated < self.count:
+            start = self._nth_start(first_start, n)
+            n += 1
+            if start is None:
+                continue
+            generated += 1
+            if self.until is not None and start > self.until:
+                return
+            if start.date() in self.exceptions:
+                continue
+            if after is not None and start < after:
+                continue
+            yield start
+
+    def to_dict(self) -> dict:
+        return {
+            "frequency": self.frequency,
+            "interval": self.interval,
+            "count": self.count,
+            "until": self.until.isoformat() if self.until else None,
+            "exceptions": sorted(d.isoformat() for d in self.exceptions),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RecurrenceRule":
+        return cls(
+            frequency=data["frequency"],
+            interval=data.get("interval", 1),
+            count=data.get("count"),
+            until=datetime.fromisoformat(data["until"]) if data.get("until") else None,
+            exceptions=[date.fromisoformat(d) for d in data.get("exceptions", [])],
+        )
@@ -1,10 +1,20 @@
 class Room:
+    __slots__ = ("room_id", "name", "capacity", "location")
+
     def __init__(self, room_id: int, name: str, capacity: int, location: str):
         self.room_id = room_id
         self.name = name
         self.capacity = capacity
         self.location = location
 
+    def to_dict(self) -> dict:
+        return {
+            "room_id": self.room_id,
+            "name": self.name,
+            "capacity": self.capacity,
+            "location": self.location,
+        }
+
     def __str__(self):
         return (
             f"Room {self.name} (Capacity: {self.capacity}, Location: {self.location})"
@@ -1,8 +1,13 @@
 class User:
+    __slots__ = ("user_id", "name", "email")
+
     def __init__(self, user_id: int, name: str, email: str):
         self.user_id = user_id
         self.name = name
         self.email = email
 
+    def to_dict(self) -> dict:
+        return {"user_id": self.user_id, "name": self.name, "email": self.email}
+
     def __str__(self):
         return f"User {self.name} ({self.email})"
@@ -0,0 +1,37 @@
+from bisect import bisect_left
+from operator import attrgetter
+
+from src.patterns.time_validation_strategy import TimeValidationStrategy
+
+_start_time = attrgetter("start_time")
+
+
+def find_overlap(timeline, start_time, end_time):
+    """Return the booking in ``timeline`` overlapping [start_time, end_time).
+
+    ``timeline`` holds the bookings of a single room sorted by start time,
+    usually already narrowed to the window by ``get_room_timeline``, in which
+    case the booking starting right before ``end_time`` is the answer. The
+    timeline is not assumed to be sorted by end time too (a long booking may
+    contain later ones), so earlier bookings are scanned back when needed.
+    """
+    i = bisect_left(timeline, end_time, key=_start_time)
+    for j in range(i - 1, -1, -1):
+        if timeline[j].end_time > start_time:
+            return timeline[j]
+    return None
+
+
+class IntervalOverlapStrategy(TimeValidationStrategy):
+    """Overlap check in O(log n) over a room timeline sorted by start time."""
+
+    def validate(self, start_time, end_time):
+        pass
+
+    def is_valid(self, new_booking, existing_bookings) -> bool:
+        return (
+            find_overlap(
+                existing_bookings, new_booking.start_time, new_booking.end_time
+            )
+            is None
+        )
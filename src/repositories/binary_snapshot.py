@@ -0,0 +1,217 @@
+import json
+import struct
+from datetime import datetime, timedelta
+from itertools import repeat
+
+from src.utils.json_stream import json_default
+
+MAGIC = b"MRBS"
+VERSION = 1
+
+# Field types
+INT = 1
+STR = 2
+TIMESTAMP = 3
+JSON = 4
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+_SLOTS = {INT: "q", STR: "I", TIMESTAMP: "q", JSON: "I"}
+_HEADER = struct.Struct("<4sH")
+_COUNT = struct.Struct("<I")
+_LENGTH = struct.Struct("<H")
+_TYPE = struct.Struct("<B")
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Naive datetime -> microseconds since the Unix epoch."""
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def is_binary_snapshot(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _kind(value) -> int:
+    if isinstance(value, bool):
+        return JSON
+    if isinstance(value, int):
+        return INT if -(2**63) <= value < 2**63 else JSON
+    if isinstance(value, str):
+        return STR
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return TIMESTAMP
+    return JSON
+
+
+def _mask_format(field_count: int) -> str:
+    for code, bits in (("B", 8), ("H", 16), ("I", 32), ("Q", 64)):
+        if field_count <= bits:
+            return code
+    raise ValueError("Binary snapshots support at most 64 fields per record.")
+
+
+def write_binary_snapshot(f, records: list):
+    """Write ``records`` (flat dicts) to the binary file object ``f``.
+
+    Layout, little endian::
+
+        b"MRBS" | version u16
+        field count u16, then per field: name (u16 length + UTF-8), type u8
+        string count u32, then per string: u32 length + UTF-8
+        record count u32, then one fixed-width struct per record:
+            missing mask, null mask, one slot per field
+
+    Field types are inferred from the values: ``int`` becomes an int64,
+    naive ``datetime`` an int64 of epoch microseconds, ``str`` an index into
+    the string table (so repeated values are stored once) and anything else
+    compact JSON in the string table. A field whose values mix types falls
+    back to JSON.
+    """
+    types = {}
+    for record in records:
+        for name, value in record.items():
+            if value is None:
+                types.setdefault(name, None)
+                continue
+            kind = _kind(value)
+            current = types.get(name)
+            if current is None:
+                types[name] = kind
+            elif current != kind:
+                types[name] = JSON
+    names = list(types)
+    kinds = [types[name] or INT for name in names]
+    mask = _mask_format(len(names))
+    row = struct.Struct("<" + mask * 2 + "".join(_SLOTS[k] for k in kinds))
+
+    strings = {}
+
+    def intern(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    encoders = {
+        INT: int,
+        STR: intern,
+        TIMESTAMP: to_epoch_us,
+        JSON: lambda v: intern(
+            json.dumps(v, separators=(",", ":"), default=json_default)
+        ),
+    }
+    fields = [(name, encoders[kind]) for name, kind in zip(names, kinds)]
+    # Absent values still get a slot that decodes cleanly, since columns are
+    # decoded as a whole; the masks then drop or null them.
+    placeholders = [intern("null") if kind in (STR, JSON) else 0 for kind in kinds]
+    rows = bytearray()
+    for record in records:
+        missing = null = 0
+        slots = []
+        for i, (name, encode) in enumerate(fields):
+            value = record.get(name)
+            if value is None:
+                if name in record:
+                    null |= 1 << i
+                else:
+                    missing |= 1 << i
+                slots.append(placeholders[i])
+            else:
+                slots.append(encode(value))
+        rows += row.pack(missing, null, *slots)
+
+    f.write(_HEADER.pack(MAGIC, VERSION))
+    f.write(_LENGTH.pack(len(names)))
+    for name, kind in zip(names, kinds):
+        encoded = name.encode()
+        f.write(_LENGTH.pack(len(encoded)) + encoded + _TYPE.pack(kind))
+    f.write(_COUNT.pack(len(strings)))
+    for text in strings:
+        encoded = text.encode()
+        f.write(_COUNT.pack(len(encoded)) + encoded)
+    f.write(_COUNT.pack(len(records)))
+    f.write(rows)
+
+
+class _Timestamps(dict):
+    """Epoch microseconds -> datetime, built once per distinct value.
+
+    Bookings start and end on a handful of slot boundaries, so most lookups
+    are hits and the records share their (immutable) datetime objects.
+    """
+
+    def __missing__(self, value: int) -> datetime:
+        moment = self[value] = _EPOCH + timedelta(microseconds=value)
+        return moment
+
+
+def _read(f, size: int, path: str) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError(f"Truncated binary snapshot {path}")
+    return data
+
+
+def iter_binary_snapshot(path: str, chunk_records: int = 4096):
+    """Lazily yield the records of a binary snapshot.
+
+    The field list and string table are read up front; records are then
+    unpacked ``chunk_records`` at a time. Timestamps come back as
+    ``datetime`` objects, so callers skip ISO parsing.
+    """
+    with open(path, "rb") as f:
+        magic, version = _HEADER.unpack(_read(f, _HEADER.size, path))
+        if magic != MAGIC:
+            raise ValueError(f"Not a binary snapshot: {path}")
+        if version > VERSION:
+            raise ValueError(f"Unsupported binary snapshot version {version}")
+
+        (field_count,) = _LENGTH.unpack(_read(f, _LENGTH.size, path))
+        names = []
+        kinds = []
+        for _ in range(field_count):
+            (length,) = _LENGTH.unpack(_read(f, _LENGTH.size, path))
+            names.append(_read(f, length, path).decode())
+            kinds.append(_TYPE.unpack(_read(f, _TYPE.size, path))[0])
+
+        (string_count,) = _COUNT.unpack(_read(f, _COUNT.size, path))
+        strings = []
+        for _ in range(string_count):
+            (length,) = _COUNT.unpack(_read(f, _COUNT.size, path))
+            strings.append(_read(f, length, path).decode())
+
+        # Columns are decoded with map() so the per-value work stays in C
+        timestamps = _Timestamps()
+        decoders = {
+            INT: None,
+            STR: lambda column: map(strings.__getitem__, column),
+            TIMESTAMP: lambda column: map(timestamps.__getitem__, column),
+            JSON: lambda column: map(json.loads, map(strings.__getitem__, column)),
+        }
+        columns = [decoders[kind] for kind in kinds]
+        mask = _mask_format(field_count)
+        row = struct.Struct("<" + mask * 2 + "".join(_SLOTS[k] for k in kinds))
+
+        (remaining,) = _COUNT.unpack(_read(f, _COUNT.size, path))
+        while remaining:
+            count = min(remaining, chunk_records)
+            remaining -= count
+            unpacked = list(zip(*row.iter_unpack(_read(f, count * row.size, path))))
+            missing, null = unpacked[0], unpacked[1]
+            values = [
+                column if decode is None else decode(column)
+                for decode, column in zip(columns, unpacked[2:])
+            ]
+            for i, record in enumerate(
+                map(dict, map(zip, repeat(names), zip(*values)))
+            ):
+                if missing[i] or null[i]:
+                    for bit, name in enumerate(names):
+                        if missing[i] >> bit & 1:
+                            del record[name]
+                        elif null[i] >> bit & 1:
+                            record[name] = None
+                yield record
@@ -1,79 +1,470 @@
-import json
-import os
-from datetime import datetime
+import heapq
+import threading
+import warnings
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import islice
+from operator import attrgetter
 
 from src.models.booking import Booking
 from src.models.room import Room
 from src.models.user import User
+from src.repositories.json_storage import RELOAD, JsonFileStorage
+from src.utils.json_stream import as_datetime
+
+_start_time = attrgetter("start_time")
+_position = attrgetter("start_time", "booking_id")
+# Stand-ins for a room or user deleted while bookings still reference it
+PLACEHOLDERS = {
+    "room": lambda room_id: {
+        "room_id": room_id,
+        "name": f"Deleted room {room_id}",
+        "capacity": 0,
+        "location": "",
+    },
+    "user": lambda user_id: {
+        "user_id": user_id,
+        "name": f"Deleted user {user_id}",
+        "email": "",
+    },
+}
+
+_MODELS = {"room": Room, "user": User}
+
+
+def reference(entity, kind: str, repository) -> dict:
+    """Record fields pointing at a room or user.
+
+    Just the id when the wired repository knows the entity; otherwise (no
+    repository, or the entity was deleted since) the entity is embedded so
+    the record keeps loading.
+    """
+    entity_id = getattr(entity, f"{kind}_id")
+    if repository and repository.get_by_id(entity_id):
+        return {f"{kind}_id": entity_id}
+    return {kind: entity.to_dict()}
+
+
+def resolve(record: dict, kind: str, repository, interned: dict, owner: str):
+    """The room or user a record written by ``reference`` points at.
+
+    Entities are interned, so records sharing a room or user share one
+    object. An id the repository no longer knows (deleted after the record
+    was written) resolves to a placeholder with a warning instead of
+    failing the whole file.
+    """
+    embedded = record.get(kind)
+    entity_id = embedded[f"{kind}_id"] if embedded else record[f"{kind}_id"]
+    entity = interned.get(entity_id)
+    if entity is None and repository is not None:
+        entity = repository.get_by_id(entity_id)
+    if entity is None:
+        if embedded is None:
+            warnings.warn(
+                f"{owner} references unknown {kind}_id {entity_id}; "
+                "using a placeholder",
+                stacklevel=3,
+            )
+            embedded = PLACEHOLDERS[kind](entity_id)
+        entity = _MODELS[kind](**embedded)
+    interned[entity_id] = entity
+    return entity
 
 
 class BookingRepository:
-    def __init__(self, filepath="src/data/bookings.json"):
+    """Bookings persisted as JSON.
+
+    When ``room_repository`` and ``user_repository`` are given, records only
+    store ``room_id``/``user_id`` and are resolved against them on load.
+    Otherwise the room and user are embedded in every record, as in the
+    original format, which is still accepted on load so existing files
+    migrate on their next save. Either way each room and user is
+    materialised once and shared by all of its bookings.
+
+    The file is streamed and indexed record by record. With
+    ``active_only=True`` only bookings that have not ended yet are loaded;
+    past ones are read by ``load_history``, which history queries (and full
+    snapshot rewrites) call on demand.
+    """
+
+    def __init__(
+        self,
+        filepath="src/data/bookings.json",
+        journal=False,
+        compact_every=1000,
+        room_repository=None,
+        user_repository=None,
+        active_only=False,
+        shared=False,
+        binary=False,
+    ):
         self.filepath = filepath
-        self.bookings = []
+        self.active_only = active_only
+        self.storage = self._open_storage(
+            filepath, journal, compact_every, shared, binary
+        )
+        self.room_repository = room_repository
+        self.user_repository = user_repository
+        # Intern tables so bookings share one Room/User object per id
+        self._rooms = {}
+        self._users = {}
+        # booking_id -> booking, in insertion order
+        self._bookings = {}
+        # user_id -> {booking_id: booking}
+        self._user_index = {}
+        # room_id -> bookings of that room sorted by start_time
+        self._room_index = {}
+        # room_id -> longest booking indexed for the room (never lowered)
+        self._longest = {}
+        # Bookings ending before this moment are only loaded with the history
+        self._loaded_at = datetime.min
+        self._history_loaded = True
         self.next_id = 1
+        # Bumped on every change, so callers can tell cheaply whether the
+        # data changed (e.g. HTTP ETags)
+        self._version = 0
+        # Guards id allocation, the indexes and the file writes
+        self._lock = threading.RLock()
         self.load_from_file()
 
+    def _open_storage(self, filepath, journal, compact_every, shared, binary):
+        return JsonFileStorage(filepath, journal, compact_every, shared, binary)
+
+    @property
+    def version(self) -> int:
+        """Change counter: differs whenever the data may have changed."""
+        self._sync()
+        return self._version
+
+    @property
+    def bookings(self) -> list:
+        return list(self._bookings.values())
+
+    @bookings.setter
+    def bookings(self, bookings: list):
+        self._history_loaded = True
+        self._bookings = {}
+        self._user_index = {}
+        self._room_index = {}
+        self._longest = {}
+        for booking in bookings:
+            self._bookings[booking.booking_id] = booking
+            self._user_index.setdefault(booking.user.user_id, {})[
+                booking.booking_id
+            ] = booking
+        for booking in sorted(bookings, key=_start_time):
+            self._room_index.setdefault(booking.room.room_id, []).append(booking)
+            self._note_duration(booking)
+
+    def _note_duration(self, booking: Booking):
+        duration = booking.end_time - booking.start_time
+        if duration > self._longest.get(booking.room.room_id, timedelta(0)):
+            self._longest[booking.room.room_id] = duration
+
+    def _overlapping(self, room_id: int, timeline: list, start_time, lo: int, hi: int):
+        """Bookings of ``timeline[lo:hi]`` ending after ``start_time``.
+
+        The timeline is only sorted by start time: bookings written by
+        ``add``/``add_many`` are not checked, so a long booking may contain
+        later ones. Nothing that starts more than the room's longest booking
+        before ``start_time`` can still be running, which bounds the
+        look-back.
+        """
+        longest = self._longest.get(room_id, timedelta(0))
+        if start_time - datetime.min > longest:
+            lo = max(lo, bisect_right(timeline, start_time - longest, key=_start_time))
+        return (b for b in islice(timeline, lo, hi) if b.end_time > start_time)
+
+    def _index(self, booking: Booking):
+        self._bookings[booking.booking_id] = booking
+        self._user_index.setdefault(booking.user.user_id, {})[
+            booking.booking_id
+        ] = booking
+        timeline = self._room_index.setdefault(booking.room.room_id, [])
+        insort(timeline, booking, key=_start_time)
+        self._note_duration(booking)
+
+    def _unindex(self, booking: Booking):
+        del self._bookings[booking.booking_id]
+        user_bookings = self._user_index.get(booking.user.user_id, {})
+        user_bookings.pop(booking.booking_id, None)
+        if not user_bookings:
+            self._user_index.pop(booking.user.user_id, None)
+        timeline = self._room_index.get(booking.room.room_id, [])
+        i = bisect_left(timeline, booking.start_time, key=_start_time)
+        while i < len(timeline) and timeline[i].start_time == booking.start_time:
+            if timeline[i] is booking:
+                del timeline[i]
+                break
+            i += 1
+        if not timeline:
+            self._room_index.pop(booking.room.room_id, None)
+
     def add(
         self, room: Room, user: User, start_time: datetime, end_time: datetime
     ) -> Booking:
-        booking = Booking(self.next_id, room, user, start_time, end_time)
-        self.bookings.append(booking)
-        self.next_id += 1
-        self.save_to_file()
-        return booking
+        with self._lock, self.storage.exclusive():
+            self._sync()
+            booking = Booking(self.next_id, room, user, start_time, end_time)
+            self._index(booking)
+            self.next_id += 1
+            self._version += 1
+            self._persist({"op": "add", "record": self._to_record(booking)})
+            return booking
+
+    @contextmanager
+    def exclusive(self):
+        """Hold the repository for a read-check-write sequence.
+
+        Other threads and, in shared mode, other processes cannot change the
+        bookings until the block ends, and it starts from the latest data.
+        """
+        with self._lock, self.storage.exclusive():
+            self._sync()
+            yield
+
+    def add_if_free(
+        self,
+        room: Room,
+        user: User,
+        start_time: datetime,
+        end_time: datetime,
+        validator,
+    ) -> Booking:
+        """Add the booking unless ``validator`` finds it overlapping the room's
+        bookings. The check and the add run in one ``exclusive()`` section."""
+        if start_time >= end_time:
+            raise ValueError("End time must be after start time.")
+        with self.exclusive():
+            candidate = Booking(-1, room, user, start_time, end_time)
+            timeline = self.get_room_timeline(room.room_id, start_time, end_time)
+            if not validator.is_valid(candidate, timeline):
+                raise ValueError("Time slot overlaps with an existing booking.")
+            return self.add(room, user, start_time, end_time)
+
+    def add_many(self, rows: list) -> list:
+        """Add ``(room, user, start_time, end_time)`` rows and persist once."""
+        with self._lock, self.storage.exclusive():
+            self._sync()
+            bookings = []
+            for room, user, start_time, end_time in rows:
+                booking = Booking(self.next_id, room, user, start_time, end_time)
+                self._index(booking)
+                self.next_id += 1
+                bookings.append(booking)
+            self._version += 1
+            if bookings and not self.storage.log_many(
+                [{"op": "add", "record": self._to_record(b)} for b in bookings]
+            ):
+                self.save_to_file()
+            return bookings
 
     def get_by_id(self, booking_id: int) -> Booking:
-        return next((b for b in self.bookings if b.booking_id == booking_id), None)
+        self._sync()
+        booking = self._bookings.get(booking_id)
+        if booking is None and not self._history_loaded:
+            self.load_history()
+            booking = self._bookings.get(booking_id)
+        return booking
 
-    def get_by_user(self, user_id: int) -> list:
-        return [b for b in self.bookings if b.user.user_id == user_id]
+    def get_by_user(self, user_id: int, start_time=None, end_time=None) -> list:
+        """Return the bookings of a user, optionally only those overlapping
+        the ``start_time``/``end_time`` range (either bound may be omitted)."""
+        self._sync()
+        self._load_window(start_time, end_time)
+        bookings = self._user_index.get(user_id, {}).values()
+        if start_time is not None:
+            bookings = [b for b in bookings if b.end_time > start_time]
+        if end_time is not None:
+            bookings = [b for b in bookings if b.start_time < end_time]
+        return list(bookings)
 
     def get_by_room(self, room_id: int) -> list:
-        return [b for b in self.bookings if b.room.room_id == room_id]
+        return list(self.get_room_timeline(room_id))
+
+    def get_room_timeline(self, room_id: int, start_time=None, end_time=None) -> list:
+        """Return the bookings of a room sorted by start time.
+
+        When a window is given only the bookings overlapping it are returned.
+        Without one the list is the repository's own index and must not be
+        modified.
+        """
+        self._sync()
+        if start_time is None or end_time is None:
+            self._load_window(None, None)
+        else:
+            self._load_window(start_time, end_time)
+        timeline = self._room_index.get(room_id, [])
+        if start_time is None or end_time is None:
+            return timeline
+        hi = bisect_left(timeline, end_time, key=_start_time)
+        return list(self._overlapping(room_id, timeline, start_time, 0, hi))
+
+    def find(
+        self,
+        room_id=None,
+        user_id=None,
+        start_time=None,
+        end_time=None,
+        after=None,
+        limit=None,
+    ) -> list:
+        """Return bookings ordered by ``(start_time, booking_id)``.
+
+        Filters are optional: bookings of ``room_id`` and/or ``user_id``
+        overlapping ``start_time``/``end_time``. ``after`` is the
+        ``(start_time, booking_id)`` of the last booking of the previous
+        page. Room timelines are bisected to the window and the cursor and
+        merged lazily, so a page costs about ``limit`` steps per room rather
+        than a scan of every booking.
+        """
+        self._sync()
+        self._load_window(start_time, end_time)
+        with self._lock:
+            if user_id is not None:
+                candidates = sorted(
+                    (
+                        b
+                        for b in self.get_by_user(user_id, start_time, end_time)
+                        if room_id is None or b.room.room_id == room_id
+                    ),
+                    key=_position,
+                )
+                lo = bisect_right(candidates, after, key=_position) if after else 0
+                return candidates[lo:][:limit]
+            room_ids = list(self._room_index) if room_id is None else [room_id]
+            timelines = [
+                self._window(
+                    i, self._room_index.get(i, []), start_time, end_time, after
+                )
+                for i in room_ids
+            ]
+            return list(islice(heapq.merge(*timelines, key=_position), limit))
+
+    def _window(self, room_id: int, timeline: list, start_time, end_time, after):
+        lo, hi = 0, len(timeline)
+        if after is not None:
+            lo = bisect_right(timeline, after, key=_position)
+        if end_time is not None:
+            hi = bisect_left(timeline, end_time, key=_start_time)
+        if start_time is None:
+            return islice(timeline, lo, hi)
+        return self._overlapping(room_id, timeline, start_time, lo, hi)
+
+    def _load_window(self, start_time, end_time):
+        """Make sure every booking overlapping the range is indexed."""
+        if start_time is None or start_time < self._loaded_at:
+            self.load_history()
 
     def get_all(self) -> list:
         """Return all bookings."""
+        self._sync()
+        self.load_history()
         return self.bookings
 
     def delete(self, booking_id: int) -> bool:
-        booking = self.get_by_id(booking_id)
-        if booking:
-            self.bookings.remove(booking)
+        with self._lock, self.storage.exclusive():
+            self._sync()
+            booking = self.get_by_id(booking_id)
+            if booking:
+                self._unindex(booking)
+                self._version += 1
+                self._persist({"op": "delete", "id": booking_id})
+                return True
+            return False
+
+    def _to_record(self, booking: Booking) -> dict:
+        record = {"booking_id": booking.booking_id}
+        record.update(reference(booking.room, "room", self.room_repository))
+        record.update(reference(booking.user, "user", self.user_repository))
+        record["start_time"] = booking.start_time
+        record["end_time"] = booking.end_time
+        return record
+
+    def _from_record(self, record: dict) -> Booking:
+        owner = f"Booking {record['booking_id']}"
+        return Booking(
+            booking_id=record["booking_id"],
+            room=resolve(record, "room", self.room_repository, self._rooms, owner),
+            user=resolve(record, "user", self.user_repository, self._users, owner),
+            start_time=as_datetime(record["start_time"]),
+            end_time=as_datetime(record["end_time"]),
+        )
+
+    def _apply(self, entry: dict):
+        if entry["op"] == "add":
+            record = entry["record"]
+            existing = self._bookings.get(record["booking_id"])
+            if existing is not None:
+                self._unindex(existing)
+            if not self._is_history(record):
+                self._index(self._from_record(record))
+            self.next_id = max(self.next_id, record["booking_id"] + 1)
+        else:
+            existing = self._bookings.get(entry["id"])
+            if existing is not None:
+                self._unindex(existing)
+        self._version += 1
+
+    def _sync(self):
+        """Pick up changes written by other processes (shared mode only)."""
+        if not self.storage.shared:
+            return
+        with self._lock:
+            changes = self.storage.poll()
+            if changes == RELOAD:
+                self.load_from_file()
+            elif changes:
+                for entry in changes:
+                    self._apply(entry)
+
+    def _persist(self, entry: dict):
+        if not self.storage.log(entry):
             self.save_to_file()
-            return True
-        return False
 
     def load_from_file(self):
-        if os.path.exists(self.filepath):
-            with open(self.filepath, "r") as f:
-                data = json.load(f)
-                self.bookings = [
-                    Booking(
-                        booking_id=b["booking_id"],
-                        room=Room(**b["room"]),
-                        user=User(**b["user"]),
-                        start_time=datetime.fromisoformat(b["start_time"]),
-                        end_time=datetime.fromisoformat(b["end_time"]),
-                    )
-                    for b in data
-                ]
-                if self.bookings:
-                    self.next_id = max(b.booking_id for b in self.bookings) + 1
+        self._rooms = {}
+        self._users = {}
+        self.bookings = []
+        self._version += 1
+        self._loaded_at = datetime.now() if self.active_only else datetime.min
+        self._history_loaded = not self.active_only
+        max_id = 0
+        for record in self.storage.iter_records("booking_id"):
+            max_id = max(max_id, record["booking_id"])
+            if self._is_history(record):
+                continue
+            self._index(self._from_record(record))
+        if max_id:
+            self.next_id = max_id + 1
+        if self.storage.needs_snapshot:
+            self.save_to_file()
+
+    def load_history(self):
+        """Load the bookings skipped by ``active_only`` (no-op once loaded)."""
+        with self._lock:
+            if self._history_loaded:
+                return
+            # Apply pending journal entries first: the scan below moves the
+            # journal offset past them.
+            self._sync()
+            self._history_loaded = True
+            for record in self.storage.iter_records("booking_id"):
+                if (
+                    self._is_history(record)
+                    and record["booking_id"] not in self._bookings
+                ):
+                    self._index(self._from_record(record))
+            # Restore id order in the primary and user indexes
+            self.bookings = [self._bookings[i] for i in sorted(self._bookings)]
+
+    def _is_history(self, record: dict) -> bool:
+        return self.active_only and as_datetime(record["end_time"]) <= self._loaded_at
 
     def save_to_file(self):
-        with open(self.filepath, "w") as f:
-            json.dump(
-                [
-                    {
-                        "booking_id": b.booking_id,
-                        "room": b.room.__dict__,
-                        "user": b.user.__dict__,
-                        "start_time": b.start_time.isoformat(),
-                        "end_time": b.end_time.isoformat(),
-                    }
-                    for b in self.bookings
-                ],
-                f,
-                indent=2,
+        with self._lock, self.storage.exclusive():
+            self.load_history()
+            self.storage.write_snapshot(
+                [self._to_record(b) for b in self._bookings.values()]
             )
@@ -0,0 +1,68 @@
+"""Convert the JSON repository files between the JSON and binary formats.
+
+Run from the repository root::
+
+    python -m src.repositories.convert_snapshots binary [--data-dir src/data]
+    python -m src.repositories.convert_snapshots json [--data-dir src/data]
+
+Every file is loaded (whatever its current format, journal included) and
+written back as a snapshot in the requested format, in place. That includes
+the monthly booking shards under ``bookings/``, closed months too, whose
+``manifest.json`` is rebuilt afterwards.
+"""
+
+import argparse
+import os
+
+from src.repositories.booking_repository import BookingRepository
+from src.repositories.partitioned_booking_repository import (
+    PartitionedBookingRepository,
+)
+from src.repositories.room_repository import RoomRepository
+from src.repositories.series_repository import SeriesRepository
+from src.repositories.user_repository import UserRepository
+
+
+def convert(data_dir: str, binary: bool) -> list:
+    """Rewrite the snapshots found in ``data_dir``; return the converted paths."""
+
+    def path(name):
+        return os.path.join(data_dir, name)
+
+    users = UserRepository(path("users.json"))
+    rooms = RoomRepository(path("rooms.json"))
+    bookings = BookingRepository(
+        path("bookings.json"), room_repository=rooms, user_repository=users
+    )
+    series = SeriesRepository(
+        path("series.json"), room_repository=rooms, user_repository=users
+    )
+    converted = []
+    for repository in (users, rooms, bookings, series):
+        storage = repository.storage
+        if not os.path.exists(storage.filepath) and not os.path.exists(
+            storage.journal_path
+        ):
+            continue
+        storage.binary = binary
+        repository.save_to_file()
+        converted.append(storage.filepath)
+    if os.path.isdir(path("bookings")):
+        shards = PartitionedBookingRepository(
+            path("bookings"), room_repository=rooms, user_repository=users
+        )
+        converted.extend(shards.rewrite_shards(binary))
+    return converted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("format", choices=("json", "binary"))
+    parser.add_argument("--data-dir", default="src/data")
+    args = parser.parse_args(argv)
+    for path in convert(args.data_dir, args.format == "binary"):
+        print(f"{path}: {args.format} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
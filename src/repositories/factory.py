@@ -0,0 +1,97 @@
+import os
+
+from src.repositories.booking_repository import BookingRepository
+from src.repositories.partitioned_booking_repository import (
+    PartitionedBookingRepository,
+)
+from src.repositories.room_repository import RoomRepository
+from src.repositories.series_repository import SeriesRepository
+from src.repositories.sqlite_booking_repository import SqliteBookingRepository
+from src.repositories.sqlite_database import SqliteDatabase
+from src.repositories.sqlite_room_repository import SqliteRoomRepository
+from src.repositories.sqlite_user_repository import SqliteUserRepository
+from src.repositories.user_repository import UserRepository
+
+
+def create_repositories(backend: str = None):
+    """Build the (user, room, booking) repositories for the configured backend.
+
+    ``backend`` defaults to the ``STORAGE_BACKEND`` environment variable:
+    ``json`` (default) or ``sqlite``. The SQLite file is taken from
+    ``SQLITE_PATH``, journal mode for the JSON files from
+    ``STORAGE_JOURNAL=1``, lazy loading of past bookings from
+    ``STORAGE_ACTIVE_ONLY=1`` and cross-process locking of the JSON files
+    (several processes on the same ``src/data``) from ``STORAGE_SHARED=1``.
+    ``STORAGE_PARTITIONED=1`` stores bookings in monthly shards under
+    ``src/data/bookings/``, importing ``bookings.json`` on first use.
+    ``STORAGE_FORMAT=binary`` writes binary snapshots instead of JSON.
+    """
+    backend = backend or os.getenv("STORAGE_BACKEND", "json")
+
+    if backend == "json":
+        journal = os.getenv("STORAGE_JOURNAL", "0") == "1"
+        shared = os.getenv("STORAGE_SHARED", "0") == "1"
+        binary = os.getenv("STORAGE_FORMAT", "json") == "binary"
+        users = UserRepository(journal=journal, shared=shared, binary=binary)
+        rooms = RoomRepository(journal=journal, shared=shared, binary=binary)
+        if os.getenv("STORAGE_PARTITIONED", "0") == "1":
+            if shared:
+                raise ValueError("Partitioned bookings cannot be shared.")
+            return users, rooms, _partitioned_bookings(journal, binary, rooms, users)
+        bookings = BookingRepository(
+            journal=journal,
+            shared=shared,
+            binary=binary,
+            room_repository=rooms,
+            user_repository=users,
+            active_only=os.getenv("STORAGE_ACTIVE_ONLY", "0") == "1",
+        )
+        return users, rooms, bookings
+    if backend == "sqlite":
+        database = SqliteDatabase(os.getenv("SQLITE_PATH", "src/data/booking.db"))
+        return (
+            SqliteUserRepository(database),
+            SqliteRoomRepository(database),
+            SqliteBookingRepository(database),
+        )
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def create_series_repository(rooms, users, backend: str = None):
+    """Build the recurring series repository for the configured backend.
+
+    Series are only stored as JSON, next to the other JSON files and with
+    the same ``STORAGE_JOURNAL``/``STORAGE_SHARED``/``STORAGE_FORMAT``
+    settings. With ``sqlite`` there is no series store and ``None`` is
+    returned, which leaves recurring bookings disabled rather than keeping
+    them in a separate JSON file the database knows nothing about.
+    """
+    backend = backend or os.getenv("STORAGE_BACKEND", "json")
+
+    if backend == "json":
+        return SeriesRepository(
+            journal=os.getenv("STORAGE_JOURNAL", "0") == "1",
+            shared=os.getenv("STORAGE_SHARED", "0") == "1",
+            binary=os.getenv("STORAGE_FORMAT", "json") == "binary",
+            room_repository=rooms,
+            user_repository=users,
+        )
+    if backend == "sqlite":
+        return None
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def _partitioned_bookings(journal: bool, binary: bool, rooms, users):
+    directory = "src/data/bookings"
+    fresh = not os.path.isdir(directory) or not os.listdir(directory)
+    bookings = PartitionedBookingRepository(
+        directory,
+        journal=journal,
+        room_repository=rooms,
+        user_repository=users,
+        binary=binary,
+    )
+    if fresh and os.path.exists("src/data/bookings.json"):
+        legacy = BookingRepository(room_repository=rooms, user_repository=users)
+        bookings.import_bookings(legacy.get_all())
+    return bookings
@@ -0,0 +1,52 @@
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None
+
+
+@contextmanager
+def exclusive_lock(path: str):
+    """Hold an exclusive advisory ``flock`` on ``path`` for the block.
+
+    The lock file is created if needed. Where ``fcntl`` is unavailable the
+    block runs unlocked.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "w"):
+    """Open a temp file next to ``path`` and ``os.replace`` it into place.
+
+    Readers see either the old or the new content, never a partial file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        # mkstemp creates 0600 files; keep the permissions of the original
+        permissions = (
+            stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644
+        )
+        os.chmod(tmp_path, permissions)
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
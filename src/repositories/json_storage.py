@@ -0,0 +1,229 @@
+import json
+import os
+from contextlib import contextmanager
+
+from src.repositories.binary_snapshot import (
+    is_binary_snapshot,
+    iter_binary_snapshot,
+    write_binary_snapshot,
+)
+from src.repositories.file_lock import atomic_write, exclusive_lock
+from src.utils.json_stream import iter_json_array, json_default
+
+RELOAD = "reload"
+
+
+class JsonFileStorage:
+    """JSON snapshot file with an optional append-only journal.
+
+    Without a journal every mutation rewrites the whole snapshot. In journal
+    mode a mutation appends one compact line to ``<filepath>.journal`` and the
+    snapshot is only rewritten (and the journal truncated) every
+    ``compact_every`` entries, so the write cost follows the size of the change
+    instead of the size of the dataset.
+
+    Journal entries are ``{"op": "add", "record": {...}}`` or
+    ``{"op": "delete", "id": ...}``.
+
+    With ``binary=True`` snapshots use the compact format of
+    ``binary_snapshot`` instead of JSON; reads detect the format from the
+    file itself, so switching formats needs no conversion step. The journal
+    is always JSON lines.
+
+    Snapshots are always written to a temp file and ``os.replace``d. With
+    ``shared=True`` several processes may use the same files: mutations run
+    under ``exclusive()`` (an ``flock`` on ``<filepath>.lock``) and ``poll()``
+    tells whether another process changed the files since we last read or
+    wrote them. In journal mode that is usually just the new journal lines.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        journal: bool = False,
+        compact_every=1000,
+        shared: bool = False,
+        binary: bool = False,
+    ):
+        self.filepath = filepath
+        self.binary = binary
+        self.journal = journal
+        self.journal_path = f"{filepath}.journal"
+        self.lock_path = f"{filepath}.lock"
+        self.compact_every = compact_every
+        self.shared = shared
+        self.pending = 0
+        self._truncated = False
+        # What we last saw on disk: snapshot signature, journal identity and
+        # how many journal bytes have been applied.
+        self._snapshot_signature = None
+        self._journal_inode = None
+        self._journal_offset = 0
+        self._lock_depth = 0
+
+    @contextmanager
+    def exclusive(self):
+        """Serialise mutations across processes (re-entrant, shared mode only).
+
+        Callers hold their repository lock, which makes the depth counter safe.
+        """
+        if not self.shared or self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        with exclusive_lock(self.lock_path):
+            self._lock_depth = 1
+            try:
+                yield
+            finally:
+                self._lock_depth = 0
+
+    def poll(self):
+        """Return what changed on disk since our last read or write.
+
+        ``None`` when nothing changed, a list of new journal entries when
+        another process only appended to the journal, or ``RELOAD`` when the
+        snapshot was rewritten and everything must be read again.
+        """
+        if self._signature(self.filepath) != self._snapshot_signature:
+            return RELOAD
+        journal = self._stat(self.journal_path)
+        if journal is None:
+            return RELOAD if self._journal_inode is not None else None
+        if journal.st_ino != self._journal_inode and self._journal_inode is not None:
+            return RELOAD
+        if journal.st_size < self._journal_offset:
+            return RELOAD
+        if journal.st_size == self._journal_offset:
+            return None
+        entries = list(self.read_journal(self._journal_offset))
+        if self._truncated:
+            return RELOAD
+        self.pending += len(entries)
+        return entries
+
+    @staticmethod
+    def _stat(path: str):
+        try:
+            return os.stat(path)
+        except FileNotFoundError:
+            return None
+
+    def _signature(self, path: str):
+        stat = self._stat(path)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size) if stat else None
+
+    def _remember_disk_state(self):
+        self._snapshot_signature = self._signature(self.filepath)
+        journal = self._stat(self.journal_path)
+        self._journal_inode = journal.st_ino if journal else None
+        if journal is None:
+            self._journal_offset = 0
+
+    @property
+    def needs_snapshot(self) -> bool:
+        """True after reading a torn journal, which must not be appended to."""
+        return self._truncated
+
+    def load(self, id_field: str) -> list:
+        """Return the snapshot records with the journal replayed on top."""
+        records = list(self.iter_records(id_field))
+        if self._truncated:
+            # Never append after a torn line: fold the journal into a snapshot
+            self.write_snapshot(records)
+        return records
+
+    def iter_records(self, id_field: str):
+        """Lazily yield the current records: snapshot plus journal.
+
+        The journal (bounded by ``compact_every``) is read first; the snapshot
+        is then streamed record by record, skipping the ids the journal
+        replaced or deleted, so the whole file is never held in memory.
+        """
+        self.pending = 0
+        self._truncated = False
+        self._remember_disk_state()
+        self._journal_offset = 0
+        overrides = {}
+        for entry in self.read_journal():
+            if entry["op"] == "add":
+                overrides[entry["record"][id_field]] = entry["record"]
+            elif entry["op"] == "delete":
+                overrides[entry["id"]] = None
+            self.pending += 1
+        for record in self.read_snapshot():
+            if record[id_field] not in overrides:
+                yield record
+        for record in overrides.values():
+            if record is not None:
+                yield record
+
+    def read_snapshot(self):
+        if not os.path.exists(self.filepath):
+            return iter(())
+        if is_binary_snapshot(self.filepath):
+            return iter_binary_snapshot(self.filepath)
+        return iter_json_array(self.filepath)
+
+    def read_journal(self, offset: int = 0):
+        """Yield the complete journal entries found after byte ``offset``."""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    if not self.shared:
+                        # A crash mid-append leaves a truncated last line; the
+                        # mutation it described never completed.
+                        self._truncated = True
+                    # Shared files may be mid-append by another process
+                    return
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    self._truncated = True
+                    return
+                self._journal_offset = offset = offset + len(line)
+                yield entry
+
+    def write_snapshot(self, records: list):
+        if self.binary:
+            with atomic_write(self.filepath, "wb") as f:
+                write_binary_snapshot(f, records)
+        else:
+            with atomic_write(self.filepath) as f:
+                json.dump(records, f, indent=2, default=json_default)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.pending = 0
+        self._remember_disk_state()
+
+    def log(self, entry: dict) -> bool:
+        """Append ``entry`` to the journal.
+
+        Returns False when the caller must write a snapshot instead, either
+        because journaling is disabled or because compaction is due.
+        """
+        return self.log_many([entry])
+
+    def log_many(self, entries: list) -> bool:
+        """Append several entries to the journal with a single write."""
+        if not self.journal or self.pending + len(entries) >= self.compact_every:
+            return False
+        data = "".join(
+            json.dumps(e, separators=(",", ":"), default=json_default) + "\n"
+            for e in entries
+        )
+        with open(self.journal_path, "ab") as f:
+            f.write(data.encode())
+            end = f.tell()
+        self.pending += len(entries)
+        if self._journal_offset == end - len(data.encode()):
+            # Only our own append since the last poll: nothing to re-read
+            self._journal_offset = end
+            self._remember_disk_state()
+        return True
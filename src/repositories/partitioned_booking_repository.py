@@ -0,0 +1,338 @@
+import json
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.models.booking import Booking
+from src.models.room import Room
+from src.models.user import User
+from src.repositories.booking_repository import BookingRepository
+from src.repositories.file_lock import atomic_write
+from src.repositories.json_storage import JsonFileStorage
+from src.utils.json_stream import as_datetime
+
+_SHARD_NAME = re.compile(r"^(\d{4}-\d{2})\.json(\.journal)?$")
+
+
+def month_of(moment: datetime) -> str:
+    """Shard key of a booking starting at ``moment``: ``YYYY-MM``."""
+    return f"{moment.year:04d}-{moment.month:02d}"
+
+
+class PartitionedBookingRepository(BookingRepository):
+    """Bookings stored in one JSON shard per month of their start time.
+
+    ``<directory>/YYYY-MM.json`` holds the bookings starting in that month.
+    Shards from the current month onwards are hot: they are loaded and
+    indexed at startup and written like a plain ``BookingRepository`` file
+    (optionally through a journal). Older shards are closed: they are never
+    rewritten and are only read, a month at a time, when a history query
+    needs them. Adding a booking to a closed month raises ``ValueError``;
+    deleting one returns ``False``, as for an unknown id.
+
+    ``manifest.json`` records the id range and latest end time of every
+    closed shard. Closed shards never change, so the manifest is only
+    written when a month closes, and it lets startup compute ``next_id`` and
+    lets window queries skip cold shards without opening them.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(
+        self,
+        directory="src/data/bookings",
+        journal=False,
+        compact_every=1000,
+        room_repository=None,
+        user_repository=None,
+        binary=False,
+    ):
+        self.directory = directory
+        # month -> {booking_id: booking} for the indexed bookings
+        self._month_index = {}
+        # month -> JsonFileStorage, opened on first use
+        self._shards = {}
+        # month -> manifest entry, for closed shards
+        self._closed = {}
+        # Months whose bookings are indexed
+        self._loaded = set()
+        super().__init__(
+            directory,
+            journal,
+            compact_every,
+            room_repository,
+            user_repository,
+            binary=binary,
+        )
+
+    def _open_storage(self, directory, journal, compact_every, shared, binary):
+        """Shards are opened per month by ``_shard``; there is no single file."""
+        self.journal = journal
+        self.compact_every = compact_every
+        self.binary = binary
+        os.makedirs(directory, exist_ok=True)
+        return None
+
+    @property
+    def bookings(self) -> list:
+        return list(self._bookings.values())
+
+    @bookings.setter
+    def bookings(self, bookings: list):
+        BookingRepository.bookings.fset(self, bookings)
+        self._month_index = {}
+        for booking in bookings:
+            self._month_index.setdefault(month_of(booking.start_time), {})[
+                booking.booking_id
+            ] = booking
+
+    def _index(self, booking: Booking):
+        super()._index(booking)
+        self._month_index.setdefault(month_of(booking.start_time), {})[
+            booking.booking_id
+        ] = booking
+
+    def _unindex(self, booking: Booking):
+        super()._unindex(booking)
+        month = month_of(booking.start_time)
+        month_bookings = self._month_index.get(month, {})
+        month_bookings.pop(booking.booking_id, None)
+        if not month_bookings:
+            self._month_index.pop(month, None)
+
+    def _shard(self, month: str) -> JsonFileStorage:
+        shard = self._shards.get(month)
+        if shard is None:
+            shard = self._shards[month] = JsonFileStorage(
+                os.path.join(self.directory, f"{month}.json"),
+                self.journal,
+                self.compact_every,
+                binary=self.binary,
+            )
+        return shard
+
+    @contextmanager
+    def exclusive(self):
+        """Shards are not shared between processes; the thread lock suffices."""
+        with self._lock:
+            yield
+
+    def _check_open(self, month: str):
+        if month < month_of(datetime.now()):
+            raise ValueError(f"Bookings of {month} are closed and cannot be changed.")
+
+    def add(
+        self, room: Room, user: User, start_time: datetime, end_time: datetime
+    ) -> Booking:
+        with self._lock:
+            month = month_of(start_time)
+            self._check_open(month)
+            booking = Booking(self.next_id, room, user, start_time, end_time)
+            self._index(booking)
+            self.next_id += 1
+            self._version += 1
+            self._persist_month(
+                month, [{"op": "add", "record": self._to_record(booking)}]
+            )
+            return booking
+
+    def add_many(self, rows: list) -> list:
+        """Add ``(room, user, start_time, end_time)`` rows, one write per month."""
+        with self._lock:
+            for _, _, start_time, _ in rows:
+                self._check_open(month_of(start_time))
+            entries = {}
+            bookings = []
+            for room, user, start_time, end_time in rows:
+                booking = Booking(self.next_id, room, user, start_time, end_time)
+                self._index(booking)
+                self.next_id += 1
+                bookings.append(booking)
+                entries.setdefault(month_of(start_time), []).append(
+                    {"op": "add", "record": self._to_record(booking)}
+                )
+            self._version += 1
+            for month, month_entries in entries.items():
+                self._persist_month(month, month_entries)
+            return bookings
+
+    def get_by_id(self, booking_id: int) -> Booking:
+        booking = self._bookings.get(booking_id)
+        if booking is None:
+            self._load_months(
+                month
+                for month, entry in self._closed.items()
+                if entry["min_id"] <= booking_id <= entry["max_id"]
+            )
+            booking = self._bookings.get(booking_id)
+        return booking
+
+    def delete(self, booking_id: int) -> bool:
+        with self._lock:
+            booking = self.get_by_id(booking_id)
+            if booking is None:
+                return False
+            month = month_of(booking.start_time)
+            if month < month_of(datetime.now()):
+                return False
+            self._unindex(booking)
+            self._version += 1
+            self._persist_month(month, [{"op": "delete", "id": booking_id}])
+            return True
+
+    def _sync(self):
+        """Shards are not shared between processes."""
+
+    def _persist_month(self, month: str, entries: list):
+        if not self._shard(month).log_many(entries):
+            self._write_month(month)
+
+    def _write_month(self, month: str):
+        records = [
+            self._to_record(b) for b in self._month_index.get(month, {}).values()
+        ]
+        self._shard(month).write_snapshot(records)
+
+    def _load_window(self, start_time, end_time):
+        """Load the closed shards that may hold bookings in the range."""
+        self._load_months(
+            month
+            for month, entry in self._closed.items()
+            if (end_time is None or month <= month_of(end_time))
+            and (
+                start_time is None
+                or entry["max_end"] is not None
+                and datetime.fromisoformat(entry["max_end"]) > start_time
+            )
+        )
+
+    def load_history(self):
+        """Load every closed shard (no-op once loaded)."""
+        self._load_months(list(self._closed))
+
+    def _load_months(self, months):
+        with self._lock:
+            missing = sorted(set(months) - self._loaded)
+            for month in missing:
+                self._load_month(month)
+            if missing:
+                # Restore id order in the primary and user indexes
+                self._bookings = dict(sorted(self._bookings.items()))
+                self._user_index = {
+                    user_id: dict(sorted(bookings.items()))
+                    for user_id, bookings in self._user_index.items()
+                }
+
+    def _load_month(self, month: str) -> int:
+        """Index the bookings of ``month`` and return the highest id seen."""
+        self._loaded.add(month)
+        max_id = 0
+        for record in self._shard(month).iter_records("booking_id"):
+            max_id = max(max_id, record["booking_id"])
+            if record["booking_id"] not in self._bookings:
+                self._index(self._from_record(record))
+        return max_id
+
+    def _describe(self, month: str) -> dict:
+        """Summarise a closed shard for the manifest without indexing it."""
+        ids = []
+        max_end = None
+        for record in self._shard(month).iter_records("booking_id"):
+            ids.append(record["booking_id"])
+            end_time = as_datetime(record["end_time"])
+            max_end = max(max_end or end_time, end_time)
+        return {
+            "bookings": len(ids),
+            "min_id": min(ids, default=0),
+            "max_id": max(ids, default=0),
+            "max_end": max_end.isoformat() if max_end else None,
+        }
+
+    def _months_on_disk(self) -> list:
+        months = set()
+        for name in os.listdir(self.directory):
+            match = _SHARD_NAME.match(name)
+            if match:
+                months.add(match.group(1))
+        return sorted(months)
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, self.MANIFEST)
+
+    def _write_manifest(self):
+        with atomic_write(self._manifest_path()) as f:
+            json.dump(self._closed, f, indent=2, sort_keys=True)
+
+    def load_from_file(self):
+        with self._lock:
+            self._rooms = {}
+            self._users = {}
+            self._shards = {}
+            self._closed = {}
+            self.bookings = []
+            self._version += 1
+            self._loaded = set()
+            try:
+                with open(self._manifest_path()) as f:
+                    manifest = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                manifest = {}
+
+            current = month_of(datetime.now())
+            max_id = 0
+            for month in self._months_on_disk():
+                if month < current:
+                    self._closed[month] = manifest.get(month) or self._describe(month)
+                    max_id = max(max_id, self._closed[month]["max_id"])
+                else:
+                    max_id = max(max_id, self._load_month(month))
+                    if self._shard(month).needs_snapshot:
+                        self._write_month(month)
+            if self._closed != manifest:
+                self._write_manifest()
+            if max_id:
+                self.next_id = max_id + 1
+
+    def save_to_file(self):
+        """Rewrite the open shards; closed ones are left untouched."""
+        with self._lock:
+            current = month_of(datetime.now())
+            months = set(self._month_index) | {
+                month for month in self._months_on_disk() if month >= current
+            }
+            for month in sorted(months):
+                if month >= current:
+                    self._write_month(month)
+
+    def rewrite_shards(self, binary: bool) -> list:
+        """Rewrite every shard, closed ones included, as a snapshot in the
+        given format and rebuild the manifest from them.
+
+        Used by ``convert_snapshots``; returns the paths written.
+        """
+        with self._lock:
+            self.load_history()
+            self.binary = binary
+            months = self._months_on_disk()
+            for month in months:
+                self._shard(month).binary = binary
+                self._write_month(month)
+            self._closed = {month: self._describe(month) for month in self._closed}
+            self._write_manifest()
+            paths = [self._shard(month).filepath for month in months]
+            self.load_from_file()
+            return paths + [self._manifest_path()]
+
+    def import_bookings(self, bookings):
+        """Write existing bookings (e.g. from ``bookings.json``) into shards.
+
+        Meant for a one-off migration into an empty directory, so closed
+        months are written too. ``next_id`` continues after the highest id.
+        """
+        with self._lock:
+            for booking in bookings:
+                self._index(booking)
+            for month in sorted(self._month_index):
+                self._write_month(month)
+            self.load_from_file()
@@ -1,45 +1,129 @@
-import json
-import os
+import threading
+from bisect import bisect_left, insort
+from operator import attrgetter
 
 from src.models.room import Room
+from src.repositories.json_storage import RELOAD, JsonFileStorage
+
+_capacity_key = attrgetter("capacity", "room_id")
 
 
 class RoomRepository:
-    def __init__(self, filepath="src/data/rooms.json"):
+    def __init__(
+        self,
+        filepath="src/data/rooms.json",
+        journal=False,
+        compact_every=1000,
+        shared=False,
+        binary=False,
+    ):
         self.filepath = filepath
-        self.rooms = []
+        self.storage = JsonFileStorage(filepath, journal, compact_every, shared, binary)
+        # room_id -> room, in insertion order
+        self._rooms = {}
+        # rooms sorted by (capacity, room_id)
+        self._capacity_index = []
         self.next_id = 1
+        # Bumped on every change, so callers can tell cheaply whether the
+        # data changed (e.g. HTTP ETags)
+        self._version = 0
+        # Guards id allocation, the indexes and the file writes
+        self._lock = threading.RLock()
         self.load_from_file()
 
+    @property
+    def version(self) -> int:
+        """Change counter: differs whenever the data may have changed."""
+        self._sync()
+        return self._version
+
+    @property
+    def rooms(self) -> list:
+        return list(self._rooms.values())
+
+    @rooms.setter
+    def rooms(self, rooms: list):
+        self._rooms = {room.room_id: room for room in rooms}
+        self._capacity_index = sorted(rooms, key=_capacity_key)
+
     def add(self, name: str, capacity: int, location: str) -> Room:
-        room = Room(self.next_id, name, capacity, location)
-        self.rooms.append(room)
-        self.next_id += 1
-        self.save_to_file()
-        return room
+        with self._lock, self.storage.exclusive():
+            self._sync()
+            room = Room(self.next_id, name, capacity, location)
+            self._store(room)
+            self.next_id += 1
+            self._persist({"op": "add", "record": room.to_dict()})
+            return room
 
     def get_by_id(self, room_id: int) -> Room:
-        return next((room for room in self.rooms if room.room_id == room_id), None)
+        self._sync()
+        return self._rooms.get(room_id)
+
+    def get_by_min_capacity(self, min_capacity: int, location: str = None) -> list:
+        """Return rooms with capacity >= min_capacity, smallest first."""
+        self._sync()
+        i = bisect_left(self._capacity_index, min_capacity, key=attrgetter("capacity"))
+        rooms = self._capacity_index[i:]
+        if location is not None:
+            rooms = [room for room in rooms if room.location == location]
+        return rooms
 
     def get_all(self) -> list:
+        self._sync()
         return self.rooms
 
     def delete(self, room_id: int) -> bool:
-        room = self.get_by_id(room_id)
-        if room:
-            self.rooms.remove(room)
+        with self._lock, self.storage.exclusive():
+            self._sync()
+            if self._discard(room_id):
+                self._persist({"op": "delete", "id": room_id})
+                return True
+            return False
+
+    def _store(self, room: Room):
+        self._discard(room.room_id)
+        self._rooms[room.room_id] = room
+        insort(self._capacity_index, room, key=_capacity_key)
+        self._version += 1
+
+    def _discard(self, room_id: int) -> bool:
+        room = self._rooms.pop(room_id, None)
+        if room is None:
+            return False
+        i = bisect_left(self._capacity_index, _capacity_key(room), key=_capacity_key)
+        del self._capacity_index[i]
+        self._version += 1
+        return True
+
+    def _apply(self, entry: dict):
+        if entry["op"] == "add":
+            self._store(Room(**entry["record"]))
+            self.next_id = max(self.next_id, entry["record"]["room_id"] + 1)
+        else:
+            self._discard(entry["id"])
+
+    def _sync(self):
+        """Pick up changes written by other processes (shared mode only)."""
+        if not self.storage.shared:
+            return
+        with self._lock:
+            changes = self.storage.poll()
+            if changes == RELOAD:
+                self.load_from_file()
+            elif changes:
+                for entry in changes:
+                    self._apply(entry)
+
+    def _persist(self, entry: dict):
+        if not self.storage.log(entry):
             self.save_to_file()
-            return True
-        return False
 
     def load_from_file(self):
-        if os.path.exists(self.filepath):
-            with open(self.filepath, "r") as f:
-                data = json.load(f)
-                self.rooms = [Room(**room) for room in data]
-                if self.rooms:
-                    self.next_id = max(r.room_id for r in self.rooms) + 1
+        self.rooms = [Room(**room) for room in self.storage.load("room_id")]
+        self._version += 1
+        if self.rooms:
+            self.next_id = max(r.room_id for r in self.rooms) + 1
 
     def save_to_file(self):
-        with open(self.filepath, "w") as f:
-            json.dump([room.__dict__ for room in self.rooms], f, indent=2)
+        with self._lock, self.storage.exclusive():
+            self.storage.write_snapshot([room.to_dict() for room in self.rooms])
@@ -0,0 +1,160 @@
+import threading
+from datetime import datetime
+
+from src.models.booking_series import BookingSeries
+from src.models.recurrence import RecurrenceRule
+from src.models.room import Room
+from src.models.user import User
+from src.repositories.booking_repository import reference, resolve
+from src.repositories.json_storage import RELOAD, JsonFileStorage
+from src.utils.json_stream import as_datetime
+
+
+class SeriesRepository:
+    """Recurring booking series persisted as JSON, one record per series."""
+
+    def __init__(
+        self,
+        filepath="src/data/series.json",
+        journal=False,
+        compact_every=1000,
+        room_repository=None,
+        user_repository=None,
+        shared=False,
+        binary=False,
+    ):
+        self.filepath = filepath
+        self.storage = JsonFileStorage(filepath, journal, compact_every, shared, binary)
+        self.room_repository = room_repository
+        self.user_repository = user_repository
+        # series_id -> series, in insertion order
+        self._series = {}
+        # room_id -> {series_id: series}
+        self._room_index = {}
+        # Intern tables so series share one Room/User object per id
+        self._rooms = {}
+        self._users = {}
+        self.next_id = 1
+        # Guards id allocation, the indexes and the file writes
+        self._lock = threading.RLock()
+        self.load_from_file()
+
+    @property
+    def series(self) -> list:
+        return list(self._series.values())
+
+    @series.setter
+    def series(self, series: list):
+        self._series = {}
+        self._room_index = {}
+        for item in series:
+            self._index(item)
+
+    def _index(self, series: BookingSeries):
+        self._series[series.series_id] = series
+        self._room_index.setdefault(series.room.room_id, {})[series.series_id] = series
+
+    def _unindex(self, series_id: int) -> bool:
+        series = self._series.pop(series_id, None)
+        if series is None:
+            return False
+        room_series = self._room_index[series.room.room_id]
+        del room_series[series_id]
+        if not room_series:
+            del self._room_index[series.room.room_id]
+        return True
+
+    def add(
+        self,
+        room: Room,
+        user: User,
+        start_time: datetime,
+        end_time: datetime,
+        rule: RecurrenceRule,
+    ) -> BookingSeries:
+        with self._lock, self.storage.exclusive():
+            self._sync()
+            series = BookingSeries(self.next_id, room, user, start_time, end_time, rule)
+            self._index(series)
+            self.next_id += 1
+            self._persist({"op": "add", "record": self._to_record(series)})
+            return series
+
+    def get_by_id(self, series_id: int) -> BookingSeries:
+        self._sync()
+        return self._series.get(series_id)
+
+    def get_by_room(self, room_id: int) -> list:
+        self._sync()
+        return list(self._room_index.get(room_id, {}).values())
+
+    def get_all(self) -> list:
+        self._sync()
+        return self.series
+
+    def delete(self, series_id: int) -> bool:
+        with self._lock, self.storage.exclusive():
+            self._sync()
+            if not self._unindex(series_id):
+                return False
+            self._persist({"op": "delete", "id": series_id})
+            return True
+
+    def _to_record(self, series: BookingSeries) -> dict:
+        """Rooms and users are stored by id, as in ``BookingRepository``."""
+        record = {"series_id": series.series_id}
+        record.update(reference(series.room, "room", self.room_repository))
+        record.update(reference(series.user, "user", self.user_repository))
+        record["start_time"] = series.start_time
+        record["end_time"] = series.end_time
+        record["rule"] = series.rule.to_dict()
+        return record
+
+    def _from_record(self, record: dict) -> BookingSeries:
+        owner = f"Series {record['series_id']}"
+        return BookingSeries(
+            series_id=record["series_id"],
+            room=resolve(record, "room", self.room_repository, self._rooms, owner),
+            user=resolve(record, "user", self.user_repository, self._users, owner),
+            start_time=as_datetime(record["start_time"]),
+            end_time=as_datetime(record["end_time"]),
+            rule=RecurrenceRule.from_dict(record["rule"]),
+        )
+
+    def _apply(self, entry: dict):
+        if entry["op"] == "add":
+            series = self._from_record(entry["record"])
+            self._unindex(series.series_id)
+            self._index(series)
+            self.next_id = max(self.next_id, series.series_id + 1)
+        else:
+            self._unindex(entry["id"])
+
+    def _sync(self):
+        """Pick up changes written by other processes (shared mode only)."""
+        if not self.storage.shared:
+            return
+        with self._lock:
+            changes = self.storage.poll()
+            if changes == RELOAD:
+                self.load_from_file()
+            elif changes:
+                for entry in changes:
+                    self._apply(entry)
+
+    def _persist(self, entry: dict):
+        if not self.storage.log(entry):
+            self.save_to_file()
+
+    def load_from_file(self):
+        self._rooms = {}
+        self._users = {}
+        self.series = [
+            self._from_record(record) for record in self.storage.load("series_id")
+        ]
+        if self._series:
+            self.next_id = max(self._series) + 1
+
+    def save_to_file(self):
+        with self._lock, self.storage.exclusive():
+            self.storage.write_snapshot([self._to_record(s) for s in self.series])
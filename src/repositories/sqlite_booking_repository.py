@@ -0,0 +1,244 @@
+import warnings
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from src.models.booking import Booking
+from src.models.room import Room
+from src.models.user import User
+from src.repositories.booking_repository import PLACEHOLDERS
+from src.repositories.sqlite_database import SqliteDatabase
+
+_SELECT = """
+SELECT b.booking_id, b.start_time, b.end_time,
+       b.room_id AS b_room_id, b.user_id AS b_user_id,
+       r.room_id, r.name AS room_name, r.capacity, r.location,
+       u.user_id, u.name AS user_name, u.email
+FROM bookings b
+LEFT JOIN rooms r ON r.room_id = b.room_id
+LEFT JOIN users u ON u.user_id = b.user_id
+"""
+
+
+def _placeholder(row, kind: str) -> dict:
+    entity_id = row[f"b_{kind}_id"]
+    warnings.warn(
+        f"Booking {row['booking_id']} references unknown {kind}_id "
+        f"{entity_id}; using a placeholder",
+        stacklevel=3,
+    )
+    return PLACEHOLDERS[kind](entity_id)
+
+
+class SqliteBookingRepository:
+    """Bookings stored in SQLite, referencing the rooms and users tables.
+
+    Rooms and users must exist in the same database before they are booked.
+    A booking whose room or user was deleted since is still returned, with
+    the same placeholder and warning as ``BookingRepository``.
+    """
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+        # room_id -> longest booking of the room, valid for _longest_version
+        self._longest = {}
+        self._longest_version = None
+
+    @property
+    def version(self) -> str:
+        return self.database.version
+
+    @staticmethod
+    def _to_bookings(rows) -> list:
+        rooms = {}
+        users = {}
+        bookings = []
+        for row in rows:
+            room = rooms.get(row["b_room_id"])
+            if room is None:
+                if row["room_id"] is None:
+                    room = Room(**_placeholder(row, "room"))
+                else:
+                    room = Room(
+                        row["room_id"],
+                        row["room_name"],
+                        row["capacity"],
+                        row["location"],
+                    )
+                rooms[row["b_room_id"]] = room
+            user = users.get(row["b_user_id"])
+            if user is None:
+                if row["user_id"] is None:
+                    user = User(**_placeholder(row, "user"))
+                else:
+                    user = User(row["user_id"], row["user_name"], row["email"])
+                users[row["b_user_id"]] = user
+            bookings.append(
+                Booking(
+                    row["booking_id"],
+                    room,
+                    user,
+                    datetime.fromisoformat(row["start_time"]),
+                    datetime.fromisoformat(row["end_time"]),
+                )
+            )
+        return bookings
+
+    def add(
+        self, room: Room, user: User, start_time: datetime, end_time: datetime
+    ) -> Booking:
+        cursor = self.database.execute(
+            "INSERT INTO bookings (room_id, user_id, start_time, end_time) "
+            "VALUES (?, ?, ?, ?)",
+            (room.room_id, user.user_id, start_time.isoformat(), end_time.isoformat()),
+        )
+        return Booking(cursor.lastrowid, room, user, start_time, end_time)
+
+    @contextmanager
+    def exclusive(self):
+        """Hold the database write lock for a read-check-write sequence."""
+        with self.database.transaction():
+            yield
+
+    def add_if_free(
+        self,
+        room: Room,
+        user: User,
+        start_time: datetime,
+        end_time: datetime,
+        validator,
+    ) -> Booking:
+        """Same contract as ``BookingRepository.add_if_free``."""
+        if start_time >= end_time:
+            raise ValueError("End time must be after start time.")
+        with self.exclusive():
+            candidate = Booking(-1, room, user, start_time, end_time)
+            timeline = self.get_room_timeline(room.room_id, start_time, end_time)
+            if not validator.is_valid(candidate, timeline):
+                raise ValueError("Time slot overlaps with an existing booking.")
+            return self.add(room, user, start_time, end_time)
+
+    def add_many(self, rows: list) -> list:
+        """Add ``(room, user, start_time, end_time)`` rows in one transaction."""
+        ids = self.database.execute_many(
+            "INSERT INTO bookings (room_id, user_id, start_time, end_time) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (room.room_id, user.user_id, start.isoformat(), end.isoformat())
+                for room, user, start, end in rows
+            ],
+        )
+        return [Booking(i, *row) for i, row in zip(ids, rows)]
+
+    def get_by_id(self, booking_id: int) -> Booking:
+        rows = self.database.query(f"{_SELECT} WHERE b.booking_id = ?", (booking_id,))
+        return self._to_bookings(rows)[0] if rows else None
+
+    def get_by_user(self, user_id: int, start_time=None, end_time=None) -> list:
+        where, params = "b.user_id = ?", [user_id]
+        if start_time is not None:
+            where += " AND b.end_time > ?"
+            params.append(start_time.isoformat())
+        if end_time is not None:
+            where += " AND b.start_time < ?"
+            params.append(end_time.isoformat())
+        rows = self.database.query(
+            f"{_SELECT} WHERE {where} ORDER BY b.booking_id", tuple(params)
+        )
+        return self._to_bookings(rows)
+
+    def find(
+        self,
+        room_id=None,
+        user_id=None,
+        start_time=None,
+        end_time=None,
+        after=None,
+        limit=None,
+    ) -> list:
+        """Return bookings ordered by ``(start_time, booking_id)``.
+
+        Same contract as ``BookingRepository.find``: optional room, user and
+        time window filters plus a keyset cursor ``after``.
+        """
+        where, params = [], []
+        for condition, value in (
+            ("b.room_id = ?", room_id),
+            ("b.user_id = ?", user_id),
+            ("b.end_time > ?", start_time and start_time.isoformat()),
+            ("b.start_time < ?", end_time and end_time.isoformat()),
+        ):
+            if value is not None:
+                where.append(condition)
+                params.append(value)
+        if after is not None:
+            where.append("(b.start_time, b.booking_id) > (?, ?)")
+            params.extend((after[0].isoformat(), after[1]))
+        sql = _SELECT
+        if where:
+            sql += f" WHERE {' AND '.join(where)}"
+        sql += " ORDER BY b.start_time, b.booking_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._to_bookings(self.database.query(sql, tuple(params)))
+
+    def get_by_room(self, room_id: int) -> list:
+        return self.get_room_timeline(room_id)
+
+    def get_room_timeline(self, room_id: int, start_time=None, end_time=None) -> list:
+        """Return the bookings of a room sorted by start time.
+
+        When a window is given only the bookings overlapping it are returned,
+        using one range seek on the (room_id, start_time, end_time) index that
+        looks back no further than the room's longest booking.
+        """
+        if start_time is None or end_time is None:
+            rows = self.database.query(
+                f"{_SELECT} WHERE b.room_id = ? ORDER BY b.start_time", (room_id,)
+            )
+            return self._to_bookings(rows)
+
+        longest = self._longest_booking(room_id)
+        lower = datetime.min
+        if start_time - datetime.min > longest:
+            lower = start_time - longest
+        rows = self.database.query(
+            f"{_SELECT} WHERE b.room_id = ? AND b.start_time >= ? "
+            "AND b.start_time < ? AND b.end_time > ? ORDER BY b.start_time",
+            (room_id, lower.isoformat(), end_time.isoformat(), start_time.isoformat()),
+        )
+        return self._to_bookings(rows)
+
+    def _longest_booking(self, room_id: int) -> timedelta:
+        """Longest booking of the room, cached until the database changes."""
+        version = self.database.version
+        if version != self._longest_version:
+            self._longest = {}
+            self._longest_version = version
+        longest = self._longest.get(room_id)
+        if longest is None:
+            (seconds,) = self.database.query(
+                "SELECT MAX(julianday(end_time) - julianday(start_time)) * 86400 "
+                "FROM bookings WHERE room_id = ?",
+                (room_id,),
+            )[0]
+            # julianday() is a float; pad so rounding cannot hide a booking
+            longest = self._longest[room_id] = timedelta(seconds=(seconds or 0) + 1)
+        return longest
+
+    def get_all(self) -> list:
+        return self._to_bookings(
+            self.database.query(f"{_SELECT} ORDER BY b.booking_id")
+        )
+
+    def delete(self, booking_id: int) -> bool:
+        cursor = self.database.execute(
+            "DELETE FROM bookings WHERE booking_id = ?", (booking_id,)
+        )
+        return cursor.rowcount > 0
+
+    def load_from_file(self):
+        """Rows are read on demand; kept for interface parity."""
+
+    def save_to_file(self):
+        """Every mutation is committed immediately; kept for interface parity."""
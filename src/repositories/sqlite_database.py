@@ -0,0 +1,92 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rooms (
+    room_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    capacity INTEGER NOT NULL,
+    location TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bookings (
+    booking_id INTEGER PRIMARY KEY,
+    room_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bookings_room_time
+    ON bookings (room_id, start_time, end_time);
+CREATE INDEX IF NOT EXISTS idx_bookings_user ON bookings (user_id);
+CREATE INDEX IF NOT EXISTS idx_rooms_capacity ON rooms (capacity, room_id);
+"""
+
+
+class SqliteDatabase:
+    """Single local SQLite file shared by the SQLite repositories."""
+
+    def __init__(self, path="src/data/booking.db"):
+        self.path = path
+        self.lock = threading.RLock()
+        self._in_transaction = False
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        # Writes through this connection; data_version covers the others
+        self._writes = 0
+        with self.lock:
+            self.connection.executescript(SCHEMA)
+
+    def query(self, sql: str, params=()) -> list:
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        """Run the statements of the block as one write transaction.
+
+        ``BEGIN IMMEDIATE`` takes SQLite's write lock up front, so a
+        read-check-write sequence cannot interleave with another connection
+        or process. Re-entrant; the outermost block commits.
+        """
+        with self.lock:
+            if self._in_transaction:
+                yield
+                return
+            self.connection.execute("BEGIN IMMEDIATE")
+            self._in_transaction = True
+            try:
+                yield
+            except BaseException:
+                self.connection.rollback()
+                raise
+            else:
+                self.connection.commit()
+            finally:
+                self._in_transaction = False
+
+    def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        with self.transaction():
+            self._writes += 1
+            return self.connection.execute(sql, params)
+
+    def execute_many(self, sql: str, rows: list) -> list:
+        """Run ``sql`` for every row in one transaction; return the row ids."""
+        with self.transaction():
+            self._writes += 1
+            return [self.connection.execute(sql, row).lastrowid for row in rows]
+
+    @property
+    def version(self) -> str:
+        """Changes whenever the database does, whichever process wrote it."""
+        with self.lock:
+            (data_version,) = self.connection.execute("PRAGMA data_version").fetchone()
+            return f"{data_version}.{self._writes}"
+
+    def close(self):
+        self.connection.close()
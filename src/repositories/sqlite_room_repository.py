@@ -0,0 +1,52 @@
+from src.models.room import Room
+from src.repositories.sqlite_database import SqliteDatabase
+
+_COLUMNS = "room_id, name, capacity, location"
+
+
+class SqliteRoomRepository:
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    @property
+    def version(self) -> str:
+        return self.database.version
+
+    def add(self, name: str, capacity: int, location: str) -> Room:
+        cursor = self.database.execute(
+            "INSERT INTO rooms (name, capacity, location) VALUES (?, ?, ?)",
+            (name, capacity, location),
+        )
+        return Room(cursor.lastrowid, name, capacity, location)
+
+    def get_by_id(self, room_id: int) -> Room:
+        rows = self.database.query(
+            f"SELECT {_COLUMNS} FROM rooms WHERE room_id = ?", (room_id,)
+        )
+        return Room(**rows[0]) if rows else None
+
+    def get_by_min_capacity(self, min_capacity: int, location: str = None) -> list:
+        """Return rooms with capacity >= min_capacity, smallest first."""
+        sql = f"SELECT {_COLUMNS} FROM rooms WHERE capacity >= ?"
+        params = [min_capacity]
+        if location is not None:
+            sql += " AND location = ?"
+            params.append(location)
+        rows = self.database.query(f"{sql} ORDER BY capacity, room_id", params)
+        return [Room(**row) for row in rows]
+
+    def get_all(self) -> list:
+        rows = self.database.query(f"SELECT {_COLUMNS} FROM rooms ORDER BY room_id")
+        return [Room(**row) for row in rows]
+
+    def delete(self, room_id: int) -> bool:
+        cursor = self.database.execute(
+            "DELETE FROM rooms WHERE room_id = ?", (room_id,)
+        )
+        return cursor.rowcount > 0
+
+    def load_from_file(self):
+        """Rows are read on demand; kept for interface parity."""
+
+    def save_to_file(self):
+        """Every mutation is committed immediately; kept for interface parity."""
@@ -0,0 +1,41 @@
+from src.models.user import User
+from src.repositories.sqlite_database import SqliteDatabase
+
+
+class SqliteUserRepository:
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    @property
+    def version(self) -> str:
+        return self.database.version
+
+    def add(self, name: str, email: str) -> User:
+        cursor = self.database.execute(
+            "INSERT INTO users (name, email) VALUES (?, ?)", (name, email)
+        )
+        return User(cursor.lastrowid, name, email)
+
+    def get_by_id(self, user_id: int) -> User:
+        rows = self.database.query(
+            "SELECT user_id, name, email FROM users WHERE user_id = ?", (user_id,)
+        )
+        return User(**rows[0]) if rows else None
+
+    def get_all(self) -> list:
+        rows = self.database.query(
+            "SELECT user_id, name, email FROM users ORDER BY user_id"
+        )
+        return [User(**row) for row in rows]
+
+    def delete(self, user_id: int) -> bool:
+        cursor = self.database.execute(
+            "DELETE FROM users WHERE user_id = ?", (user_id,)
+        )
+        return cursor.rowcount > 0
+
+    def load_from_file(self):
+        """Rows are read on demand; kept for interface parity."""
+
+    def save_to_file(self):
+        """Every mutation is committed immediately; kept for interface parity."""
@@ -1,45 +1,104 @@
-import json
-import os
+import threading
 
 from src.models.user import User
+from src.repositories.json_storage import RELOAD, JsonFileStorage
 
 
 class UserRepository:
-    def __init__(self, filepath="src/data/users.json"):
+    def __init__(
+        self,
+        filepath="src/data/users.json",
+        journal=False,
+        compact_every=1000,
+        shared=False,
+        binary=False,
+    ):
         self.filepath = filepath
-        self.users = []
+        self.storage = JsonFileStorage(filepath, journal, compact_every, shared, binary)
+        # user_id -> user, in insertion order
+        self._users = {}
         self.next_id = 1
+        # Bumped on every change, so callers can tell cheaply whether the
+        # data changed (e.g. HTTP ETags)
+        self._version = 0
+        # Guards id allocation, the indexes and the file writes
+        self._lock = threading.RLock()
         self.load_from_file()
 
+    @property
+    def version(self) -> int:
+        """Change counter: differs whenever the data may have changed."""
+        self._sync()
+        return self._version
+
+    @property
+    def users(self) -> list:
+        return list(self._users.values())
+
+    @users.setter
+    def users(self, users: list):
+        self._users = {user.user_id: user for user in users}
+
     def add(self, name: str, email: str) -> User:
-        user = User(self.next_id, name, email)
-        self.users.append(user)
-        self.next_id += 1
-        self.save_to_file()
-        return user
+        with self._lock, self.storage.exclusive():
+            self._sync()
+            user = User(self.next_id, name, email)
+            self._users[user.user_id] = user
+            self.next_id += 1
+            self._version += 1
+            self._persist({"op": "add", "record": user.to_dict()})
+            return user
 
     def get_by_id(self, user_id: int) -> User:
-        return next((user for user in self.users if user.user_id == user_id), None)
+        self._sync()
+        return self._users.get(user_id)
 
     def get_all(self) -> list:
+        self._sync()
         return self.users
 
     def delete(self, user_id: int) -> bool:
-        user = self.get_by_id(user_id)
-        if user:
-            self.users.remove(user)
+        with self._lock, self.storage.exclusive():
+            self._sync()
+            user = self.get_by_id(user_id)
+            if user:
+                del self._users[user.user_id]
+                self._version += 1
+                self._persist({"op": "delete", "id": user_id})
+                return True
+            return False
+
+    def _apply(self, entry: dict):
+        if entry["op"] == "add":
+            user = User(**entry["record"])
+            self._users[user.user_id] = user
+            self.next_id = max(self.next_id, user.user_id + 1)
+        else:
+            self._users.pop(entry["id"], None)
+        self._version += 1
+
+    def _sync(self):
+        """Pick up changes written by other processes (shared mode only)."""
+        if not self.storage.shared:
+            return
+        with self._lock:
+            changes = self.storage.poll()
+            if changes == RELOAD:
+                self.load_from_file()
+            elif changes:
+                for entry in changes:
+                    self._apply(entry)
+
+    def _persist(self, entry: dict):
+        if not self.storage.log(entry):
             self.save_to_file()
-            return True
-        return False
 
     def load_from_file(self):
-        if os.path.exists(self.filepath):
-            with open(self.filepath, "r") as f:
-                data = json.load(f)
-                self.users = [User(**user) for user in data]
-                if self.users:
-                    self.next_id = max(u.user_id for u in self.users) + 1
+        self.users = [User(**user) for user in self.storage.load("user_id")]
+        self._version += 1
+        if self.users:
+            self.next_id = max(u.user_id for u in self.users) + 1
 
     def save_to_file(self):
-        with open(self.filepath, "w") as f:
-            json.dump([user.__dict__ for user in self.users], f, indent=2)
+        with self._lock, self.storage.exclusive():
+            self.storage.write_snapshot([user.to_dict() for user in self.users])
@@ -1,28 +1,248 @@
-from datetime import datetime
+import heapq
+from datetime import datetime, timedelta
+from itertools import islice
 from typing import Any
 
-from src.models.booking import Booking
+from src.models.booking_series import BookingSeries
+from src.models.recurrence import RecurrenceRule
 from src.repositories.booking_repository import BookingRepository
 
+# How far ahead an open-ended series is checked against other series and the
+# time validators when it is created.
+SERIES_HORIZON = timedelta(days=366)
+
 
 class BookingService:
-    def __init__(self, repository: BookingRepository, validator: Any):
+    def __init__(
+        self,
+        repository: BookingRepository,
+        validator: Any,
+        time_validators=(),
+        series_repository=None,
+    ):
         self.repository = repository
         self.validator = validator
+        # TimeValidationStrategy instances applied to every booking/occurrence
+        self.time_validators = list(time_validators)
+        self.series_repository = series_repository
 
     def create_booking(self, room, user, start_time: datetime, end_time: datetime):
-        # Create a temporary booking object (not yet added to repo)
-        temp_booking = Booking(-1, room, user, start_time, end_time)
-        existing_bookings = self.repository.get_by_room(room.room_id)
+        if start_time >= end_time:
+            raise ValueError("End time must be after start time.")
+        for time_validator in self.time_validators:
+            time_validator.validate(start_time, end_time)
+
+        # Checks and writes run under the repository's single writer lock
+        # (plus its file lock in shared mode), for every room alike
+        with self.repository.exclusive():
+            if self._find_series_conflict(room.room_id, start_time, end_time):
+                raise ValueError("Time slot overlaps with a recurring booking.")
+            return self.repository.add_if_free(
+                room, user, start_time, end_time, self.validator
+            )
+
+    def create_series(
+        self,
+        room,
+        user,
+        start_time: datetime,
+        end_time: datetime,
+        rule: RecurrenceRule,
+    ) -> BookingSeries:
+        """Create a recurring booking stored as a single series record.
+
+        Occurrences are expanded lazily. Each existing booking of the room is
+        checked with an arithmetic jump into the series, so the room's
+        history is walked once and no occurrence list is built. Other series
+        and the time validators are checked occurrence by occurrence, up to
+        the rule's end or ``SERIES_HORIZON`` for open-ended rules.
+        """
+        with self.repository.exclusive():
+            if self.series_repository is None:
+                raise ValueError("Recurring bookings are not enabled.")
+            if start_time >= end_time:
+                raise ValueError("End time must be after start time.")
+
+            series = BookingSeries(-1, room, user, start_time, end_time, rule)
+            horizon = None if rule.is_bounded else start_time + SERIES_HORIZON
+            for occurrence_start, occurrence_end in series.occurrences(
+                start_time, horizon
+            ):
+                for time_validator in self.time_validators:
+                    time_validator.validate(occurrence_start, occurrence_end)
+                if self._find_series_conflict(
+                    room.room_id, occurrence_start, occurrence_end
+                ):
+                    raise ValueError(
+                        f"Occurrence at {occurrence_start} overlaps with a "
+                        "recurring booking."
+                    )
+
+            for booking in self.repository.get_room_timeline(
+                room.room_id, start_time, datetime.max
+            ):
+                if next(series.occurrences(booking.start_time, booking.end_time), None):
+                    raise ValueError(
+                        f"Series overlaps with an existing booking: {booking}"
+                    )
+
+            return self.series_repository.add(room, user, start_time, end_time, rule)
+
+    def get_series_occurrences(
+        self, room_id: int, window_start: datetime, window_end: datetime
+    ) -> list:
+        """Return ``(series, start, end)`` for every occurrence in the window."""
+        if self.series_repository is None:
+            return []
+        occurrences = [
+            (series, start, end)
+            for series in self.series_repository.get_by_room(room_id)
+            for start, end in series.occurrences(window_start, window_end)
+        ]
+        return sorted(occurrences, key=lambda occurrence: occurrence[1])
+
+    def cancel_series(self, series_id: int) -> bool:
+        if self.series_repository is None:
+            return False
+        return self.series_repository.delete(series_id)
+
+    def is_room_free(self, room_id: int, start_time, end_time) -> bool:
+        """True when no booking or series occurrence overlaps the window."""
+        return not self.repository.get_room_timeline(
+            room_id, start_time, end_time
+        ) and not self._find_series_conflict(room_id, start_time, end_time)
+
+    def find_free_slots(
+        self, room_id: int, after: datetime, duration: timedelta, count: int = 1
+    ) -> list:
+        """Return the first ``count`` free ``(start, end)`` slots of a room.
+
+        Slots are ``duration`` long, start no earlier than ``after`` and are
+        packed back to back inside each gap. Single bookings and series
+        occurrences are merged lazily in start order, so only the busy
+        intervals up to the last returned slot are visited.
+        """
+        if duration <= timedelta(0):
+            raise ValueError("Slot duration must be positive.")
+        busy = heapq.merge(
+            (
+                (booking.start_time, booking.end_time)
+                for booking in self.repository.get_room_timeline(
+                    room_id, after, datetime.max
+                )
+            ),
+            *(
+                series.occurrences(after)
+                for series in (
+                    self.series_repository.get_by_room(room_id)
+                    if self.series_repository is not None
+                    else ()
+                )
+            ),
+        )
+        return list(islice(self._free_slots(busy, after, duration), count))
+
+    @staticmethod
+    def _free_slots(busy, cursor: datetime, duration: timedelta):
+        for busy_start, busy_end in busy:
+            while busy_start - cursor >= duration:
+                yield cursor, cursor + duration
+                cursor += duration
+            cursor = max(cursor, busy_end)
+        while True:
+            yield cursor, cursor + duration
+            cursor += duration
+
+    def _find_series_conflict(self, room_id: int, start_time, end_time):
+        if self.series_repository is None:
+            return None
+        for series in self.series_repository.get_by_room(room_id):
+            if next(series.occurrences(start_time, end_time), None):
+                return series
+        return None
+
+    def create_bookings_bulk(self, requests, atomic: bool = False) -> list:
+        """Create many bookings with one validation sweep and one persist.
+
+        ``requests`` is an iterable of ``(room, user, start_time, end_time)``.
+        Each room's requests are sorted by start time and merged against the
+        room's existing bookings in a single pass, so a request conflicts
+        either with an existing booking or with an earlier request of the
+        batch. Returns one result per request, in input order::
+
+            {"status": "created" | "conflict" | "invalid" | "skipped",
+             "booking": Booking | None, "error": str | None}
+
+        With ``atomic=True`` nothing is created if any request fails; the
+        requests that would have succeeded are reported as ``skipped``.
+        """
+        requests = list(requests)
+        results = [None] * len(requests)
+        by_room = {}
+        for i, (room, _, start_time, end_time) in enumerate(requests):
+            try:
+                if start_time >= end_time:
+                    raise ValueError("End time must be after start time.")
+                for time_validator in self.time_validators:
+                    time_validator.validate(start_time, end_time)
+            except ValueError as e:
+                results[i] = self._bulk_result("invalid", error=str(e))
+            else:
+                by_room.setdefault(room.room_id, []).append(i)
+
+        # One exclusive section, so the sweep and the add see the same bookings
+        with self.repository.exclusive():
+            accepted = []
+            for room_id, indexes in by_room.items():
+                accepted.extend(self._sweep_room(room_id, indexes, requests, results))
+
+            if atomic and len(accepted) < len(requests):
+                for i in accepted:
+                    results[i] = self._bulk_result(
+                        "skipped", error="Batch rejected because of failed requests."
+                    )
+                return results
+
+            accepted.sort()
+            bookings = self.repository.add_many([requests[i] for i in accepted])
+            for i, booking in zip(accepted, bookings):
+                results[i] = self._bulk_result("created", booking=booking)
+            return results
 
-        if not self.validator.is_valid(temp_booking, existing_bookings):
-            raise ValueError("Time slot overlaps with an existing booking.")
+    def _sweep_room(self, room_id: int, indexes: list, requests, results) -> list:
+        """Merge one room's requests against its bookings; return accepted ones."""
+        indexes.sort(key=lambda i: requests[i][2])
+        timeline = self.repository.get_room_timeline(
+            room_id, requests[indexes[0]][2], max(requests[i][3] for i in indexes)
+        )
+        accepted = []
+        position = 0
+        batch_end = None
+        for i in indexes:
+            _, _, start_time, end_time = requests[i]
+            while (
+                position < len(timeline) and timeline[position].end_time <= start_time
+            ):
+                position += 1
+            if batch_end is not None and batch_end > start_time:
+                error = "Time slot overlaps with another booking in the batch."
+            elif position < len(timeline) and timeline[position].start_time < end_time:
+                error = "Time slot overlaps with an existing booking."
+            elif self._find_series_conflict(room_id, start_time, end_time):
+                error = "Time slot overlaps with a recurring booking."
+            else:
+                accepted.append(i)
+                batch_end = end_time
+                continue
+            results[i] = self._bulk_result("conflict", error=error)
+        return accepted
 
-        # Now add it for real
-        return self.repository.add(room, user, start_time, end_time)
+    @staticmethod
+    def _bulk_result(status: str, booking=None, error=None) -> dict:
+        return {"status": status, "booking": booking, "error": error}
 
-    def get_bookings_by_user(self, user_id: int):
-        return self.repository.get_by_user(user_id)
+    def get_bookings_by_user(self, user_id: int, start_time=None, end_time=None):
+        return self.repository.get_by_user(user_id, start_time, end_time)
 
     def get_bookings_by_room(self, room_id: int):
         return self.repository.get_by_room(room_id)
@@ -8,6 +8,25 @@ class RoomService:
     def create_room(self, name: str, capacity: int, location: str):
         return self.repository.add(name, capacity, location)
 
+    def find_available_rooms(
+        self,
+        min_capacity: int,
+        start_time,
+        end_time,
+        booking_service,
+        location: str = None,
+    ) -> list:
+        """Rooms with enough capacity that are free for the whole window.
+
+        Candidates come from the capacity-ordered index, smallest first, and
+        each one costs a bisect over that room's bookings.
+        """
+        return [
+            room
+            for room in self.repository.get_by_min_capacity(min_capacity, location)
+            if booking_service.is_room_free(room.room_id, start_time, end_time)
+        ]
+
     def get_all_rooms(self):
         return self.repository.get_all()
 
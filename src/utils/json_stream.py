@@ -0,0 +1,86 @@
+import json
+from datetime import datetime
+
+_WHITESPACE = " \t\n\r"
+
+
+def json_default(value):
+    """``json.dump`` hook: datetimes are written as ISO 8601 strings."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def as_datetime(value) -> datetime:
+    """Record timestamp -> datetime.
+
+    Binary snapshots already yield datetimes; JSON files and journal lines
+    hold ISO 8601 strings.
+    """
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def iter_json_array(path: str, chunk_size: int = 64 * 1024):
+    """Lazily yield the items of the top-level JSON array stored in ``path``.
+
+    The file is read ``chunk_size`` characters at a time and every item is
+    decoded as soon as it is complete, so memory stays bounded by the chunk
+    size plus the largest single item. An empty file yields nothing.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        started = False
+        while True:
+            pos = _skip_whitespace(buffer, pos)
+            if pos >= len(buffer):
+                if eof:
+                    if started:
+                        raise ValueError(f"Unterminated JSON array in {path}")
+                    return
+                buffer, pos = buffer[pos:] + f.read(chunk_size), 0
+                eof = pos >= len(buffer)
+                continue
+
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array in {path}")
+                started = True
+                pos += 1
+                continue
+            if char == "]":
+                return
+            if char == ",":
+                pos += 1
+                continue
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                end = None
+            if end is None or (end == len(buffer) and not eof):
+                # Incomplete item (or a number that may continue): read more
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    if end is None:
+                        raise ValueError(f"Truncated JSON item in {path}")
+                    eof = True
+                    continue
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            yield item
+            pos = end
+            if pos > chunk_size:
+                buffer, pos = buffer[pos:], 0
@@ -0,0 +1,17 @@
+import base64
+import json
+
+
+def encode_cursor(position) -> str:
+    """Opaque, URL-safe cursor for a JSON-serialisable ``position``."""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Inverse of ``encode_cursor``; raises ValueError for malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise ValueError("Invalid cursor.") from None
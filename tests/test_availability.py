@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.recurrence import RecurrenceRule
+from src.models.user import User
+from src.patterns.interval_overlap_strategy import IntervalOverlapStrategy
+from src.repositories.booking_repository import BookingRepository
+from src.repositories.room_repository import RoomRepository
+from src.repositories.series_repository import SeriesRepository
+from src.services.booking_service import BookingService
+from src.services.room_service import RoomService
+
+USER = User(1, "Alice", "alice@example.com")
+
+
+@pytest.fixture
+def services(tmp_path):
+    rooms = RoomService(RoomRepository(filepath=str(tmp_path / "rooms.json")))
+    bookings = BookingService(
+        BookingRepository(filepath=str(tmp_path / "bookings.json")),
+        IntervalOverlapStrategy(),
+        series_repository=SeriesRepository(filepath=str(tmp_path / "series.json")),
+    )
+    return rooms, bookings
+
+
+def at(hour, minute=0):
+    return datetime(2025, 3, 3, hour, minute)
+
+
+def test_capacity_index_orders_and_filters_rooms(services):
+    rooms, _ = services
+    big = rooms.create_room("Big", 30, "Floor 1")
+    small = rooms.create_room("Small", 4, "Floor 1")
+    medium = rooms.create_room("Medium", 12, "Floor 2")
+
+    assert rooms.repository.get_by_min_capacity(5) == [medium, big]
+    assert rooms.repository.get_by_min_capacity(5, "Floor 1") == [big]
+
+    rooms.delete_room(medium.room_id)
+    assert rooms.repository.get_by_min_capacity(0) == [small, big]
+
+
+def test_find_available_rooms(services):
+    rooms, bookings = services
+    big = rooms.create_room("Big", 30, "Floor 1")
+    medium = rooms.create_room("Medium", 12, "Floor 2")
+    other = rooms.create_room("Other", 12, "Floor 2")
+    rooms.create_room("Small", 4, "Floor 1")
+
+    bookings.create_booking(medium, USER, at(9), at(10, 30))
+    bookings.create_series(
+        other, USER, at(10), at(11), RecurrenceRule("daily", count=5)
+    )
+
+    assert rooms.find_available_rooms(10, at(10), at(11), bookings) == [big]
+    assert rooms.find_available_rooms(10, at(10, 30), at(11), bookings) == [
+        medium,
+        big,
+    ]
+    assert rooms.find_available_rooms(10, at(11), at(12), bookings, "Floor 2") == [
+        medium,
+        other,
+    ]
+
+
+def test_find_free_slots_skips_bookings_and_occurrences(services):
+    rooms, bookings = services
+    room = rooms.create_room("Room", 10, "Floor 1")
+    bookings.create_booking(room, USER, at(9), at(10))
+    bookings.create_booking(room, USER, at(11), at(12, 30))
+    bookings.create_series(room, USER, at(13), at(14), RecurrenceRule("daily", count=3))
+
+    slots = bookings.find_free_slots(room.room_id, at(9, 30), timedelta(hours=1), 3)
+
+    assert slots == [(at(10), at(11)), (at(14), at(15)), (at(15), at(16))]
+    with pytest.raises(ValueError):
+        bookings.find_free_slots(room.room_id, at(9), timedelta(0))
@@ -0,0 +1,126 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.booking import Booking
+from src.models.recurrence import RecurrenceRule
+from src.models.room import Room
+from src.models.user import User
+from src.repositories.binary_snapshot import (
+    MAGIC,
+    is_binary_snapshot,
+    iter_binary_snapshot,
+    write_binary_snapshot,
+)
+from src.repositories.booking_repository import BookingRepository
+from src.repositories.convert_snapshots import convert
+from src.repositories.partitioned_booking_repository import (
+    PartitionedBookingRepository,
+)
+from src.repositories.room_repository import RoomRepository
+from src.repositories.series_repository import SeriesRepository
+from src.repositories.user_repository import UserRepository
+
+
+def test_records_round_trip(tmp_path):
+    path = tmp_path / "records.bin"
+    records = [
+        {"id": 1, "name": "Room A", "at": datetime(2025, 1, 6, 9, 30, 0, 15)},
+        {"id": 2, "name": None, "room": {"room_id": 3, "name": "B"}},
+        {"id": 3, "name": "Room A", "at": datetime(1969, 12, 31, 23, 59)},
+        {"id": 4, "room": 7, "flag": True},
+    ]
+    with open(path, "wb") as f:
+        write_binary_snapshot(f, records)
+
+    assert is_binary_snapshot(str(path))
+    assert list(iter_binary_snapshot(str(path), chunk_records=3)) == records
+
+
+def test_newer_versions_are_rejected(tmp_path):
+    path = tmp_path / "records.bin"
+    path.write_bytes(MAGIC + (99).to_bytes(2, "little"))
+    with pytest.raises(ValueError):
+        list(iter_binary_snapshot(str(path)))
+
+
+def test_repositories_detect_the_snapshot_format(tmp_path):
+    path = str(tmp_path / "bookings.json")
+    room = Room(1, "Room A", 10, "Floor 1")
+    user = User(1, "Alice", "alice@example.com")
+    BookingRepository(path).add(
+        room, user, datetime(2025, 1, 6, 10), datetime(2025, 1, 6, 11)
+    )
+
+    # A binary repository reads the JSON file and writes binary from then on
+    binary = BookingRepository(path, binary=True)
+    binary.add(room, user, datetime(2025, 1, 6, 12), datetime(2025, 1, 6, 13))
+    assert is_binary_snapshot(path)
+
+    reloaded = BookingRepository(path)
+    assert [b.start_time.hour for b in reloaded.get_room_timeline(1)] == [10, 12]
+    assert reloaded.get_by_id(2).user.email == "alice@example.com"
+
+
+def test_convert_both_ways(tmp_path):
+    users = UserRepository(str(tmp_path / "users.json"))
+    rooms = RoomRepository(str(tmp_path / "rooms.json"))
+    alice = users.add("Alice", "alice@example.com")
+    room = rooms.add("Room A", 10, "Floor 1")
+    BookingRepository(
+        str(tmp_path / "bookings.json"), room_repository=rooms, user_repository=users
+    ).add(room, alice, datetime(2025, 1, 6, 10), datetime(2025, 1, 6, 11))
+    SeriesRepository(
+        str(tmp_path / "series.json"), room_repository=rooms, user_repository=users
+    ).add(
+        room,
+        alice,
+        datetime(2025, 1, 7, 10),
+        datetime(2025, 1, 7, 11),
+        RecurrenceRule("weekly", count=3, exceptions=[datetime(2025, 1, 14).date()]),
+    )
+    before = {p.name: json.loads(p.read_text()) for p in tmp_path.glob("*.json")}
+
+    assert len(convert(str(tmp_path), binary=True)) == 4
+    assert all(is_binary_snapshot(str(p)) for p in tmp_path.glob("*.json"))
+    convert(str(tmp_path), binary=False)
+
+    after = {p.name: json.loads(p.read_text()) for p in tmp_path.glob("*.json")}
+    assert after == before
+
+
+def test_convert_includes_monthly_shards(tmp_path):
+    users = UserRepository(str(tmp_path / "users.json"))
+    rooms = RoomRepository(str(tmp_path / "rooms.json"))
+    alice = users.add("Alice", "alice@example.com")
+    room = rooms.add("Room A", 10, "Floor 1")
+    hour = timedelta(hours=1)
+    closed = datetime(2020, 3, 2, 10)
+    upcoming = datetime.now().replace(microsecond=0) + timedelta(days=40)
+    PartitionedBookingRepository(
+        str(tmp_path / "bookings"), room_repository=rooms, user_repository=users
+    ).import_bookings(
+        [
+            Booking(1, room, alice, closed, closed + hour),
+            Booking(2, room, alice, upcoming, upcoming + hour),
+        ]
+    )
+    shards = tmp_path / "bookings"
+    before = {p.name: json.loads(p.read_text()) for p in shards.glob("*.json")}
+    assert "2020-03" in before["manifest.json"]
+
+    converted = convert(str(tmp_path), binary=True)
+    assert str(shards / "2020-03.json") in converted
+    assert str(shards / "manifest.json") in converted
+    assert all(
+        is_binary_snapshot(str(p))
+        for p in shards.glob("*.json")
+        if p.name != "manifest.json"
+    )
+    manifest = json.loads((shards / "manifest.json").read_text())
+    assert manifest == before["manifest.json"]
+
+    convert(str(tmp_path), binary=False)
+    after = {p.name: json.loads(p.read_text()) for p in shards.glob("*.json")}
+    assert after == before
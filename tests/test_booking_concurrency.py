@@ -0,0 +1,104 @@
+import multiprocessing
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.room import Room
+from src.models.user import User
+from src.patterns.interval_overlap_strategy import IntervalOverlapStrategy
+from src.repositories.booking_repository import BookingRepository
+from src.services.booking_service import BookingService
+
+
+@pytest.fixture(autouse=True)
+def fast_thread_switching():
+    # Switch threads as often as possible to surface check-then-act races
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_concurrent_bookings_never_overlap(tmp_path):
+    repo = BookingRepository(filepath=str(tmp_path / "bookings.json"), journal=True)
+    service = BookingService(repo, IntervalOverlapStrategy())
+    room = Room(1, "Room A", 10, "Floor 1")
+    other_room = Room(2, "Room B", 10, "Floor 1")
+    base = datetime(2025, 1, 1, 8)
+    barrier = threading.Barrier(16)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        user = User(seed, f"User {seed}", f"user{seed}@example.com")
+        barrier.wait()
+        for _ in range(100):
+            start = base + timedelta(minutes=15 * rng.randrange(200))
+            end = start + timedelta(minutes=15 * rng.randrange(1, 6))
+            target = room if rng.random() < 0.8 else other_room
+            try:
+                service.create_booking(target, user, start, end)
+            except ValueError:
+                pass
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    bookings = repo.get_all()
+    assert len({b.booking_id for b in bookings}) == len(bookings)
+    for room_id in (1, 2):
+        timeline = repo.get_room_timeline(room_id)
+        assert len(timeline) > 1
+        for previous, current in zip(timeline, timeline[1:]):
+            assert previous.end_time <= current.start_time
+
+    # The journal holds exactly the accepted bookings
+    reloaded = BookingRepository(filepath=str(tmp_path / "bookings.json"))
+    assert len(reloaded.get_all()) == len(bookings)
+
+
+class _SlowOverlapStrategy(IntervalOverlapStrategy):
+    """Widens the gap between the overlap check and the add."""
+
+    def is_valid(self, new_booking, existing_bookings) -> bool:
+        time.sleep(0.2)
+        return super().is_valid(new_booking, existing_bookings)
+
+
+def _book_same_slot(path, barrier, results):
+    repo = BookingRepository(filepath=path, journal=True, shared=True)
+    service = BookingService(repo, _SlowOverlapStrategy())
+    room = Room(1, "Room A", 10, "Floor 1")
+    user = User(1, "Alice", "alice@example.com")
+    barrier.wait()
+    try:
+        service.create_booking(
+            room, user, datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 11)
+        )
+        results.put("created")
+    except ValueError:
+        results.put("conflict")
+
+
+def test_processes_cannot_book_the_same_slot(tmp_path):
+    path = str(tmp_path / "bookings.json")
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(2)
+    results = context.Queue()
+    workers = [
+        context.Process(target=_book_same_slot, args=(path, barrier, results))
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert sorted(results.get(timeout=5) for _ in workers) == ["conflict", "created"]
+    assert len(BookingRepository(filepath=path, journal=True).get_all()) == 1
@@ -0,0 +1,138 @@
+import json
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.controllers.health_controller import create_app
+from src.repositories.booking_repository import BookingRepository
+from src.repositories.room_repository import RoomRepository
+from src.repositories.user_repository import UserRepository
+
+
+@pytest.fixture
+def repositories(tmp_path):
+    users = UserRepository(str(tmp_path / "users.json"))
+    rooms = RoomRepository(str(tmp_path / "rooms.json"))
+    bookings = BookingRepository(
+        str(tmp_path / "bookings.json"), room_repository=rooms, user_repository=users
+    )
+    alice = users.add("Alice", "alice@example.com")
+    bob = users.add("Bob", "bob@example.com")
+    small = rooms.add("Room A", 4, "Floor 1")
+    large = rooms.add("Room B", 20, "Floor 2")
+    for day in (8, 6, 7):
+        bookings.add(
+            small, alice, datetime(2025, 1, day, 9), datetime(2025, 1, day, 10)
+        )
+    bookings.add(large, bob, datetime(2025, 1, 6, 9), datetime(2025, 1, 6, 11))
+    return users, rooms, bookings
+
+
+@pytest.fixture
+def client(repositories):
+    app = create_app(repositories)
+    app.config["TESTING"] = True
+    with (
+        app.test_client() as client,
+        patch(
+            "src.middleware.auth_middleware.token_cache.validate",
+            return_value=True,
+        ),
+    ):
+        yield client
+
+
+HEADERS = {"Authorization": "Bearer test-token-123"}
+
+
+def _get(client, url, **headers):
+    return client.get(url, headers={**HEADERS, **headers})
+
+
+def test_endpoints_require_a_token(repositories):
+    app = create_app(repositories)
+    with app.test_client() as client:
+        assert client.get("/bookings").status_code == 401
+
+
+def test_bookings_are_paginated_by_start_time(client):
+    seen = []
+    url = "/bookings?limit=2&fields=booking_id"
+    while url:
+        data = json.loads(_get(client, url).data)
+        seen.extend(item["booking_id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        url = f"/bookings?limit=2&fields=booking_id&cursor={cursor}" if cursor else None
+    assert seen == [2, 4, 3, 1]
+
+
+def test_bookings_filters(client):
+    data = json.loads(
+        _get(client, "/bookings?room_id=1&start=2025-01-06T12:00&end=2025-01-08").data
+    )
+    assert [b["booking_id"] for b in data["items"]] == [3]
+    assert data["items"][0] == {
+        "booking_id": 3,
+        "room_id": 1,
+        "user_id": 1,
+        "start_time": "2025-01-07T09:00:00",
+        "end_time": "2025-01-07T10:00:00",
+    }
+    data = json.loads(_get(client, "/bookings?user_id=2").data)
+    assert [b["booking_id"] for b in data["items"]] == [4]
+
+
+@pytest.fixture
+def argentina_time(monkeypatch):
+    # Fixed UTC-3 without DST, so the expected local times never move
+    monkeypatch.setenv("TZ", "ART3")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_booking_window_offsets_are_converted_to_local_time(client, argentina_time):
+    # 12:00Z is 09:00 local: booking 2 (January 6th, 09-10) overlaps it
+    for start in ("2025-01-06T12:00:00Z", "2025-01-06T10:00:00-02:00"):
+        response = _get(client, f"/bookings?room_id=1&start={start}&end=2025-01-08")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [b["booking_id"] for b in data["items"]] == [2, 3]
+    response = _get(client, "/bookings?room_id=1&start=2025-01-06T13:00:00%2B00:00")
+    assert [b["booking_id"] for b in json.loads(response.data)["items"]] == [3, 1]
+
+
+def test_users_and_rooms(client):
+    data = json.loads(_get(client, "/users?fields=name&limit=1").data)
+    assert data["items"] == [{"name": "Alice"}]
+    data = json.loads(_get(client, f"/users?cursor={data['next_cursor']}").data)
+    assert [u["user_id"] for u in data["items"]] == [2]
+    assert data["next_cursor"] is None
+
+    data = json.loads(_get(client, "/rooms?min_capacity=10").data)
+    assert [r["name"] for r in data["items"]] == ["Room B"]
+
+
+@pytest.mark.parametrize(
+    "url", ["/bookings?fields=secret", "/bookings?limit=0", "/users?cursor=abc"]
+)
+def test_invalid_queries_are_rejected(client, url):
+    assert _get(client, url).status_code == 400
+
+
+def test_conditional_get_until_the_repository_changes(client, repositories):
+    users, rooms, bookings = repositories
+    first = _get(client, "/bookings")
+    etag = first.headers["ETag"]
+
+    again = _get(client, "/bookings", **{"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+
+    bookings.delete(1)
+    changed = _get(client, "/bookings", **{"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
@@ -40,3 +40,37 @@ def test_filter_bookings_by_date():
 
     assert len(filtered) == 1
     assert filtered[0].start_time.hour == 10
+
+
+def test_lookup_indexes_follow_add_and_delete(tmp_path):
+    filepath = str(tmp_path / "bookings.json")
+    repo = BookingRepository(filepath=filepath)
+    room_a = Room(1, "Room A", 10, "Floor 1")
+    room_b = Room(2, "Room B", 10, "Floor 1")
+    alice = User(1, "Alice", "alice@example.com")
+    bob = User(2, "Bob", "bob@example.com")
+
+    first = repo.add(
+        room_a, alice, datetime(2025, 1, 1, 10, 0), datetime(2025, 1, 1, 11, 0)
+    )
+    second = repo.add(
+        room_b, alice, datetime(2025, 1, 1, 10, 0), datetime(2025, 1, 1, 11, 0)
+    )
+    third = repo.add(
+        room_a, bob, datetime(2025, 1, 1, 12, 0), datetime(2025, 1, 1, 13, 0)
+    )
+
+    assert repo.get_by_id(second.booking_id) is second
+    assert repo.get_by_user(alice.user_id) == [first, second]
+    assert repo.get_by_room(room_a.room_id) == [first, third]
+
+    repo.delete(first.booking_id)
+    assert repo.get_by_user(alice.user_id) == [second]
+    assert repo.get_by_room(room_a.room_id) == [third]
+    assert repo.get_all() == [second, third]
+
+    # Reloading from disk rebuilds the same indexes
+    reloaded = BookingRepository(filepath=filepath)
+    assert [b.booking_id for b in reloaded.get_by_user(alice.user_id)] == [2]
+    assert [b.booking_id for b in reloaded.get_by_room(room_a.room_id)] == [3]
+    assert reloaded.next_id == 4
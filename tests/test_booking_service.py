@@ -1,7 +1,10 @@
 from datetime import datetime
 
+import pytest
+
 from src.models.room import Room
 from src.models.user import User
+from src.patterns.interval_overlap_strategy import IntervalOverlapStrategy
 from src.patterns.no_overlap_strategy import NoOverlapStrategy
 from src.repositories.booking_repository import BookingRepository
 from src.services.booking_service import BookingService
@@ -29,3 +32,126 @@ def test_overlapping_booking():
         assert False, "Expected overlap error"
     except ValueError as e:
         assert "overlaps" in str(e).lower()
+
+
+def test_interval_strategy_checks_neighbouring_bookings(tmp_path):
+    repo = BookingRepository(filepath=str(tmp_path / "bookings.json"))
+
+    room = Room(1, "Room A", 10, "Floor 1")
+    other_room = Room(2, "Room B", 10, "Floor 1")
+    user = User(1, "Alice", "alice@example.com")
+
+    service = BookingService(repo, IntervalOverlapStrategy())
+
+    # Inserted out of order to exercise the sorted index
+    service.create_booking(
+        room, user, datetime(2025, 1, 1, 14, 0), datetime(2025, 1, 1, 15, 0)
+    )
+    service.create_booking(
+        room, user, datetime(2025, 1, 1, 10, 0), datetime(2025, 1, 1, 11, 0)
+    )
+    service.create_booking(
+        other_room, user, datetime(2025, 1, 1, 11, 0), datetime(2025, 1, 1, 14, 0)
+    )
+
+    # Back-to-back bookings are allowed
+    service.create_booking(
+        room, user, datetime(2025, 1, 1, 11, 0), datetime(2025, 1, 1, 14, 0)
+    )
+    starts = [b.start_time.hour for b in repo.get_room_timeline(room.room_id)]
+    assert starts == [10, 11, 14]
+
+    for start, end in [(9, 11), (10, 15), (13, 16), (14, 15)]:
+        with pytest.raises(ValueError):
+            service.create_booking(
+                room,
+                user,
+                datetime(2025, 1, 1, start, 0),
+                datetime(2025, 1, 1, end, 0),
+            )
+
+    repo.delete(1)
+    service.create_booking(
+        room, user, datetime(2025, 1, 1, 14, 30), datetime(2025, 1, 1, 16, 0)
+    )
+    assert [b.booking_id for b in repo.get_by_room(room.room_id)] == [2, 4, 5]
+
+
+def test_window_lookup_finds_bookings_containing_later_ones(tmp_path):
+    repo = BookingRepository(filepath=str(tmp_path / "bookings.json"))
+    room = Room(1, "Room A", 10, "Floor 1")
+    user = User(1, "Alice", "alice@example.com")
+    # add() does not check overlaps, so a timeline may hold nested bookings
+    repo.add(room, user, datetime(2025, 1, 1, 9), datetime(2025, 1, 1, 17))
+    repo.add(room, user, datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 11))
+    service = BookingService(repo, IntervalOverlapStrategy())
+
+    noon, one = datetime(2025, 1, 1, 12), datetime(2025, 1, 1, 13)
+    assert [b.booking_id for b in repo.get_room_timeline(1, noon, one)] == [1]
+    assert [b.booking_id for b in repo.find(room_id=1, start_time=noon)] == [1]
+    with pytest.raises(ValueError, match="overlaps"):
+        service.create_booking(room, user, noon, one)
+    with pytest.raises(ValueError, match="after start"):
+        service.create_booking(room, user, one, noon)
+    assert len(repo.get_all()) == 2
+
+
+def test_create_bookings_bulk_reports_each_request(tmp_path):
+    filepath = str(tmp_path / "bookings.json")
+    repo = BookingRepository(filepath=filepath)
+
+    room_a = Room(1, "Room A", 10, "Floor 1")
+    room_b = Room(2, "Room B", 10, "Floor 1")
+    user = User(1, "Alice", "alice@example.com")
+    service = BookingService(repo, IntervalOverlapStrategy())
+    service.create_booking(
+        room_a, user, datetime(2025, 1, 1, 10, 0), datetime(2025, 1, 1, 11, 0)
+    )
+
+    def at(hour, minute=0):
+        return datetime(2025, 1, 1, hour, minute)
+
+    results = service.create_bookings_bulk(
+        [
+            (room_a, user, at(12), at(13)),
+            (room_a, user, at(10, 30), at(11, 30)),  # existing booking
+            (room_b, user, at(10), at(11)),
+            (room_a, user, at(11), at(12)),
+            (room_a, user, at(12, 30), at(14)),  # earlier item of the batch
+            (room_a, user, at(15), at(14)),
+        ]
+    )
+
+    assert [r["status"] for r in results] == [
+        "created",
+        "conflict",
+        "created",
+        "created",
+        "conflict",
+        "invalid",
+    ]
+    assert "batch" in results[4]["error"]
+    assert [b.start_time.hour for b in repo.get_room_timeline(1)] == [10, 11, 12]
+
+    reloaded = BookingRepository(filepath=filepath)
+    assert len(reloaded.get_all()) == 4
+
+
+def test_create_bookings_bulk_atomic_creates_nothing_on_conflict(tmp_path):
+    filepath = str(tmp_path / "bookings.json")
+    repo = BookingRepository(filepath=filepath)
+
+    room = Room(1, "Room A", 10, "Floor 1")
+    user = User(1, "Alice", "alice@example.com")
+    service = BookingService(repo, IntervalOverlapStrategy())
+
+    results = service.create_bookings_bulk(
+        [
+            (room, user, datetime(2025, 1, 1, 9), datetime(2025, 1, 1, 10)),
+            (room, user, datetime(2025, 1, 1, 9), datetime(2025, 1, 1, 11)),
+        ],
+        atomic=True,
+    )
+
+    assert [r["status"] for r in results] == ["skipped", "conflict"]
+    assert repo.get_all() == []
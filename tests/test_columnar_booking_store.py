@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from benchmarks.columnar_booking_store import ColumnarBookingStore
+from src.models.booking import Booking
+from src.models.room import Room
+from src.models.user import User
+
+
+def test_models_use_slots():
+    room = Room(1, "Room A", 10, "Floor 1")
+    assert not hasattr(room, "__dict__")
+    assert room.to_dict() == {
+        "room_id": 1,
+        "name": "Room A",
+        "capacity": 10,
+        "location": "Floor 1",
+    }
+    with pytest.raises(AttributeError):
+        room.color = "blue"
+
+
+def test_columnar_store_round_trip():
+    room = Room(1, "Room A", 10, "Floor 1")
+    user = User(7, "Alice", "alice@example.com")
+    store = ColumnarBookingStore({1: room}.get, {7: user}.get)
+
+    for booking_id in (3, 1, 2):
+        store.add(
+            Booking(
+                booking_id,
+                room,
+                user,
+                datetime(2025, 1, booking_id, 10, 0, 0, 250),
+                datetime(2025, 1, booking_id, 11, 0),
+            )
+        )
+
+    assert len(store) == 3
+    assert [b.booking_id for b in store] == [1, 2, 3]
+    booking = store.get(2)
+    assert booking.room is room and booking.user is user
+    assert booking.start_time == datetime(2025, 1, 2, 10, 0, 0, 250)
+    assert [b.booking_id for b in store.get_by_room(1)] == [1, 2, 3]
+
+    with pytest.raises(ValueError, match="already exists"):
+        store.add(booking)
+    assert len(store) == 3
+
+    assert store.delete(2) is True
+    assert store.delete(2) is False
+    assert store.get(2) is None
+    assert store.nbytes() >= 2 * 5 * 8
@@ -0,0 +1,250 @@
+import json
+import multiprocessing
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.room import Room
+from src.models.user import User
+from src.repositories.booking_repository import BookingRepository
+from src.repositories.room_repository import RoomRepository
+from src.repositories.user_repository import UserRepository
+from src.utils.json_stream import iter_json_array
+
+
+def test_journal_mode_appends_instead_of_rewriting(tmp_path):
+    path = tmp_path / "rooms.json"
+    repo = RoomRepository(filepath=str(path), journal=True)
+
+    repo.add("Room A", 10, "Floor 1")
+    repo.add("Room B", 20, "Floor 2")
+    repo.delete(1)
+
+    assert not path.exists()
+    lines = (tmp_path / "rooms.json.journal").read_text().splitlines()
+    assert [json.loads(line)["op"] for line in lines] == ["add", "add", "delete"]
+
+    reloaded = RoomRepository(filepath=str(path), journal=True)
+    assert [r.name for r in reloaded.get_all()] == ["Room B"]
+    assert reloaded.next_id == 3
+
+
+def test_journal_is_compacted_into_snapshot(tmp_path):
+    path = tmp_path / "bookings.json"
+    repo = BookingRepository(filepath=str(path), journal=True, compact_every=3)
+    room = Room(1, "Room A", 10, "Floor 1")
+    user = User(1, "Alice", "alice@example.com")
+
+    for day in range(1, 5):
+        repo.add(room, user, datetime(2025, 1, day, 10), datetime(2025, 1, day, 11))
+
+    # The third mutation triggered a snapshot, the fourth went to the journal
+    assert len(json.loads(path.read_text())) == 3
+    assert len((tmp_path / "bookings.json.journal").read_text().splitlines()) == 1
+
+    reloaded = BookingRepository(filepath=str(path), journal=True, compact_every=3)
+    assert [b.booking_id for b in reloaded.get_by_room(1)] == [1, 2, 3, 4]
+
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    path = tmp_path / "rooms.json"
+    repo = RoomRepository(filepath=str(path), journal=True)
+    repo.add("Room A", 10, "Floor 1")
+    with open(tmp_path / "rooms.json.journal", "a") as f:
+        f.write('{"op":"add","record":{"room_id":2,')
+
+    reloaded = RoomRepository(filepath=str(path), journal=True)
+    assert [r.room_id for r in reloaded.get_all()] == [1]
+    assert not (tmp_path / "rooms.json.journal").exists()
+
+    reloaded.add("Room C", 5, "Floor 3")
+    assert len(RoomRepository(filepath=str(path), journal=True).get_all()) == 2
+
+
+def test_bookings_reference_rooms_and_users_by_id(tmp_path):
+    rooms = RoomRepository(filepath=str(tmp_path / "rooms.json"))
+    users = UserRepository(filepath=str(tmp_path / "users.json"))
+    path = tmp_path / "bookings.json"
+    repo = BookingRepository(
+        filepath=str(path), room_repository=rooms, user_repository=users
+    )
+    room = rooms.add("Room A", 10, "Floor 1")
+    user = users.add("Alice", "alice@example.com")
+    for day in (1, 2):
+        repo.add(room, user, datetime(2025, 1, day, 10), datetime(2025, 1, day, 11))
+
+    record = json.loads(path.read_text())[0]
+    assert record["room_id"] == room.room_id and "room" not in record
+    assert record["user_id"] == user.user_id and "user" not in record
+
+    reloaded = BookingRepository(
+        filepath=str(path), room_repository=rooms, user_repository=users
+    )
+    first, second = reloaded.get_all()
+    assert first.room is room and second.room is room
+    assert first.user is user and second.user is user
+
+
+def test_bookings_of_a_deleted_room_still_load(tmp_path):
+    rooms = RoomRepository(filepath=str(tmp_path / "rooms.json"))
+    users = UserRepository(filepath=str(tmp_path / "users.json"))
+    path = tmp_path / "bookings.json"
+    repo = BookingRepository(
+        filepath=str(path), room_repository=rooms, user_repository=users
+    )
+    room = rooms.add("Room A", 10, "Floor 1")
+    user = users.add("Alice", "alice@example.com")
+    repo.add(room, user, datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 11))
+    rooms.delete(room.room_id)
+
+    with pytest.warns(UserWarning, match="room_id 1"):
+        reloaded = BookingRepository(
+            filepath=str(path), room_repository=rooms, user_repository=users
+        )
+    (booking,) = reloaded.get_all()
+    assert booking.room.room_id == room.room_id
+    assert booking.user is user
+
+
+def test_embedded_format_is_interned_and_migrated(tmp_path):
+    path = tmp_path / "bookings.json"
+    room = {"room_id": 2, "name": "Cloud", "capacity": 30, "location": "1st"}
+    user = {"user_id": 1, "name": "Carlos", "email": "c@example.com"}
+    path.write_text(
+        json.dumps(
+            [
+                {
+                    "booking_id": i,
+                    "room": room,
+                    "user": user,
+                    "start_time": f"2025-07-1{i}T10:00:00",
+                    "end_time": f"2025-07-1{i}T11:00:00",
+                }
+                for i in (1, 2)
+            ]
+        )
+    )
+
+    legacy = BookingRepository(filepath=str(path))
+    first, second = legacy.get_all()
+    assert first.room is second.room
+    assert first.user is second.user
+
+    rooms = RoomRepository(filepath=str(tmp_path / "rooms.json"))
+    rooms.rooms = [first.room]
+    users = UserRepository(filepath=str(tmp_path / "users.json"))
+    repo = BookingRepository(
+        filepath=str(path), room_repository=rooms, user_repository=users
+    )
+    repo.save_to_file()
+
+    # Room is known to the repository, the user is not and stays embedded
+    record = json.loads(path.read_text())[0]
+    assert record["room_id"] == 2 and "room" not in record
+    assert record["user"] == user
+
+
+def test_iter_json_array_streams_in_small_chunks(tmp_path):
+    path = tmp_path / "items.json"
+    items = [{"id": i, "name": "x" * (i % 7)} for i in range(50)] + [42]
+    path.write_text(json.dumps(items, indent=2))
+
+    assert list(iter_json_array(str(path), chunk_size=5)) == items
+
+    path.write_text('[{"id": 1}, {"id":')
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(path), chunk_size=5))
+
+
+def test_active_only_loads_history_on_demand(tmp_path):
+    path = tmp_path / "bookings.json"
+    repo = BookingRepository(filepath=str(path))
+    room = Room(1, "Room A", 10, "Floor 1")
+    user = User(1, "Alice", "alice@example.com")
+    now = datetime.now()
+    past = repo.add(room, user, now - timedelta(days=2), now - timedelta(days=1))
+    future = repo.add(room, user, now + timedelta(days=1), now + timedelta(days=2))
+
+    active = BookingRepository(filepath=str(path), active_only=True)
+    assert list(active._bookings) == [future.booking_id]
+    assert active.get_room_timeline(1, future.start_time, future.end_time)
+    assert active.next_id == 3
+
+    # A history query pulls the past bookings in
+    assert [b.booking_id for b in active.get_by_user(1)] == [
+        past.booking_id,
+        future.booking_id,
+    ]
+
+    # Rewriting the snapshot never drops unloaded history
+    active = BookingRepository(filepath=str(path), active_only=True)
+    active.add(room, user, now + timedelta(days=3), now + timedelta(days=4))
+    assert len(json.loads(path.read_text())) == 3
+
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_shared_repositories_see_each_others_writes(tmp_path, journal):
+    path = str(tmp_path / "rooms.json")
+    first = RoomRepository(filepath=path, journal=journal, shared=True)
+    second = RoomRepository(filepath=path, journal=journal, shared=True)
+
+    first.add("Room A", 10, "Floor 1")
+    # The second instance catches up before allocating an id
+    assert second.add("Room B", 20, "Floor 2").room_id == 2
+    assert [r.name for r in first.get_all()] == ["Room A", "Room B"]
+    assert [r.room_id for r in first.get_by_min_capacity(15)] == [2]
+
+    second.delete(1)
+    assert first.get_by_id(1) is None
+
+
+def test_shared_bookings_reload_after_compaction(tmp_path):
+    path = str(tmp_path / "bookings.json")
+    room = Room(1, "Room A", 10, "Floor 1")
+    user = User(1, "Alice", "alice@example.com")
+    first = BookingRepository(filepath=path, journal=True, compact_every=2, shared=True)
+    second = BookingRepository(
+        filepath=path, journal=True, compact_every=2, shared=True
+    )
+
+    for day in range(1, 4):
+        first.add(room, user, datetime(2025, 1, day, 10), datetime(2025, 1, day, 11))
+
+    assert [b.booking_id for b in second.get_room_timeline(1)] == [1, 2, 3]
+    assert (
+        second.add(
+            room, user, datetime(2025, 1, 9, 10), datetime(2025, 1, 9, 11)
+        ).booking_id
+        == 4
+    )
+
+
+def _add_rooms(path, count):
+    repo = RoomRepository(filepath=path, journal=True, compact_every=7, shared=True)
+    for i in range(count):
+        repo.add(f"Room {i}", 10, "Floor 1")
+
+
+def test_concurrent_processes_do_not_lose_writes(tmp_path):
+    path = str(tmp_path / "rooms.json")
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_add_rooms, args=(path, 25)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    rooms = RoomRepository(filepath=path, journal=True).get_all()
+    assert sorted(r.room_id for r in rooms) == list(range(1, 101))
+
+
+def test_snapshot_is_replaced_atomically(tmp_path):
+    path = tmp_path / "rooms.json"
+    repo = RoomRepository(filepath=str(path))
+    repo.add("Room A", 10, "Floor 1")
+    inode = path.stat().st_ino
+
+    repo.add("Room B", 20, "Floor 2")
+    # A new file was renamed into place; no temp files are left behind
+    assert path.stat().st_ino != inode
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["rooms.json"]
@@ -0,0 +1,221 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import redis
+
+from src.database.memory_redis import MemoryRedis
+from src.database.redis_client import RedisClient
+from src.middleware.token_cache import TokenCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sorted_set_ranges_by_score_and_rank():
+    db = MemoryRedis()
+    db.zadd("z", {"a": 1, "b": 2, "c": 2, "d": 3})
+    db.zadd("z", {"a": 4})
+
+    assert db.zrange("z", 0, -1) == ["b", "c", "d", "a"]
+    assert db.zrevrange("z", 0, 1) == ["a", "d"]
+    assert db.zrangebyscore("z", 2, 3) == ["b", "c", "d"]
+    assert db.zrangebyscore("z", "(2", "+inf") == ["d", "a"]
+    assert db.zrevrangebyscore("z", "+inf", "-inf", start=1, num=2) == ["d", "c"]
+    assert db.zrevrangebyscore("z", 2, 2, withscores=True) == [("c", 2.0), ("b", 2.0)]
+
+    assert db.zremrangebyrank("z", 0, -3) == 2
+    assert db.zrange("z", 0, -1) == ["d", "a"]
+    assert db.zremrangebyscore("z", "-inf", 3) == 1
+    assert db.zcard("z") == 1
+
+
+def test_sorted_set_matches_a_sorted_list_under_random_operations():
+    rng = random.Random(7)
+    db = MemoryRedis()
+    reference = {}
+    for _ in range(3000):
+        operation = rng.random()
+        if operation < 0.6:
+            member, score = f"m{rng.randrange(300)}", rng.randrange(100)
+            db.zadd("z", {member: score})
+            reference[member] = float(score)
+        elif operation < 0.8:
+            low = rng.randrange(100)
+            high = low + rng.randrange(10)
+            db.zremrangebyscore("z", low, high)
+            reference = {m: v for m, v in reference.items() if not low <= v <= high}
+        else:
+            start, end = rng.randrange(-20, 20), rng.randrange(-20, 20)
+            removed = db.zrange("z", start, end)
+            db.zremrangebyrank("z", start, end)
+            for member in removed:
+                del reference[member]
+        expected = [m for _, m in sorted((v, m) for m, v in reference.items())]
+        assert db.zcard("z") == len(expected)
+        assert db.zrange("z", 0, -1) == expected
+    assert db.zrangebyscore("z", 10, "(20") == [
+        m for v, m in sorted((v, m) for m, v in reference.items()) if 10 <= v < 20
+    ]
+
+
+def test_lists_behave_like_lpush_lrange_ltrim():
+    db = MemoryRedis()
+    db.lpush("l", "a", "b")
+    db.lpush("l", "c")
+
+    assert db.lrange("l", 0, -1) == ["c", "b", "a"]
+    assert db.lrange("l", 1, 5) == ["b", "a"]
+    db.ltrim("l", 0, 1)
+    assert db.lrange("l", 0, -1) == ["c", "b"]
+    assert db.llen("l") == 2
+
+
+def test_keys_expire_on_time():
+    clock = FakeClock()
+    db = MemoryRedis(clock=clock)
+    db.set("short", "1", ex=10)
+    db.set("long", "1")
+    db.expireat("long", clock.now + 100)
+    db.set("forever", "1")
+
+    assert db.pttl("short") == 10_000
+    assert db.pttl("forever") == -1
+    clock.now += 10
+    assert db.pttl("short") == -2
+    assert db.mget(["short", "long"]) == [None, "1"]
+    clock.now += 90
+    assert db.exists("long", "forever") == 1
+
+
+def test_wrong_type_and_unknown_scripts_raise():
+    db = MemoryRedis()
+    db.set("s", "1")
+    with pytest.raises(redis.ResponseError):
+        db.lpush("s", "x")
+    with pytest.raises(redis.ResponseError):
+        db.eval("return 1", 0)
+
+
+def test_request_log_round_trip_without_a_server():
+    client = RedisClient(backend=MemoryRedis())
+    client.max_entries, client.max_age, client.daily_keys = 3, 3600, False
+    now = datetime.now(timezone.utc)
+    records = []
+    for i in range(5):
+        record = RedisClient.build_request(
+            "/ping" if i % 2 else "/health", f"10.0.0.{i}", None, {"status_code": 200}
+        )
+        record["timestamp"] = (now - timedelta(seconds=5 - i)).isoformat()
+        records.append(record)
+
+    assert client.save_requests(records) == 5
+
+    # /health got three requests, at the cap; nothing trimmed yet
+    assert [r["ip_address"] for r in client.get_requests_by_endpoint("/health")] == [
+        "10.0.0.4",
+        "10.0.0.2",
+        "10.0.0.0",
+    ]
+    assert [r["ip_address"] for r in client.get_all_requests(limit=2)] == [
+        "10.0.0.4",
+        "10.0.0.3",
+    ]
+    page, after = client.get_requests_page(limit=4)
+    assert [r["ip_address"] for r in page] == [f"10.0.0.{i}" for i in (4, 3, 2, 1)]
+    page, after = client.get_requests_page(after=after, limit=4)
+    assert [r["ip_address"] for r in page] == ["10.0.0.0"] and after is None
+
+    stats = client.get_stats()
+    assert stats["endpoints"] == {"/health": 3, "/ping": 2}
+    assert client.get_request_stats(minutes=2)["unique_clients"] == 5
+    summary = client.get_request_summary(now - timedelta(minutes=1), now, "minute")
+    assert sum(bucket["requests"] for bucket in summary["buckets"]) == 5
+
+    # A fourth /health request trims the oldest one, record included
+    extra = RedisClient.build_request("/health", "10.0.0.9")
+    client.save_requests([extra])
+    assert client.client.zcard("requests:/health") == 3
+    assert len(list(client.client.scan_iter(match="request:*"))) == 5
+
+    assert client.clear_all_requests()
+    assert client.client.dbsize() == 0
+
+
+def test_expiry_heap_stays_bounded_under_rewritten_deadlines():
+    clock = FakeClock()
+    db = MemoryRedis(clock=clock)
+    db.set("k", "1")
+    for i in range(1000):
+        db.expire("k", 60 + i)
+    assert len(db._deadlines) <= 2 * len(db._expires) + 16
+
+    client = RedisClient(backend=db)
+    client.max_entries, client.max_age, client.daily_keys = 100, 3600, False
+    for _ in range(50):
+        clock.now += 1
+        client.save_requests(
+            [RedisClient.build_request("/ping", "10.0.0.1") for _ in range(20)]
+        )
+    assert len(db._deadlines) <= 2 * len(db._expires) + 16
+
+
+def test_pagination_finds_endpoints_logged_before_the_counters():
+    db = MemoryRedis()
+    client = RedisClient(backend=db)
+    client.max_entries, client.max_age, client.daily_keys = 0, 0, False
+    # Old layout: a sorted set and its record, no counters or endpoint set
+    now = datetime.now(timezone.utc).timestamp()
+    db.zadd("requests:/legacy", {"old": now - 60})
+    db.set("request:old", '{"endpoint": "/legacy"}')
+    client.save_requests([RedisClient.build_request("/ping", "10.0.0.1")])
+
+    page, _ = client.get_requests_page(limit=10)
+    assert [r["endpoint"] for r in page] == ["/ping", "/legacy"]
+    assert db.smembers("request_endpoints") == {"", "/legacy", "/ping"}
+
+
+def test_stale_backlog_is_trimmed_a_batch_per_write():
+    db = MemoryRedis()
+    client = RedisClient(backend=db)
+    client.max_entries, client.max_age, client.daily_keys = 0, 3600, False
+    client.trim_batch = 10
+    # A backlog written before retention existed: 25 ids older than max_age
+    old = datetime.now(timezone.utc).timestamp() - 7200
+    db.zadd("requests:/health", {f"old{i}": old + i for i in range(25)})
+    for i in range(25):
+        db.set(f"request:old{i}", "{}")
+
+    # Each write adds one id and trims at most ten old ones
+    for size in (16, 7, 3):
+        client.save_requests([RedisClient.build_request("/health", "10.0.0.1")])
+        assert db.zcard("requests:/health") == size
+    assert db.zrangebyscore("requests:/health", "-inf", old + 100) == []
+    assert db.exists(*(f"request:old{i}" for i in range(25))) == 0
+
+
+def test_tokens_and_invalidations_without_a_server():
+    client = RedisClient(backend=MemoryRedis())
+    cache = TokenCache(client)
+
+    assert not cache.validate("abc")
+    assert client.save_token("abc", 60)
+    assert 0 < client.token_ttl("abc") <= 60_000
+    assert cache._subscribed.wait(2)
+
+    # The negative entry was dropped by the invalidation save_token published
+    deadline = datetime.now() + timedelta(seconds=2)
+    while not cache.validate("abc") and datetime.now() < deadline:
+        pass
+    assert cache.validate("abc")
+
+    assert client.delete_token("abc")
+    while cache.validate("abc") and datetime.now() < deadline:
+        pass
+    assert not cache.validate("abc")
+    assert not client.validate_token("abc")
@@ -0,0 +1,82 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.booking import Booking
+from src.models.room import Room
+from src.models.user import User
+from src.repositories.partitioned_booking_repository import (
+    PartitionedBookingRepository,
+    month_of,
+)
+
+
+def _months_ago(months: int) -> datetime:
+    first = datetime.now().replace(day=1, hour=10, minute=0, second=0, microsecond=0)
+    for _ in range(months):
+        first = (first - timedelta(days=1)).replace(day=1)
+    return first
+
+
+@pytest.fixture
+def shards(tmp_path):
+    room = Room(1, "Room A", 10, "Floor 1")
+    alice = User(1, "Alice", "alice@example.com")
+    bob = User(2, "Bob", "bob@example.com")
+    old, recent = _months_ago(3), _months_ago(1)
+    future = datetime.now().replace(microsecond=0) + timedelta(days=40)
+    hour = timedelta(hours=1)
+    repo = PartitionedBookingRepository(str(tmp_path))
+    repo.import_bookings(
+        [
+            Booking(1, room, alice, old, old + hour),
+            Booking(2, room, bob, recent, recent + hour),
+            Booking(3, room, alice, future, future + hour),
+        ]
+    )
+    return tmp_path, room, alice, old, recent, future
+
+
+def test_only_open_months_are_loaded_at_startup(shards):
+    directory, room, alice, old, recent, future = shards
+    repo = PartitionedBookingRepository(str(directory))
+
+    assert list(repo._bookings) == [3]
+    assert repo.next_id == 4
+    assert sorted(repo._closed) == [month_of(old), month_of(recent)]
+
+    # Overlap checks for upcoming slots never open closed shards
+    assert repo.get_room_timeline(1, future, future + timedelta(hours=2))
+    assert repo._loaded == {month_of(future)}
+
+
+def test_history_queries_load_only_the_months_they_need(shards):
+    directory, room, alice, old, recent, future = shards
+    repo = PartitionedBookingRepository(str(directory))
+
+    window = repo.get_by_user(2, recent - timedelta(days=1), recent + timedelta(days=1))
+    assert [b.booking_id for b in window] == [2]
+    assert month_of(old) not in repo._loaded
+
+    assert repo.get_by_id(1).start_time == old
+    assert [b.booking_id for b in repo.get_by_user(alice.user_id)] == [1, 3]
+
+
+def test_closed_months_are_never_rewritten(shards):
+    directory, room, alice, old, recent, future = shards
+    repo = PartitionedBookingRepository(str(directory))
+    closed = os.path.join(directory, f"{month_of(recent)}.json")
+    before = os.stat(closed).st_mtime_ns
+
+    with pytest.raises(ValueError):
+        repo.add(room, alice, recent + timedelta(days=1), recent + timedelta(days=2))
+    assert repo.delete(2) is False
+    assert repo.get_by_id(2) is not None
+    repo.add(room, alice, future + timedelta(days=1), future + timedelta(days=2))
+    repo.get_all()
+    repo.save_to_file()
+
+    assert os.stat(closed).st_mtime_ns == before
+    reloaded = PartitionedBookingRepository(str(directory))
+    assert [b.booking_id for b in reloaded.get_all()] == [1, 2, 3, 4]
@@ -0,0 +1,162 @@
+import json
+from datetime import date, datetime
+
+import pytest
+
+from src.models.booking_series import BookingSeries
+from src.models.recurrence import RecurrenceRule
+from src.models.room import Room
+from src.models.user import User
+from src.patterns.interval_overlap_strategy import IntervalOverlapStrategy
+from src.patterns.time_validation_strategy import WeekdayOnlyValidation
+from src.repositories.booking_repository import BookingRepository
+from src.repositories.room_repository import RoomRepository
+from src.repositories.series_repository import SeriesRepository
+from src.repositories.user_repository import UserRepository
+from src.services.booking_service import BookingService
+
+ROOM = Room(1, "Room A", 10, "Floor 1")
+USER = User(1, "Alice", "alice@example.com")
+
+
+@pytest.fixture
+def service(tmp_path):
+    return BookingService(
+        BookingRepository(filepath=str(tmp_path / "bookings.json")),
+        IntervalOverlapStrategy(),
+        time_validators=[WeekdayOnlyValidation()],
+        series_repository=SeriesRepository(filepath=str(tmp_path / "series.json")),
+    )
+
+
+def test_weekly_rule_expands_lazily_inside_window():
+    # Tuesdays 10:00-11:00, no end
+    series = BookingSeries(
+        1,
+        ROOM,
+        USER,
+        datetime(2025, 1, 7, 10),
+        datetime(2025, 1, 7, 11),
+        RecurrenceRule("weekly", exceptions=[date(2030, 1, 8)]),
+    )
+
+    window = list(series.occurrences(datetime(2030, 1, 1), datetime(2030, 1, 22)))
+
+    assert window == [
+        (datetime(2030, 1, 1, 10), datetime(2030, 1, 1, 11)),
+        (datetime(2030, 1, 15, 10), datetime(2030, 1, 15, 11)),
+    ]
+
+
+def test_rule_count_until_and_monthly_skips():
+    start = datetime(2025, 1, 31, 9)
+    monthly = RecurrenceRule("monthly", count=3)
+    assert [s.month for s in monthly.starts(start)] == [1, 3, 5]
+    after = datetime(2025, 4, 1)
+    assert [s.month for s in monthly.starts(start, after=after)] == [5]
+
+    daily = RecurrenceRule("daily", interval=2, until=datetime(2025, 1, 7, 9))
+    assert [s.day for s in daily.starts(datetime(2025, 1, 1, 9))] == [1, 3, 5, 7]
+
+    restored = RecurrenceRule.from_dict(daily.to_dict())
+    assert restored.until == daily.until and restored.interval == 2
+
+
+def test_series_conflicts_with_bookings_and_other_series(service):
+    service.create_booking(
+        ROOM, USER, datetime(2026, 3, 3, 10, 30), datetime(2026, 3, 3, 11)
+    )
+
+    with pytest.raises(ValueError, match="existing booking"):
+        service.create_series(
+            ROOM,
+            USER,
+            datetime(2025, 1, 7, 10),
+            datetime(2025, 1, 7, 11),
+            RecurrenceRule("weekly"),
+        )
+
+    series = service.create_series(
+        ROOM,
+        USER,
+        datetime(2025, 1, 7, 14),
+        datetime(2025, 1, 7, 15),
+        RecurrenceRule("weekly", until=datetime(2025, 12, 31)),
+    )
+
+    with pytest.raises(ValueError, match="recurring booking"):
+        service.create_booking(
+            ROOM, USER, datetime(2025, 6, 3, 14, 30), datetime(2025, 6, 3, 16)
+        )
+    with pytest.raises(ValueError, match="recurring booking"):
+        service.create_series(
+            ROOM,
+            USER,
+            datetime(2025, 1, 6, 14),
+            datetime(2025, 1, 6, 15),
+            RecurrenceRule("daily", count=5),
+        )
+    # Same slot once the series has ended is free
+    service.create_booking(
+        ROOM, USER, datetime(2026, 1, 6, 14), datetime(2026, 1, 6, 15)
+    )
+
+    occurrences = service.get_series_occurrences(
+        ROOM.room_id, datetime(2025, 2, 1), datetime(2025, 2, 15)
+    )
+    assert [start.day for _, start, _ in occurrences] == [4, 11]
+    assert service.cancel_series(series.series_id) is True
+    assert (
+        service.get_series_occurrences(
+            ROOM.room_id, datetime(2025, 2, 1), datetime(2025, 2, 15)
+        )
+        == []
+    )
+
+
+def test_series_runs_time_validators_and_persists(service, tmp_path):
+    with pytest.raises(ValueError, match="weekdays"):
+        service.create_series(
+            ROOM,
+            USER,
+            datetime(2025, 1, 6, 9),
+            datetime(2025, 1, 6, 10),
+            RecurrenceRule("daily", count=7),
+        )
+
+    service.create_series(
+        ROOM,
+        USER,
+        datetime(2025, 1, 6, 9),
+        datetime(2025, 1, 6, 10),
+        RecurrenceRule("daily", count=5),
+    )
+    reloaded = SeriesRepository(filepath=str(tmp_path / "series.json"))
+    (series,) = reloaded.get_by_room(ROOM.room_id)
+    assert series.rule.count == 5
+    assert len(list(series.occurrences())) == 5
+
+
+def test_series_store_room_and_user_by_id(tmp_path):
+    rooms = RoomRepository(filepath=str(tmp_path / "rooms.json"))
+    users = UserRepository(filepath=str(tmp_path / "users.json"))
+    room = rooms.add("Room A", 10, "Floor 1")
+    user = users.add("Alice", "alice@example.com")
+    path = str(tmp_path / "series.json")
+    repository = SeriesRepository(path, room_repository=rooms, user_repository=users)
+    repository.add(
+        room,
+        user,
+        datetime(2025, 1, 6, 9),
+        datetime(2025, 1, 6, 10),
+        RecurrenceRule("weekly", count=2),
+    )
+
+    with open(path) as f:
+        (record,) = json.load(f)
+    assert record["room_id"] == room.room_id and "room" not in record
+    assert record["user_id"] == user.user_id and "user" not in record
+
+    reloaded = SeriesRepository(path, room_repository=rooms, user_repository=users)
+    (series,) = reloaded.get_by_room(room.room_id)
+    assert series.room.name == "Room A" and series.user.email == "alice@example.com"
@@ -0,0 +1,470 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, call
+
+import pytest
+import redis
+
+from src.database.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from src.database.redis_client import RedisClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(breaker=None):
+    client = RedisClient(breaker=breaker)
+    client.client = Mock()
+    return client
+
+
+def test_breaker_opens_probes_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    # A single probe at a time
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    clock.now = 20
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_operations_do_not_ping():
+    client = _client()
+    client.client.exists.return_value = 1
+
+    assert client.validate_token("abc") is True
+    assert client.is_connected() is True
+    client.client.ping.assert_not_called()
+
+
+def test_fails_fast_while_redis_is_down():
+    clock = FakeClock()
+    client = _client(CircuitBreaker(failure_threshold=3, reset_timeout=5, clock=clock))
+    client.client.exists.side_effect = redis.ConnectionError("down")
+
+    for _ in range(10):
+        assert client.validate_token("abc") is False
+    assert client.client.exists.call_count == 3
+    assert client.is_connected() is False
+
+    # After the cooldown one probe goes through and closes the breaker
+    clock.now = 5
+    client.client.exists.side_effect = None
+    client.client.exists.return_value = 1
+    assert client.validate_token("abc") is True
+    assert client.is_connected() is True
+
+
+def test_command_errors_do_not_open_the_breaker():
+    client = _client(CircuitBreaker(failure_threshold=1))
+    client.client.lrange.side_effect = redis.ResponseError("WRONGTYPE")
+
+    assert client.get_all_requests() == []
+    assert client.breaker.state == CLOSED
+
+
+def test_uses_the_configured_pool():
+    pool = redis.ConnectionPool(max_connections=3)
+    client = RedisClient(pool=pool)
+    assert client.client.connection_pool is pool
+
+
+def _records(*timestamps):
+    records = []
+    for endpoint, timestamp in timestamps:
+        record = RedisClient.build_request(endpoint, "127.0.0.1")
+        record["timestamp"] = timestamp
+        records.append(record)
+    return records
+
+
+def test_save_requests_trims_by_count_and_age():
+    client = _client()
+    client.max_entries, client.max_age, client.daily_keys = 100, 3600, False
+    pipe = client.client.pipeline.return_value
+
+    client.save_requests(_records(("/ping", datetime.now(timezone.utc).isoformat())))
+
+    script, numkeys, key, max_entries, min_score, prefix, batch = (
+        pipe.eval.call_args.args
+    )
+    assert (numkeys, key, max_entries, prefix) == (1, "requests:/ping", 100, "request:")
+    assert batch == client.trim_batch
+    assert abs(min_score - (time.time() - 3600)) < 5
+    pipe.ltrim.assert_called_once_with("all_requests", 0, 99)
+    # Only the rollups expire
+    assert all(
+        c.args[0].startswith("request_rollup:") for c in pipe.expireat.call_args_list
+    )
+
+
+def test_daily_keys_expire_whole_days():
+    client = _client()
+    client.max_entries, client.max_age, client.daily_keys = 0, 86400, True
+    pipe = client.client.pipeline.return_value
+
+    client.save_requests(
+        _records(
+            ("/ping", "2025-03-01T23:59:00+00:00"),
+            ("/ping", "2025-03-02T00:01:00+00:00"),
+        )
+    )
+
+    assert [c.args[0] for c in pipe.zadd.call_args_list] == [
+        "requests:/ping:2025-03-01",
+        "requests:/ping:2025-03-02",
+    ]
+    assert [c.args[0] for c in pipe.lpush.call_args_list] == [
+        "all_requests:2025-03-01",
+        "all_requests:2025-03-02",
+    ]
+    end_of_first_day = datetime(2025, 3, 2, tzinfo=timezone.utc).timestamp()
+    assert (
+        call("requests:/ping:2025-03-01", int(end_of_first_day) + 86400)
+        in pipe.expireat.call_args_list
+    )
+    pipe.ltrim.assert_not_called()
+    pipe.eval.assert_not_called()
+
+
+def test_daily_keys_are_read_newest_day_first():
+    client = _client()
+    client.max_age, client.daily_keys = 86400, True
+    pipe = client.client.pipeline.return_value
+    today = datetime.now(timezone.utc).date()
+    yesterday = today - timedelta(days=1)
+    pipe.execute.return_value = [
+        ['{"day": "today"}'],
+        ['{"day": "yesterday"}', '{"day": "older"}'],
+        [],
+    ]
+
+    assert client.get_all_requests(limit=2) == [
+        {"day": "today"},
+        {"day": "yesterday"},
+    ]
+    assert [c.args[0] for c in pipe.lrange.call_args_list] == [
+        f"all_requests:{today}",
+        f"all_requests:{yesterday}",
+        f"all_requests:{yesterday - timedelta(days=1)}",
+    ]
+
+
+def test_clear_unlinks_scanned_keys_in_batches(monkeypatch):
+    monkeypatch.setattr("src.database.redis_client.CLEAR_BATCH", 2)
+    client = _client()
+    keys = {
+        "all_requests*": ["all_requests"],
+        "requests:*": ["requests:/health", "requests:/ping", "requests:/users"],
+        "request:*": [],
+        "request_stats": ["request_stats"],
+        "request_endpoints": ["request_endpoints"],
+        "request_clients": [],
+        "request_rollup:*": [],
+    }
+    client.client.scan_iter.side_effect = lambda match, count: iter(keys[match])
+
+    assert client.clear_all_requests()
+
+    assert [c.args for c in client.client.unlink.call_args_list] == [
+        ("all_requests",),
+        ("requests:/health", "requests:/ping"),
+        ("requests:/users",),
+        ("request_stats",),
+        ("request_endpoints",),
+    ]
+    client.client.delete.assert_not_called()
+
+
+def test_save_requests_maintains_counters():
+    client = _client()
+    pipe = client.client.pipeline.return_value
+    records = _records(
+        ("/ping", "2025-03-01T10:30:05+00:00"),
+        ("/ping", "2025-03-01T10:30:40+00:00"),
+        ("/health", "2025-03-01T10:31:00+00:00"),
+    )
+    records[0]["additional_data"] = {"status_code": 200}
+    records[2]["ip_address"] = "10.0.0.1"
+
+    client.save_requests(records)
+
+    assert {
+        c.args for c in pipe.hincrby.call_args_list if c.args[0] == "request_stats"
+    } == {
+        ("request_stats", "total", 3),
+        ("request_stats", "endpoint:/ping", 2),
+        ("request_stats", "endpoint:/health", 1),
+        ("request_stats", "status:200", 1),
+        ("request_stats", "status:unknown", 2),
+    }
+    assert sorted(pipe.pfadd.call_args.args[1:]) == ["10.0.0.1", "127.0.0.1"]
+    pipe.execute.assert_called_once()
+
+
+def test_request_stats_in_one_round_trip():
+    client = _client()
+    pipe = client.client.pipeline.return_value
+    minute = datetime.now(timezone.utc).strftime("%M")
+    pipe.execute.return_value = [
+        {
+            "total": "7",
+            "endpoint:/ping": "4",
+            "endpoint:/health": "3",
+            "status:200": "7",
+        },
+        2,
+        {f"{minute}|total": "5", f"{minute}|endpoint:/ping": "5"},
+    ]
+
+    stats = client.get_request_stats(minutes=1)
+
+    assert stats["total_requests"] == 7
+    assert stats["unique_clients"] == 2
+    assert stats["endpoints"] == {"/health": 3, "/ping": 4}
+    assert stats["statuses"] == {"200": 7}
+    assert [bucket["requests"] for bucket in stats["per_minute"]] == [5]
+    client.client.pipeline.assert_called_once()
+    pipe.execute.assert_called_once()
+
+
+def test_get_stats_reads_counters():
+    client = _client()
+    client.client.hgetall.return_value = {"total": "9", "endpoint:/health": "9"}
+
+    stats = client.get_stats()
+
+    assert (stats["total_requests"], stats["health_requests"]) == (9, 9)
+    assert stats["ping_requests"] == 0
+    client.client.pipeline.assert_not_called()
+
+
+def test_save_requests_writes_minute_and_hour_rollups():
+    client = _client()
+    client.rollup_ttls = {"minute": 60, "hour": 3600}
+    pipe = client.client.pipeline.return_value
+    records = _records(
+        ("/ping", "2025-03-01T10:30:05+00:00"),
+        ("/health", "2025-03-01T10:31:00+00:00"),
+    )
+
+    client.save_requests(records)
+
+    rollups = {
+        c.args for c in pipe.hincrby.call_args_list if c.args[0] != "request_stats"
+    }
+    minute_key = "request_rollup:minute:2025-03-01T10"
+    hour_key = "request_rollup:hour:2025-03-01"
+    assert rollups == {
+        (minute_key, "30|total", 1),
+        (minute_key, "30|endpoint:/ping", 1),
+        (minute_key, "30|ip:127.0.0.1", 1),
+        (minute_key, "31|total", 1),
+        (minute_key, "31|endpoint:/health", 1),
+        (minute_key, "31|ip:127.0.0.1", 1),
+        (hour_key, "10|total", 2),
+        (hour_key, "10|endpoint:/ping", 1),
+        (hour_key, "10|endpoint:/health", 1),
+        (hour_key, "10|ip:127.0.0.1", 2),
+    }
+    eleven = datetime(2025, 3, 1, 11, tzinfo=timezone.utc).timestamp()
+    midnight = datetime(2025, 3, 2, tzinfo=timezone.utc).timestamp()
+    assert call(minute_key, int(eleven) + 60) in pipe.expireat.call_args_list
+    assert call(hour_key, int(midnight) + 3600) in pipe.expireat.call_args_list
+
+
+def test_summary_reads_only_the_hashes_in_range():
+    client = _client()
+    pipe = client.client.pipeline.return_value
+    pipe.execute.return_value = [
+        {"59|total": "2", "59|endpoint:/ping": "2", "59|ip:10.0.0.1": "2"},
+        {"00|total": "1", "00|endpoint:/health": "1", "00|ip:10.0.0.2": "1"},
+    ]
+
+    summary = client.get_request_summary(
+        datetime(2025, 3, 1, 10, 59, 30), datetime(2025, 3, 1, 11, 1), "minute"
+    )
+
+    assert [c.args[0] for c in pipe.hgetall.call_args_list] == [
+        "request_rollup:minute:2025-03-01T10",
+        "request_rollup:minute:2025-03-01T11",
+    ]
+    assert summary["buckets"] == [
+        {
+            "start": "2025-03-01T10:59:00+00:00",
+            "requests": 2,
+            "endpoints": {"/ping": 2},
+            "clients": {"10.0.0.1": 2},
+        },
+        {
+            "start": "2025-03-01T11:00:00+00:00",
+            "requests": 1,
+            "endpoints": {"/health": 1},
+            "clients": {"10.0.0.2": 1},
+        },
+        {
+            "start": "2025-03-01T11:01:00+00:00",
+            "requests": 0,
+            "endpoints": {},
+            "clients": {},
+        },
+    ]
+
+
+def test_summary_rejects_bad_ranges():
+    client = _client()
+    start = datetime(2025, 3, 1)
+    for end, bucket in (
+        (start, "week"),
+        (start - timedelta(hours=1), "hour"),
+        (start + timedelta(days=2), "minute"),
+    ):
+        with pytest.raises(ValueError):
+            client.get_request_summary(start, end, bucket)
+    client.client.pipeline.assert_not_called()
+
+
+class FakeSortedSets:
+    """Just enough of a pipeline to answer ZREVRANGEBYSCORE ... LIMIT."""
+
+    def __init__(self, sets):
+        self.sets = sets
+        self.calls = []
+        self.result = []
+
+    def zrevrangebyscore(self, key, high, low, start, num, withscores):
+        high = float(high)
+        low = float(low)
+        rows = sorted(
+            ((m, s) for m, s in self.sets.get(key, []) if low <= s <= high),
+            key=lambda row: (row[1], row[0]),
+            reverse=True,
+        )
+        self.calls.append((key, num))
+        self.result.append(rows[start : start + num])
+
+    def execute(self):
+        result, self.result = self.result, []
+        return result
+
+
+def _paged_client(sets, endpoints):
+    """Sorted sets hold ids ``<n>`` whose records are ``{"n": n}``."""
+    client = _client()
+    client.daily_keys = False
+    client.client.mget.side_effect = lambda keys: [
+        json.dumps({"n": int(key.split(":")[1])}) for key in keys
+    ]
+    client.client.smembers.return_value = {"", *endpoints}
+    pipe = FakeSortedSets(sets)
+    client.client.pipeline.return_value = pipe
+    return client, pipe
+
+
+def test_requests_page_merges_endpoints_and_pages_through_ties():
+    sets = {
+        "requests:/ping": [(str(n), float(n // 2)) for n in (0, 2, 4)],
+        "requests:/health": [(str(n), float(n // 2)) for n in (1, 3, 5)],
+    }
+    client, _ = _paged_client(sets, ["/ping", "/health"])
+
+    seen = []
+    after = None
+    while True:
+        page, after = client.get_requests_page(after=after, limit=2)
+        seen += [record["n"] for record in page]
+        if after is None:
+            break
+
+    # Scores tie in pairs; every record comes back exactly once, newest first
+    assert sorted(seen) == [0, 1, 2, 3, 4, 5]
+    assert [n // 2 for n in seen] == [2, 2, 1, 1, 0, 0]
+
+
+def test_requests_page_filters_by_time_and_caps_limit():
+    moments = [datetime(2025, 3, 1, 10, m, tzinfo=timezone.utc) for m in range(5)]
+    sets = {"requests:/ping": [(str(m.minute), m.timestamp()) for m in moments]}
+    client, pipe = _paged_client(sets, [])
+
+    page, after = client.get_requests_page(
+        endpoint="/ping",
+        since=datetime(2025, 3, 1, 10, 1),
+        until=datetime(2025, 3, 1, 10, 3),
+        limit=10_000,
+    )
+
+    assert [record["n"] for record in page] == [3, 2, 1]
+    assert after is None
+    assert pipe.calls == [("requests:/ping", 501)]
+    client.client.smembers.assert_not_called()
+
+
+def test_token_changes_are_published():
+    client = _client()
+    pipe = client.client.pipeline.return_value
+    pipe.execute.return_value = [1, 1]
+
+    assert client.delete_token("abc")
+    assert client.save_token("def", 60)
+
+    assert [c.args for c in pipe.publish.call_args_list] == [
+        ("token_invalidations", "abc"),
+        ("token_invalidations", "def"),
+    ]
+
+
+def test_each_record_is_stored_once_and_indexed_by_id():
+    client = _client()
+    client.max_age, client.daily_keys = 3600, False
+    pipe = client.client.pipeline.return_value
+    record = _records(("/ping", "2025-03-01T10:30:05+00:00"))[0]
+
+    client.save_requests([record])
+
+    (set_call,) = pipe.set.call_args_list
+    record_key, payload = set_call.args
+    request_id = record_key.split(":", 1)[1]
+    assert json.loads(payload) == record
+    assert set_call.kwargs == {"ex": 3600}
+    pipe.zadd.assert_called_once_with(
+        "requests:/ping",
+        {request_id: datetime.fromisoformat(record["timestamp"]).timestamp()},
+    )
+    pipe.lpush.assert_called_once_with("all_requests", request_id)
+
+
+def test_records_are_read_with_one_mget():
+    client = _client()
+    client.daily_keys = False
+    client.client.lrange.return_value = ["b", "gone", '{"legacy": true}', "a"]
+    client.client.mget.return_value = ['{"id": "b"}', None, '{"id": "a"}']
+
+    assert client.get_all_requests(limit=4) == [
+        {"id": "b"},
+        {"legacy": True},
+        {"id": "a"},
+    ]
+    client.client.mget.assert_called_once_with(
+        ["request:b", "request:gone", "request:a"]
+    )
@@ -21,7 +21,7 @@ def auth_headers(client):
     """Create auth headers with a valid token."""
     # Mock the token validation to always return True
     with patch(
-        "src.middleware.auth_middleware.redis_client.validate_token", return_value=True
+        "src.middleware.auth_middleware.token_cache.validate", return_value=True
     ):
         yield {"Authorization": "Bearer test-token-123"}
 
@@ -55,7 +55,7 @@ def test_ping_endpoint_contains_timestamp(client):
 def test_get_responses_endpoint_returns_200(client, auth_headers):
     """Test that /get-responses returns status code 200."""
     with patch(
-        "src.middleware.auth_middleware.redis_client.validate_token", return_value=True
+        "src.middleware.auth_middleware.token_cache.validate", return_value=True
     ):
         response = client.get("/get-responses", headers=auth_headers)
         assert response.status_code == 200
@@ -64,7 +64,7 @@ def test_get_responses_endpoint_returns_200(client, auth_headers):
 def test_get_responses_returns_json(client, auth_headers):
     """Test that /get-responses returns valid JSON structure."""
     with patch(
-        "src.middleware.auth_middleware.redis_client.validate_token", return_value=True
+        "src.middleware.auth_middleware.token_cache.validate", return_value=True
     ):
         response = client.get("/get-responses", headers=auth_headers)
         data = json.loads(response.data)
@@ -80,7 +80,7 @@ def test_get_responses_returns_json(client, auth_headers):
 def test_get_responses_with_limit(client, auth_headers):
     """Test that /get-responses respects limit parameter."""
     with patch(
-        "src.middleware.auth_middleware.redis_client.validate_token", return_value=True
+        "src.middleware.auth_middleware.token_cache.validate", return_value=True
     ):
         response = client.get("/get-responses?limit=5", headers=auth_headers)
         data = json.loads(response.data)
@@ -93,7 +93,7 @@ def test_get_responses_with_limit(client, auth_headers):
 def test_get_responses_with_endpoint_filter(client, auth_headers):
     """Test that /get-responses can filter by endpoint."""
     with patch(
-        "src.middleware.auth_middleware.redis_client.validate_token", return_value=True
+        "src.middleware.auth_middleware.token_cache.validate", return_value=True
     ):
         response = client.get("/get-responses?endpoint=/health", headers=auth_headers)
         data = json.loads(response.data)
@@ -141,7 +141,7 @@ def test_get_responses_without_token_returns_401(client):
 def test_get_responses_with_invalid_token_returns_401(client):
     """Test that /get-responses returns 401 with invalid token."""
     with patch(
-        "src.middleware.auth_middleware.redis_client.validate_token", return_value=False
+        "src.middleware.auth_middleware.token_cache.validate", return_value=False
     ):
         headers = {"Authorization": "Bearer invalid-token"}
         response = client.get("/get-responses", headers=headers)
@@ -179,7 +179,7 @@ def test_register_token_without_token_field_returns_400(client):
 def test_clear_responses_success(client, auth_headers):
     """Test that /clear-responses successfully clears all responses."""
     with patch(
-        "src.middleware.auth_middleware.redis_client.validate_token", return_value=True
+        "src.middleware.auth_middleware.token_cache.validate", return_value=True
     ):
         with patch(
             "src.database.redis_client.redis_client.clear_all_requests",
@@ -198,3 +198,75 @@ def test_clear_responses_without_token_returns_401(client):
     data = json.loads(response.data)
     assert "error" in data
     assert data["error"] == "Invalid or missing token"
+
+
+def test_stats_endpoint_returns_counters(client, auth_headers):
+    """Test that /stats returns the counters from Redis."""
+    stats = {"connected": True, "total_requests": 3, "per_minute": []}
+    with patch(
+        "src.database.redis_client.redis_client.get_request_stats",
+        return_value=stats,
+    ) as get_request_stats:
+        response = client.get("/stats?minutes=15", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == stats
+    get_request_stats.assert_called_once_with(15)
+
+
+def test_stats_endpoint_rejects_invalid_minutes(client, auth_headers):
+    """Test that /stats returns 400 for a non-numeric window."""
+    response = client.get("/stats?minutes=soon", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_summary_endpoint_passes_range_and_bucket(client, auth_headers):
+    """Test that /get-responses/summary reads the requested rollups."""
+    summary = {"connected": True, "bucket": "hour", "buckets": []}
+    with patch(
+        "src.database.redis_client.redis_client.get_request_summary",
+        return_value=summary,
+    ) as get_request_summary:
+        response = client.get(
+            "/get-responses/summary?from=2025-03-01T00:00:00&bucket=hour",
+            headers=auth_headers,
+        )
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == summary
+    get_request_summary.assert_called_once_with(datetime(2025, 3, 1), None, "hour")
+
+
+def test_summary_endpoint_rejects_invalid_query(client, auth_headers):
+    """Test that /get-responses/summary returns 400 for bad parameters."""
+    for query in ("from=yesterday", "bucket=week"):
+        response = client.get(f"/get-responses/summary?{query}", headers=auth_headers)
+        assert response.status_code == 400
+        assert json.loads(response.data)["error"] == "Invalid query"
+
+
+def test_get_responses_pages_with_cursor(client, auth_headers):
+    """Test that /get-responses returns and accepts an opaque cursor."""
+    with patch(
+        "src.database.redis_client.redis_client.get_requests_page",
+        return_value=([{"endpoint": "/ping"}], (1700000000.5, 1)),
+    ) as get_requests_page:
+        first = json.loads(
+            client.get(
+                "/get-responses?limit=1&since=2025-03-01T00:00:00", headers=auth_headers
+            ).data
+        )
+        client.get(
+            f"/get-responses?limit=1&cursor={first['next_cursor']}",
+            headers=auth_headers,
+        )
+
+    assert get_requests_page.call_args_list[0].kwargs["since"] == datetime(2025, 3, 1)
+    assert get_requests_page.call_args_list[1].kwargs["after"] == (1700000000.5, 1)
+
+
+def test_get_responses_rejects_invalid_query(client, auth_headers):
+    """Test that /get-responses returns 400 for bad paging parameters."""
+    for query in ("limit=0", "limit=many", "cursor=nope", "since=yesterday"):
+        response = client.get(f"/get-responses?{query}", headers=auth_headers)
+        assert response.status_code == 400
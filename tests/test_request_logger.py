@@ -0,0 +1,128 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from src.database.redis_client import RedisClient
+from src.database.request_logger import (
+    BLOCK,
+    DROP_NEWEST,
+    DROP_OLDEST,
+    RequestLogger,
+)
+
+
+def _client(gate=None):
+    client = Mock()
+    client.build_request = RedisClient.build_request
+    client.batches = []
+
+    def save_requests(batch):
+        if gate is not None:
+            gate.wait(5)
+        client.batches.append(list(batch))
+        return len(batch)
+
+    client.save_requests.side_effect = save_requests
+    return client
+
+
+def test_async_logs_are_written_in_batches():
+    client = _client()
+    logger = RequestLogger(client, batch_size=10, flush_interval=0.05)
+
+    for i in range(25):
+        assert logger.log("/health", f"10.0.0.{i}")
+    assert logger.flush()
+    logger.close()
+
+    written = [record for batch in client.batches for record in batch]
+    assert [r["ip_address"] for r in written] == [f"10.0.0.{i}" for i in range(25)]
+    assert all(len(batch) <= 10 for batch in client.batches)
+    assert logger.metrics()["written"] == 25
+    assert logger.metrics()["queue_depth"] == 0
+
+
+def test_drop_newest_and_drop_oldest_when_queue_is_full():
+    for policy, kept in ((DROP_NEWEST, ["a", "b"]), (DROP_OLDEST, ["d", "e"])):
+        gate = threading.Event()
+        client = _client(gate)
+        logger = RequestLogger(client, max_queue=2, batch_size=1, policy=policy)
+
+        # The worker takes the first record and blocks writing it
+        logger.log("/ping", "first")
+        while logger.metrics()["queue_depth"]:
+            pass
+        results = [logger.log("/ping", ip) for ip in "abcde"]
+        gate.set()
+        logger.close()
+
+        written = [batch[0]["ip_address"] for batch in client.batches]
+        assert written == ["first"] + kept
+        assert logger.metrics()["dropped"] == 3
+        if policy == DROP_NEWEST:
+            assert results == [True, True, False, False, False]
+
+
+def test_block_policy_gives_up_after_timeout():
+    gate = threading.Event()
+    client = _client(gate)
+    logger = RequestLogger(
+        client, max_queue=1, batch_size=1, policy=BLOCK, block_timeout=0.01
+    )
+
+    logger.log("/ping", "first")
+    while logger.metrics()["queue_depth"]:
+        pass
+    assert logger.log("/ping", "queued")
+    assert not logger.log("/ping", "dropped")
+    gate.set()
+    logger.close()
+
+    assert logger.metrics()["written"] == 2
+    assert logger.metrics()["dropped"] == 1
+
+
+def test_sync_mode_writes_immediately():
+    client = _client()
+    logger = RequestLogger(client, async_mode=False)
+
+    assert logger.log("/health", "127.0.0.1", "pytest", {"method": "GET"})
+
+    (batch,) = client.batches
+    assert batch[0]["user_agent"] == "pytest"
+    assert batch[0]["additional_data"] == {"method": "GET"}
+    assert logger._worker is None
+    assert logger.metrics()["mode"] == "sync"
+
+
+def test_failed_writes_are_counted():
+    client = _client()
+    client.save_requests.side_effect = lambda batch: 0
+    logger = RequestLogger(client, async_mode=False)
+
+    assert not logger.log("/health", "127.0.0.1")
+    assert logger.metrics()["failed"] == 1
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        RequestLogger(Mock(), policy="spill")
+
+
+def test_save_requests_uses_one_pipeline():
+    redis_client = RedisClient()
+    redis_client.client = Mock()
+    pipe = redis_client.client.pipeline.return_value
+    records = [
+        RedisClient.build_request("/health", "1.1.1.1"),
+        RedisClient.build_request("/ping", "2.2.2.2"),
+        RedisClient.build_request("/health", "3.3.3.3"),
+    ]
+
+    assert redis_client.save_requests(records) == 3
+
+    redis_client.client.pipeline.assert_called_once_with(transaction=False)
+    assert pipe.zadd.call_count == 2
+    assert len(pipe.lpush.call_args.args) == 4
+    pipe.execute.assert_called_once()
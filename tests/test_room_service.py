@@ -14,3 +14,17 @@ def test_create_room():
     assert room.capacity == 20
     assert room.location == "Floor 2"
     assert room.room_id == 1
+
+
+def test_delete_room_updates_lookup(tmp_path):
+    repo = RoomRepository(filepath=str(tmp_path / "rooms.json"))
+
+    service = RoomService(repo)
+    first = service.create_room("Room B", 20, "Floor 2")
+    second = service.create_room("Room C", 8, "Floor 3")
+
+    assert repo.get_by_id(second.room_id) is second
+    assert service.delete_room(first.room_id) is True
+    assert repo.get_by_id(first.room_id) is None
+    assert service.delete_room(first.room_id) is False
+    assert service.get_all_rooms() == [second]
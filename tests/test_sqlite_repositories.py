@@ -0,0 +1,170 @@
+from datetime import datetime
+
+import pytest
+
+from src.patterns.interval_overlap_strategy import IntervalOverlapStrategy
+from src.repositories.factory import create_repositories, create_series_repository
+from src.repositories.sqlite_booking_repository import SqliteBookingRepository
+from src.repositories.sqlite_database import SqliteDatabase
+from src.repositories.sqlite_room_repository import SqliteRoomRepository
+from src.repositories.sqlite_user_repository import SqliteUserRepository
+from src.services.booking_service import BookingService
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SqliteDatabase(str(tmp_path / "booking.db"))
+    yield database
+    database.close()
+
+
+def test_sqlite_repositories_round_trip(database):
+    users = SqliteUserRepository(database)
+    rooms = SqliteRoomRepository(database)
+    bookings = SqliteBookingRepository(database)
+
+    alice = users.add("Alice", "alice@example.com")
+    room = rooms.add("Room A", 10, "Floor 1")
+    booking = bookings.add(
+        room, alice, datetime(2025, 1, 1, 10, 0), datetime(2025, 1, 1, 11, 0)
+    )
+
+    assert users.get_by_id(alice.user_id).email == "alice@example.com"
+    assert rooms.get_all()[0].capacity == 10
+    found = bookings.get_by_id(booking.booking_id)
+    assert found.room.name == "Room A"
+    assert found.start_time == datetime(2025, 1, 1, 10, 0)
+    assert [b.booking_id for b in bookings.get_by_user(alice.user_id)] == [1]
+
+    assert bookings.delete(booking.booking_id) is True
+    assert bookings.get_by_id(booking.booking_id) is None
+    assert bookings.delete(booking.booking_id) is False
+
+
+def test_sqlite_bookings_of_a_deleted_room_are_kept(database):
+    users = SqliteUserRepository(database)
+    rooms = SqliteRoomRepository(database)
+    bookings = SqliteBookingRepository(database)
+    alice = users.add("Alice", "alice@example.com")
+    room = rooms.add("Room A", 10, "Floor 1")
+    bookings.add(room, alice, datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 11))
+    rooms.delete(room.room_id)
+
+    with pytest.warns(UserWarning, match="room_id 1"):
+        (booking,) = bookings.get_all()
+    assert booking.room.room_id == room.room_id
+    assert booking.user.name == "Alice"
+    with pytest.warns(UserWarning):
+        assert len(bookings.find(user_id=alice.user_id)) == 1
+        assert len(bookings.get_by_user(alice.user_id)) == 1
+
+
+def test_sqlite_overlap_check_uses_window_query(database):
+    users = SqliteUserRepository(database)
+    rooms = SqliteRoomRepository(database)
+    bookings = SqliteBookingRepository(database)
+    service = BookingService(bookings, IntervalOverlapStrategy())
+
+    alice = users.add("Alice", "alice@example.com")
+    room = rooms.add("Room A", 10, "Floor 1")
+    for hour in (9, 11, 15):
+        service.create_booking(
+            room, alice, datetime(2025, 1, 1, hour), datetime(2025, 1, 1, hour + 1)
+        )
+
+    window = bookings.get_room_timeline(
+        room.room_id, datetime(2025, 1, 1, 9, 30), datetime(2025, 1, 1, 12)
+    )
+    assert [b.start_time.hour for b in window] == [9, 11]
+
+    service.create_booking(
+        room, alice, datetime(2025, 1, 1, 12), datetime(2025, 1, 1, 15)
+    )
+    with pytest.raises(ValueError):
+        service.create_booking(
+            room, alice, datetime(2025, 1, 1, 10, 30), datetime(2025, 1, 1, 11, 30)
+        )
+
+
+def test_sqlite_window_lookup_finds_bookings_containing_later_ones(database):
+    users = SqliteUserRepository(database)
+    rooms = SqliteRoomRepository(database)
+    bookings = SqliteBookingRepository(database)
+    service = BookingService(bookings, IntervalOverlapStrategy())
+    alice = users.add("Alice", "alice@example.com")
+    room = rooms.add("Room A", 10, "Floor 1")
+    bookings.add(room, alice, datetime(2025, 1, 1, 9), datetime(2025, 1, 1, 17))
+    bookings.add(room, alice, datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 11))
+
+    noon, one = datetime(2025, 1, 1, 12), datetime(2025, 1, 1, 13)
+    assert [b.booking_id for b in bookings.get_room_timeline(1, noon, one)] == [1]
+    with pytest.raises(ValueError, match="overlaps"):
+        service.create_booking(room, alice, noon, one)
+
+
+def test_factory_selects_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "factory.db"))
+    _, _, bookings = create_repositories("sqlite")
+    assert isinstance(bookings, SqliteBookingRepository)
+    bookings.database.close()
+
+    with pytest.raises(ValueError):
+        create_repositories("csv")
+
+
+def test_series_are_json_only(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "src" / "data").mkdir(parents=True)
+    monkeypatch.setenv("STORAGE_SHARED", "1")
+    series = create_series_repository(None, None, "json")
+    assert series.storage.shared
+
+    assert create_series_repository(None, None, "sqlite") is None
+    with pytest.raises(ValueError):
+        create_series_repository(None, None, "csv")
+
+
+def test_sqlite_add_many_uses_one_transaction(database):
+    users = SqliteUserRepository(database)
+    rooms = SqliteRoomRepository(database)
+    bookings = SqliteBookingRepository(database)
+    alice = users.add("Alice", "alice@example.com")
+    room = rooms.add("Room A", 10, "Floor 1")
+
+    created = bookings.add_many(
+        [
+            (room, alice, datetime(2025, 1, day, 10), datetime(2025, 1, day, 11))
+            for day in (1, 2, 3)
+        ]
+    )
+
+    assert [b.booking_id for b in created] == [1, 2, 3]
+    assert [b.start_time.day for b in bookings.get_by_room(room.room_id)] == [1, 2, 3]
+
+
+def test_sqlite_find_pages_by_start_time(database):
+    users = SqliteUserRepository(database)
+    rooms = SqliteRoomRepository(database)
+    bookings = SqliteBookingRepository(database)
+    alice = users.add("Alice", "alice@example.com")
+    room = rooms.add("Room A", 10, "Floor 1")
+    for day in (3, 1, 2):
+        bookings.add(
+            room, alice, datetime(2025, 1, day, 10), datetime(2025, 1, day, 11)
+        )
+    version = bookings.version
+
+    first = bookings.find(room_id=room.room_id, limit=2)
+    assert [b.booking_id for b in first] == [2, 3]
+    last = first[-1]
+    rest = bookings.find(after=(last.start_time, last.booking_id))
+    assert [b.booking_id for b in rest] == [1]
+    window = bookings.find(
+        user_id=alice.user_id,
+        start_time=datetime(2025, 1, 2, 10, 30),
+        end_time=datetime(2025, 1, 3),
+    )
+    assert [b.booking_id for b in window] == [3]
+
+    bookings.delete(1)
+    assert bookings.version != version
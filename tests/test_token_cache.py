@@ -0,0 +1,134 @@
+import queue
+import time
+
+import redis
+
+from src.middleware.token_cache import TokenCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = messages
+
+    def get_message(self, timeout):
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        pass
+
+
+class FakeRedis:
+    """PTTL answers per token plus an invalidation channel."""
+
+    def __init__(self, ttls):
+        self.ttls = ttls
+        self.calls = 0
+        self.channel = queue.Queue()
+
+    def token_ttl(self, token):
+        self.calls += 1
+        return self.ttls.get(token, -2)
+
+    def subscribe_token_invalidations(self):
+        return FakePubSub(self.channel)
+
+    def publish(self, token):
+        self.channel.put({"type": "message", "data": token})
+
+
+def _cache(ttls, **kwargs):
+    client = FakeRedis(ttls)
+    cache = TokenCache(client, clock=FakeClock(), **kwargs)
+    cache._ensure_listener()
+    assert cache._subscribed.wait(2)
+    return cache, client
+
+
+def _wait_until(condition):
+    deadline = time.monotonic() + 2
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_valid_tokens_are_cached_until_their_redis_ttl():
+    cache, client = _cache({"good": 2000, "forever": -1}, ttl=30)
+
+    assert cache.validate("good")
+    assert cache.validate("good")
+    assert client.calls == 1
+
+    # Capped by PTTL (2s), not by the cache TTL (30s)
+    cache.clock.now = 2.5
+    assert cache.validate("good")
+    assert client.calls == 2
+
+    assert cache.validate("forever")
+    cache.clock.now = 33
+    assert cache.validate("forever")
+    assert client.calls == 4
+
+
+def test_unknown_tokens_are_cached_briefly():
+    cache, client = _cache({}, negative_ttl=5)
+
+    assert not cache.validate("bad")
+    assert not cache.validate("bad")
+    assert client.calls == 1
+
+    cache.clock.now = 6
+    assert not cache.validate("bad")
+    assert client.calls == 2
+
+
+def test_invalidation_message_evicts_the_token():
+    cache, client = _cache({"token": -1})
+    assert cache.validate("token")
+
+    del client.ttls["token"]
+    client.publish("token")
+    _wait_until(lambda: "token" not in cache._entries)
+
+    assert not cache.validate("token")
+
+
+def test_least_recently_used_token_is_evicted():
+    cache, client = _cache({"a": -1, "b": -1, "c": -1}, max_size=2)
+
+    for token in ("a", "b", "a", "c"):
+        cache.validate(token)
+
+    assert list(cache._entries) == ["a", "c"]
+
+
+def test_nothing_is_cached_without_a_subscription():
+    client = FakeRedis({"token": -1})
+
+    def subscribe():
+        raise redis.ConnectionError("down")
+
+    client.subscribe_token_invalidations = subscribe
+    cache = TokenCache(client, retry_interval=60)
+
+    assert cache.validate("token")
+    assert cache.validate("token")
+    assert client.calls == 2
+
+
+def test_redis_errors_are_not_cached():
+    cache, client = _cache({})
+    client.token_ttl = lambda token: None
+
+    assert not cache.validate("token")
+    assert cache._entries == {}
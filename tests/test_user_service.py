@@ -13,3 +13,16 @@ def test_create_user():
     assert user.name == "Charlie"
     assert user.email == "charlie@example.com"
     assert user.user_id == 1
+
+
+def test_delete_user_updates_lookup(tmp_path):
+    repo = UserRepository(filepath=str(tmp_path / "users.json"))
+
+    service = UserService(repo)
+    first = service.create_user("Charlie", "charlie@example.com")
+    second = service.create_user("Dana", "dana@example.com")
+
+    assert repo.get_by_id(second.user_id) is second
+    assert service.delete_user(first.user_id) is True
+    assert repo.get_by_id(first.user_id) is None
+    assert service.get_all_users() == [second]